@@ -4,6 +4,8 @@
 import re
 from pathlib import Path
 
+from template_writes import write_if_changed
+
 def fix_template(filepath, replacements):
     """Apply fixes to a template file"""
     path = Path(filepath)
@@ -16,10 +18,10 @@ def fix_template(filepath, replacements):
         pattern = r'\b' + re.escape(old) + r'\b'
         content = re.sub(pattern, new, content)
 
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    print(f"✓ Fixed {path.name}")
+    if write_if_changed(path, content):
+        print(f"✓ Fixed {path.name}")
+    else:
+        print(f"  {path.name} (no changes)")
 
 # Fixes to apply
 fixes = {
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Template build step
+1. Extracts helper functions that are identical across templates into one shared runtime
+   script (runtime.<hash>.js), loaded by every template that used a copy
+2. Removes top-level functions nothing references
+3. Drops <style> rules whose selectors need a class or id the template never produces
+4. Minifies HTML, CSS and JS (strings, regexes and template literal text are left as is)
+5. Prints a size report, raw and gzipped, before and after
+
+Output goes to dist/ next to the templates; sources are never modified.
+"""
+
+import argparse
+import gzip
+import hashlib
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import css_pruner
+import js_functions
+from template_discovery import find_templates, template_name
+from template_edits import apply_span_edits
+from template_writes import write_if_changed
+
+TEMPLATE_DIR = Path(__file__).parent
+DIST_DIR = TEMPLATE_DIR / 'dist'
+
+# A helper goes to the shared runtime once this many templates carry the same copy
+MIN_COPIES = 2
+
+STYLE_BLOCK = re.compile(r'(<style\b[^>]*>)(.*?)(</style>)', re.DOTALL | re.IGNORECASE)
+RAW_BLOCK = re.compile(r'<(script|style|pre|textarea)\b.*?</\1>', re.DOTALL | re.IGNORECASE)
+HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+FIRST_SCRIPT = re.compile(r'<script\b', re.IGNORECASE)
+
+# A collapsed space may go when either neighbour is one of these...
+JS_PUNCTUATION = set('{}()[];,:=<>?!&|*%^~')
+# ...unless both neighbours are among these (a + +b, a / /re/)
+JS_GLUE = set('+-/')
+# ASI never applies after these, so a following line break can go
+JS_CONTINUATION = set('{;,(')
+
+
+def _identifier_pattern(name: str) -> re.Pattern:
+    return re.compile(r'(?<![\w$])' + re.escape(name) + r'(?![\w$])')
+
+
+def unreferenced_functions(content: str, functions: List[js_functions.JsFunction]) -> List[js_functions.JsFunction]:
+    """Top-level functions whose name appears nowhere outside their own body"""
+    removed = []
+    live = list(functions)
+
+    # Removing one function can orphan the helpers only it called
+    while True:
+        dead_spans = [(f.start, f.end) for f in removed]
+        newly_dead = []
+        for function in live:
+            spans = dead_spans + [(function.start, function.end)]
+            referenced = any(
+                not any(start <= m.start() < end for start, end in spans)
+                for m in _identifier_pattern(function.name).finditer(content)
+            )
+            if not referenced:
+                newly_dead.append(function)
+        if not newly_dead:
+            return removed
+        removed.extend(newly_dead)
+        live = [f for f in live if f not in newly_dead]
+
+
+def minify_js(source: str) -> str:
+    """Drop comments and collapse whitespace in code; strings, regexes and template text are kept"""
+    scan = js_functions.scan_js(source)
+    comments = set(scan.comments)
+
+    pieces = []
+    cursor = 0
+    for start, end in scan.opaque:
+        pieces.append(('code', source[cursor:start]))
+        pieces.append(('comment' if (start, end) in comments else 'literal', source[start:end]))
+        cursor = end
+    pieces.append(('code', source[cursor:]))
+
+    out = []
+    for kind, text in pieces:
+        if kind == 'literal':
+            out.append(text)
+        elif kind == 'comment':
+            out.append(' ')
+        else:
+            out.append(re.sub(r'\s+', lambda m: '\n' if '\n' in m.group(0) else ' ', text))
+    collapsed = ''.join(out)
+
+    # Second pass over the collapsed text: drop whitespace that carries no meaning
+    result = []
+    literal_ends = _literal_bounds(collapsed)
+    i = 0
+    while i < len(collapsed):
+        c = collapsed[i]
+        if i in literal_ends:
+            end = literal_ends[i]
+            result.append(collapsed[i:end])
+            i = end
+            continue
+        if c in ' \n':
+            j = i
+            newline = False
+            while j < len(collapsed) and collapsed[j] in ' \n' and j not in literal_ends:
+                newline = newline or collapsed[j] == '\n'
+                j += 1
+            left = result[-1][-1] if result and result[-1] else ''
+            right = collapsed[j] if j < len(collapsed) else ''
+            if not left or not right:
+                pass
+            elif newline and left not in JS_CONTINUATION:
+                result.append('\n')
+            elif not newline and (left in JS_PUNCTUATION or right in JS_PUNCTUATION) and not (left in JS_GLUE and right in JS_GLUE):
+                pass
+            elif newline:
+                pass
+            else:
+                result.append(' ')
+            i = j
+            continue
+        result.append(c)
+        i += 1
+
+    return ''.join(result).strip()
+
+
+def _literal_bounds(source: str) -> Dict[int, int]:
+    """start -> end of every string, regex and template text range"""
+    scan = js_functions.scan_js(source)
+    comments = set(scan.comments)
+    return {start: end for start, end in scan.opaque if (start, end) not in comments}
+
+
+def minify_css(css: str) -> str:
+    css = CSS_COMMENT.sub('', css)
+    css = re.sub(r'\s+', ' ', css)
+    css = CSS_PUNCTUATION.sub(r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_html(content: str) -> str:
+    """Minify markup outside raw blocks, then the CSS and JS inside them"""
+    pieces = []
+    cursor = 0
+    for match in RAW_BLOCK.finditer(content):
+        pieces.append(_minify_markup(content[cursor:match.start()]))
+        block = match.group(0)
+        tag = match.group(1).lower()
+        if tag == 'style':
+            block = STYLE_BLOCK.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), block)
+        elif tag == 'script':
+            block = js_functions.SCRIPT_BLOCK.sub(
+                lambda m: m.group(0).replace(m.group(1), minify_js(m.group(1))) if m.group(1).strip() else m.group(0),
+                block
+            )
+        pieces.append(block)
+        cursor = match.end()
+    pieces.append(_minify_markup(content[cursor:]))
+    return ''.join(pieces)
+
+
+def _minify_markup(markup: str) -> str:
+    markup = HTML_COMMENT.sub('', markup)
+    return re.sub(r'\s+', ' ', markup)
+
+
+class TemplateBuild:
+    """A template's source with the functions to extract or drop"""
+
+    def __init__(self, path: Path, content: str):
+        self.path = path
+        self.content = content
+        self.functions = js_functions.find_functions(content)
+        self.unused = unreferenced_functions(content, self.functions)
+        self.kept = [f for f in self.functions if f not in self.unused]
+        self.hashes = {id(f): js_functions.function_hash(f) for f in self.kept}
+
+
+def plan_runtime(builds: List[TemplateBuild]) -> Dict[str, Tuple[str, str]]:
+    """name -> (hash, source) of the helpers shared by MIN_COPIES templates or more"""
+    copies = Counter()
+    sources = {}
+    for build in builds:
+        for function in build.kept:
+            key = (function.name, build.hashes[id(function)])
+            copies[key] += 1
+            sources.setdefault(key, function.text)
+
+    # One global per name: the most common variant wins, other variants stay inline
+    runtime = {}
+    for (name, digest), count in copies.most_common():
+        if count >= MIN_COPIES and name not in runtime:
+            runtime[name] = (digest, sources[(name, digest)])
+    return runtime
+
+
+def build_template(build: TemplateBuild, runtime: Dict[str, Tuple[str, str]], runtime_src: str,
+                   prune_css: bool = True) -> str:
+    """Built HTML for one template"""
+    edits = [(f.start, f.end, '') for f in build.unused]
+    extracted = [
+        f for f in build.kept
+        if f.name in runtime and runtime[f.name][0] == build.hashes[id(f)]
+    ]
+    edits += [(f.start, f.end, '') for f in extracted]
+    content = apply_span_edits(build.content, edits)
+
+    if extracted:
+        first = FIRST_SCRIPT.search(content)
+        tag = f'<script src="{runtime_src}"></script>\n'
+        content = content[:first.start()] + tag + content[first.start():]
+
+    if prune_css:
+        content, _ = css_pruner.prune_css(content)
+
+    return minify_html(content)
+
+
+def _gzip_size(data: bytes) -> int:
+    return len(gzip.compress(data, 9))
+
+
+def build(out_dir: Path = DIST_DIR, template_dir: Path = TEMPLATE_DIR, shared: bool = True,
+          prune_css: bool = True) -> Dict:
+    """Build every template into out_dir; returns the size report data"""
+    paths = find_templates(template_dir)
+    builds = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            builds.append(TemplateBuild(path, f.read()))
+
+    runtime = plan_runtime(builds) if shared else {}
+    runtime_js = minify_js('\n'.join(source for _, source in sorted(runtime.values(), key=lambda v: v[1])))
+    runtime_name = f"runtime.{hashlib.sha1(runtime_js.encode('utf-8')).hexdigest()[:10]}.js"
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if runtime:
+        for stale in out_dir.glob('runtime.*.js'):
+            if stale.name != runtime_name:
+                stale.unlink()
+        write_if_changed(out_dir / runtime_name, runtime_js)
+
+    report = {'templates': [], 'runtime': (runtime_name, len(runtime), runtime_js.encode('utf-8'))}
+    for item in builds:
+        name = template_name(item.path, template_dir)
+        depth = name.count('/')
+        built = build_template(item, runtime, '../' * depth + runtime_name, prune_css)
+
+        write_if_changed(out_dir / name, built)
+
+        report['templates'].append((name, item.content.encode('utf-8'), built.encode('utf-8'), len(item.unused)))
+
+    return report
+
+
+def print_report(report: Dict):
+    print("=" * 100)
+    print("TEMPLATE BUILD - SIZE REPORT")
+    print("=" * 100)
+    print()
+    print(f"{'TEMPLATE':36} {'BEFORE':>10} {'AFTER':>10} {'SAVED':>7}   {'GZ BEFORE':>10} {'GZ AFTER':>10}  UNUSED FN")
+    print("-" * 100)
+
+    totals = defaultdict(int)
+    for name, before, after, unused in report['templates']:
+        gz_before, gz_after = _gzip_size(before), _gzip_size(after)
+        saved = 100 * (1 - len(after) / len(before)) if before else 0
+        print(f"{name:36} {len(before):>10,} {len(after):>10,} {saved:>6.1f}%   {gz_before:>10,} {gz_after:>10,}  {unused:>9}")
+        totals['before'] += len(before)
+        totals['after'] += len(after)
+        totals['gz_before'] += gz_before
+        totals['gz_after'] += gz_after
+
+    runtime_name, functions, runtime = report['runtime']
+    print("-" * 100)
+    saved = 100 * (1 - totals['after'] / totals['before']) if totals['before'] else 0
+    print(f"{'TOTAL':36} {totals['before']:>10,} {totals['after']:>10,} {saved:>6.1f}%   "
+          f"{totals['gz_before']:>10,} {totals['gz_after']:>10,}")
+    print()
+    if functions:
+        print(f"Shared runtime: {runtime_name} - {functions} function(s), {len(runtime):,} B "
+              f"({_gzip_size(runtime):,} B gzipped), downloaded once and cached across templates")
+    print("=" * 100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build minified templates with a shared runtime')
+    parser.add_argument('--out', default=str(DIST_DIR), help='output directory (default: dist/)')
+    parser.add_argument('--no-shared', action='store_true', help='keep helpers inline instead of extracting them')
+    parser.add_argument('--keep-unused-css', action='store_true', help='skip removing CSS rules that can never match')
+    args = parser.parse_args()
+
+    print_report(build(Path(args.out), shared=not args.no_shared, prune_css=not args.keep_unused_css))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Structured extraction of JavaScript colorSchemes objects
+Builds a cached table: template -> scheme -> role -> color (with source spans)
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from git_changes import parse_changed_since
+from template_discovery import find_templates, template_name
+from template_edits import SpanEdit, apply_span_edits
+
+CACHE_VERSION = 1
+NEUTRAL_REPLACEMENT = '#f5f5f5'
+
+SCHEMES_DECLARATION = re.compile(r'\b(?:const|let|var)\s+colorSchemes?\s*=\s*\{')
+
+# Reference selectors painted by the templates
+REFERENCE_SELECTOR = r"\.(?:reference|references|ref)(?:-item)?"
+
+# Pattern: querySelectorAll('.reference-item').forEach(el => { el.style.backgroundColor = colors.secondary; })
+JS_REFERENCE_ROLE = re.compile(
+    r"querySelector(?:All)?\(['\"]" + REFERENCE_SELECTOR + r"[^'\"]*['\"]\)[^}]*?backgroundColor\s*=\s*colors\.(\w+)",
+    re.DOTALL
+)
+
+# Pattern: .reference-item { background: var(--secondary-color); }
+CSS_REFERENCE_VAR = re.compile(
+    REFERENCE_SELECTOR + r"\s*\{[^}]*?background(?:-color)?:\s*var\((--[\w-]+)\)",
+    re.DOTALL
+)
+
+# Pattern: setProperty('--secondary-color', colors.secondary)
+CSS_VAR_ROLE = re.compile(r"setProperty\(\s*['\"](--[\w-]+)['\"]\s*,\s*colors\.(\w+)\s*\)")
+
+# Necessary condition for either of the above, cheap to run over a bytes buffer
+REFERENCE_ROLE_HINT = re.compile(rb"backgroundColor\s*=\s*colors\.|background(?:-color)?:\s*var\(")
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*"|`(?:\\.|[^`\\])*`)
+  | (?P<word>[\w$#.\-]+)
+  | (?P<punct>[{}\[\]:,()])
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+
+class ObjectLiteralParser:
+    """
+    Minimal parser for JavaScript object literals
+    Returns nested dicts whose leaves are {'value', 'start', 'end', 'quote'}
+    """
+
+    def __init__(self, content: str, start: int):
+        self.content = content
+        self.tokens = self._tokenize(start)
+        self.index = 0
+
+    def _tokenize(self, start: int) -> List[tuple]:
+        """Tokenize from the opening brace until it is balanced"""
+        tokens = []
+        depth = 0
+        for match in TOKEN_PATTERN.finditer(self.content, start):
+            kind = match.lastgroup
+            if kind == 'space':
+                continue
+            text = match.group(0)
+            tokens.append((kind, text, match.start(), match.end()))
+            if text in '{[(' and kind == 'punct':
+                depth += 1
+            elif text in '}])' and kind == 'punct':
+                depth -= 1
+                if depth == 0:
+                    break
+        return tokens
+
+    def _peek(self) -> Optional[tuple]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _next(self) -> Optional[tuple]:
+        token = self._peek()
+        self.index += 1
+        return token
+
+    def parse(self) -> Dict:
+        """Parse the object literal starting at the first token"""
+        return self._parse_object()
+
+    def _parse_object(self) -> Dict:
+        result = {}
+        self._next()  # consume '{'
+
+        while True:
+            token = self._next()
+            if token is None or token[1] == '}':
+                return result
+            if token[1] == ',':
+                continue
+
+            key = token[1]
+            if token[0] == 'string':
+                key = key[1:-1]
+
+            colon = self._next()
+            if colon is None or colon[1] != ':':
+                # Shorthand or method syntax: skip to the next property
+                self._skip_value()
+                continue
+
+            result[key] = self._parse_value()
+
+    def _parse_value(self):
+        token = self._peek()
+        if token is None:
+            return None
+
+        if token[1] == '{':
+            return self._parse_object()
+
+        if token[0] == 'string' and self._ends_value(self.index + 1):
+            self._next()
+            return {
+                'value': token[1][1:-1],
+                'start': token[2] + 1,
+                'end': token[3] - 1,
+                'quote': token[1][0],
+            }
+
+        start, end = self._skip_value()
+        return {
+            'value': self.content[start:end].strip(),
+            'start': start,
+            'end': end,
+            'quote': '',
+        }
+
+    def _ends_value(self, index: int) -> bool:
+        return index >= len(self.tokens) or self.tokens[index][1] in (',', '}')
+
+    def _skip_value(self):
+        """Skip an arbitrary expression up to the next top-level ',' or '}'"""
+        depth = 0
+        start = end = None
+        while True:
+            token = self._peek()
+            if token is None:
+                break
+            if depth == 0 and token[1] in (',', '}'):
+                break
+            if token[0] == 'punct' and token[1] in '{[(':
+                depth += 1
+            elif token[0] == 'punct' and token[1] in '}])':
+                depth -= 1
+            if start is None:
+                start = token[2]
+            end = token[3]
+            self._next()
+        if start is None:
+            start = end = token[2] if token else len(self.content)
+        return start, end
+
+
+def extract_color_schemes(content: str) -> Dict[str, Dict[str, Dict]]:
+    """Extract every colorSchemes object in a template: scheme -> role -> color"""
+    schemes = {}
+    for match in SCHEMES_DECLARATION.finditer(content):
+        parsed = ObjectLiteralParser(content, match.end() - 1).parse()
+        for scheme, roles in parsed.items():
+            if not isinstance(roles, dict) or 'value' in roles:
+                continue
+            schemes[scheme] = {
+                role: color for role, color in roles.items()
+                if isinstance(color, dict) and 'value' in color
+            }
+    return schemes
+
+
+def find_reference_roles(content: str) -> Set[str]:
+    """Find the colorSchemes roles that end up as reference section backgrounds"""
+    roles = set(JS_REFERENCE_ROLE.findall(content))
+
+    css_vars = set(CSS_REFERENCE_VAR.findall(content))
+    if css_vars:
+        for var_name, role in CSS_VAR_ROLE.findall(content):
+            if var_name in css_vars:
+                roles.add(role)
+
+    return roles
+
+
+def may_have_reference_roles(buffer) -> bool:
+    """Prefilter over raw template bytes: False means find_reference_roles would find nothing"""
+    return REFERENCE_ROLE_HINT.search(buffer) is not None
+
+
+def is_neutral(color: str) -> bool:
+    """Check if color is white, gray, or transparent"""
+    color = color.lower().strip()
+
+    if not color.startswith('#'):
+        return color in ['white', 'transparent', 'fff', 'ffffff']
+
+    hex_color = color[1:]
+    if len(hex_color) == 3:
+        hex_color = ''.join([c*2 for c in hex_color])
+
+    if len(hex_color) == 6:
+        try:
+            r = int(hex_color[0:2], 16)
+            g = int(hex_color[2:4], 16)
+            b = int(hex_color[4:6], 16)
+            return r == g == b
+        except ValueError:
+            return False
+
+    return False
+
+
+def analyze_template(content: str) -> Dict:
+    """Build the color table entry for a single template"""
+    return {
+        'schemes': extract_color_schemes(content),
+        'reference_roles': sorted(find_reference_roles(content)),
+    }
+
+
+def load_color_table(template_files: List[Path], cache_path: Optional[Path] = None) -> Dict[str, Dict]:
+    """
+    Load the template -> scheme -> role -> color table
+    Entries are cached by file size and mtime and only recomputed when a file changes
+    """
+    if cache_path is None:
+        cache_path = Path(__file__).parent / '.cache' / 'color_schemes.json'
+
+    cache = {}
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if cache.get('version') != CACHE_VERSION:
+            cache = {}
+
+    entries = cache.get('templates', {})
+    table = {}
+    dirty = False
+
+    for filepath in template_files:
+        stat = filepath.stat()
+        key = str(filepath)
+        stamp = [stat.st_size, stat.st_mtime_ns]
+
+        entry = entries.get(key)
+        if entry is None or entry['stamp'] != stamp:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                entry = {'stamp': stamp, **analyze_template(f.read())}
+            entries[key] = entry
+            dirty = True
+
+        table[template_name(filepath)] = entry
+
+    if dirty:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'templates': entries}, f)
+
+    return table
+
+
+def find_colored_reference_roles(entry: Dict) -> List[Dict]:
+    """List every non-neutral color used for a reference role"""
+    colored = []
+    for scheme, roles in entry['schemes'].items():
+        for role in entry['reference_roles']:
+            color = roles.get(role)
+            if color and color['quote'] and not is_neutral(color['value']):
+                colored.append({'scheme': scheme, 'role': role, **color})
+    return colored
+
+
+def plan_reference_color_edits(entry: Dict, replacement: str = NEUTRAL_REPLACEMENT) -> List[SpanEdit]:
+    """Turn colored reference roles into span edits that neutralize them"""
+    return [(color['start'], color['end'], replacement) for color in find_colored_reference_roles(entry)]
+
+
+def fix_reference_colors(content: str, entry: Optional[Dict] = None) -> str:
+    """Neutralize colored reference roles in a template's colorSchemes"""
+    if entry is None:
+        entry = analyze_template(content)
+    return apply_span_edits(content, plan_reference_color_edits(entry))
+
+
+def main():
+    """Print the color table for all templates"""
+    template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, changed_since=changed_since)
+
+    table = load_color_table(html_files)
+
+    print("=" * 100)
+    print("COLOR SCHEME TABLE")
+    print("=" * 100)
+
+    for filename, entry in sorted(table.items()):
+        if not entry['schemes']:
+            continue
+
+        print(f"\n{filename} (reference roles: {', '.join(entry['reference_roles']) or 'none'})")
+        for scheme, roles in entry['schemes'].items():
+            values = ', '.join(f"{role}={color['value']}" for role, color in roles.items())
+            print(f"  {scheme:12} {values}")
+
+    print()
+    print("=" * 100)
+    print(f"SUMMARY: {sum(1 for e in table.values() if e['schemes'])}/{len(table)} template(s) define color schemes")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
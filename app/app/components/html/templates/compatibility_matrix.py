@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Resume x template compatibility matrix
+Every schema path gets a stable bit in a field registry; resumes become presence bitmaps,
+templates become consumed-field bitmaps, and NumPy computes for every pair:
+1. Missing data (fields the resume fills that the template never renders)
+2. Undefined render (fields the template renders that the resume leaves empty)
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from deep_validator import CATEGORY_PATHS, DeepValidator, variable_category
+from field_references import extract_all_json_paths, find_field_references
+from schema_inference import load_resumes
+from template_discovery import RESUME, find_templates, template_name
+from template_loader import process_templates
+
+TEMPLATE_DIR = Path(__file__).parent
+REGISTRY_PATH = TEMPLATE_DIR / '.cache' / 'field_registry.json'
+REGISTRY_VERSION = 1
+
+# Resumes unpacked per matmul; bounds memory at chunk_size x fields bytes
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class FieldRegistry:
+    """
+    Maps schema paths to bit indexes
+    Append-only, so bitmaps encoded earlier stay valid as the registry grows
+    """
+
+    def __init__(self, fields: Iterable[str] = ()):
+        self.fields = []
+        self.bits = {}
+        for field in fields:
+            self.index(field)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.bits
+
+    def index(self, field: str) -> int:
+        """Bit index of field, assigning the next free bit to new fields"""
+        bit = self.bits.get(field)
+        if bit is None:
+            bit = len(self.fields)
+            self.bits[field] = bit
+            self.fields.append(field)
+        return bit
+
+    @property
+    def width(self) -> int:
+        """Bytes per packed bitmap"""
+        return (len(self.fields) + 7) // 8
+
+    def bitmap(self, fields: Iterable[str]) -> np.ndarray:
+        """Packed bitmap of fields, registering any that are new"""
+        indexes = [self.index(field) for field in fields]
+        bits = np.zeros(self.width * 8, dtype=np.uint8)
+        bits[indexes] = 1
+        return np.packbits(bits)
+
+    @classmethod
+    def load(cls, path: Path = REGISTRY_PATH) -> 'FieldRegistry':
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get('version') != REGISTRY_VERSION:
+            return cls()
+        return cls(data.get('fields', []))
+
+    def save(self, path: Path = REGISTRY_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': REGISTRY_VERSION, 'fields': self.fields}, f, indent=1)
+        tmp.replace(path)
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == '' or value == [] or value == {}
+
+
+def resume_fields(content: dict, prefix: str = '') -> Set[str]:
+    """
+    Paths holding data in a resume, with parents of every filled path
+    Unlike extract_all_json_paths, every array item counts, not just the first
+    """
+    fields = set()
+
+    if isinstance(content, dict):
+        for key, value in content.items():
+            if _is_empty(value):
+                continue
+            path = f"{prefix}.{key}" if prefix else key
+            fields.add(path)
+            if isinstance(value, (dict, list)):
+                fields.update(resume_fields(value, path))
+
+    elif isinstance(content, list):
+        for item in content:
+            if isinstance(item, (dict, list)):
+                fields.update(resume_fields(item, prefix))
+
+    return fields
+
+
+def _resolve(path: str, known: Set[str]) -> str:
+    """Longest registered prefix of path, or path itself when nothing matches"""
+    parts = path.split('.')
+    for i in range(len(parts), 0, -1):
+        candidate = '.'.join(parts[:i])
+        if candidate in known:
+            return candidate
+    return path
+
+
+def template_fields(template_path: Path, content: str, validator: DeepValidator,
+                    known: Set[str]) -> Set[str]:
+    """
+    Resume paths a template consumes
+    Combines resumeData/personal references with the category-aware property accesses
+    DeepValidator finds on loop variables (job.company -> employmentHistory.company)
+    """
+    consumed = set()
+
+    for field in find_field_references(content):
+        if field in ('content', 'resumeData'):
+            continue
+        # personal.X is personalInfo.X, matching the completeness check's normalization
+        if field not in known and f'personalInfo.{field}' in known:
+            field = f'personalInfo.{field}'
+        consumed.add(field)
+
+    for var_name, prop_chain, _, _ in validator.find_all_property_accesses(content):
+        category = variable_category(var_name)
+        prefix = CATEGORY_PATHS.get(category)
+        if prefix is None:
+            continue
+        path = _resolve(f"{prefix}.{prop_chain}", known)
+        if path not in known:
+            # Unknown chain: keep only its first property, the part the template reads
+            path = f"{prefix}.{prop_chain.split('.')[0]}"
+        consumed.add(path)
+
+    return consumed
+
+
+_worker_validator = None
+_worker_known: Set[str] = set()
+
+
+def _init_worker(validator: DeepValidator, known: Set[str]):
+    global _worker_validator, _worker_known
+    _worker_validator = validator
+    _worker_known = known
+
+
+def _fields_in_worker(path: Path, content: str) -> Set[str]:
+    return template_fields(path, content, _worker_validator, _worker_known)
+
+
+def _stack(rows: List[np.ndarray], width: int) -> np.ndarray:
+    """Stack packed rows, zero-padding those encoded before the registry grew"""
+    packed = np.zeros((len(rows), width), dtype=np.uint8)
+    for i, row in enumerate(rows):
+        packed[i, :len(row)] = row
+    return packed
+
+
+def encode_resumes(resumes: Iterable[dict], registry: FieldRegistry) -> List[np.ndarray]:
+    """Packed presence bitmap per resume"""
+    return [registry.bitmap(resume_fields(resume)) for resume in resumes]
+
+
+def encode_templates(template_paths: List[Path], registry: FieldRegistry,
+                     validator: DeepValidator) -> List[np.ndarray]:
+    """Packed consumed-field bitmap per template, in template_paths order"""
+    # The validator and field set go to each pool worker once, not with every template
+    consumed = process_templates(template_paths, _fields_in_worker, initializer=_init_worker,
+                                 initargs=(validator, set(registry.fields)))
+    return [registry.bitmap(sorted(consumed[path])) for path in template_paths]
+
+
+def compatibility_matrices(resumes: np.ndarray, templates: np.ndarray, n_fields: int,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (missing_data, undefined_render), both resumes x templates
+    missing_data[r, t]: fields resume r fills that template t does not render
+    undefined_render[r, t]: fields template t renders that resume r leaves empty
+    """
+    template_bits = np.unpackbits(templates, axis=1, count=n_fields).astype(np.float32)
+    template_totals = template_bits.sum(axis=1).astype(np.int32)
+
+    missing = np.empty((len(resumes), len(templates)), dtype=np.int32)
+    undefined = np.empty_like(missing)
+
+    for start in range(0, len(resumes), chunk_size):
+        chunk = np.unpackbits(resumes[start:start + chunk_size], axis=1, count=n_fields).astype(np.float32)
+        # float32 matmul is exact for counts below 2**24
+        shared = (chunk @ template_bits.T).astype(np.int32)
+        stop = start + len(chunk)
+        missing[start:stop] = chunk.sum(axis=1).astype(np.int32)[:, None] - shared
+        undefined[start:stop] = template_totals[None, :] - shared
+
+    return missing, undefined
+
+
+def build_matrix(resume_source: Path, template_dir: Optional[Path] = None,
+                 changed_since: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Encode the resumes and templates and compute both matrices"""
+    template_dir = Path(template_dir) if template_dir else TEMPLATE_DIR
+    validator = DeepValidator(template_dir / 'resume.json')
+
+    # Seed with the reference schema so its fields keep the lowest, stable bits
+    registry = FieldRegistry.load()
+    for field in sorted(extract_all_json_paths(validator.json_data.get('content', {}))):
+        registry.index(field)
+
+    template_paths = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
+    template_rows = encode_templates(template_paths, registry, validator)
+    resume_rows = encode_resumes(load_resumes(resume_source), registry)
+    registry.save()
+
+    width = registry.width
+    missing, undefined = compatibility_matrices(
+        _stack(resume_rows, width), _stack(template_rows, width), len(registry), chunk_size
+    )
+    names = [template_name(path, template_dir) for path in template_paths]
+    return registry, names, missing, undefined
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('resumes', nargs='?', default=str(TEMPLATE_DIR / 'resume.json'),
+                        help='resume.json or a JSONL corpus of resumes (default: resume.json)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='resumes per matrix multiply')
+    parser.add_argument('--changed-since', metavar='REF',
+                        help='only process templates changed since this git ref, plus templates sharing the changed code')
+    args = parser.parse_args()
+
+    print("=" * 100)
+    print("RESUME x TEMPLATE COMPATIBILITY MATRIX")
+    print("=" * 100)
+    print()
+
+    registry, names, missing, undefined = build_matrix(
+        Path(args.resumes), changed_since=args.changed_since, chunk_size=args.chunk_size
+    )
+
+    print(f"Field registry: {len(registry)} fields ({registry.width} bytes per bitmap)")
+    print(f"Resumes: {missing.shape[0]:,}   Templates: {missing.shape[1]}")
+    print()
+
+    if not names or not missing.shape[0]:
+        print("Nothing to compare")
+        return
+
+    print(f"{'TEMPLATE':40} {'MISSING DATA':>14} {'UNDEFINED RENDER':>18}   (mean per resume)")
+    print("-" * 100)
+    mean_missing = missing.mean(axis=0)
+    mean_undefined = undefined.mean(axis=0)
+    for t in np.lexsort((mean_undefined, mean_missing)):
+        print(f"{names[t]:40} {mean_missing[t]:>14.1f} {mean_undefined[t]:>18.1f}")
+
+    print()
+    print("=" * 100)
+    best = np.argmin(missing + undefined, axis=1)
+    counts = np.bincount(best, minlength=len(names))
+    print("BEST MATCH COUNTS:")
+    for t in np.argsort(-counts)[:10]:
+        if counts[t]:
+            print(f"  {names[t]:40} {counts[t]:>10,} resume(s)")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,40 +6,49 @@ Comprehensive check for ALL reference section styling in templates
 import re
 from pathlib import Path
 
-def extract_all_reference_styles(content):
-    """Extract ALL CSS rules that might apply to reference sections"""
+import css_rules
+from git_changes import parse_changed_since
+from template_discovery import find_templates, template_name
+from template_document import TemplateDocument
+from template_scan import decode, has_references, mapped_template
+
+# Selectors of the rules that style reference sections, matched per selector of a rule
+REFERENCE_ITEM_SELECTOR = re.compile(r'\.reference-item$')
+REFERENCE_SELECTOR = re.compile(r'\.reference$')
+REF_ITEM_SELECTOR = re.compile(r'\.(references?|ref)-item$')
+JS_REFERENCE_PATTERN = re.compile(rb"querySelector(?:All)?\(['\"]\.reference[^'\"]*['\"]\)[^}]*backgroundColor\s*=\s*([^;]+);")
+
+def extract_all_reference_styles(document):
+    """Extract ALL CSS rules that might apply to reference sections of a TemplateDocument"""
     styles_found = []
+    rules = document.css_rules
 
     # Pattern 1: .reference-item (most common)
-    pattern1 = r'\.reference-item\s*\{([^}]+)\}'
-    for match in re.finditer(pattern1, content, re.DOTALL):
+    for rule in css_rules.selecting(rules, REFERENCE_ITEM_SELECTOR):
         styles_found.append({
             'selector': '.reference-item',
-            'styles': match.group(1).strip()
+            'styles': rule.body(document.content).strip()
         })
 
     # Pattern 2: .reference (without suffix)
-    pattern2 = r'\.reference\s*\{([^}]+)\}'
-    for match in re.finditer(pattern2, content, re.DOTALL):
+    for rule in css_rules.selecting(rules, REFERENCE_SELECTOR):
         styles_found.append({
             'selector': '.reference',
-            'styles': match.group(1).strip()
+            'styles': rule.body(document.content).strip()
         })
 
     # Pattern 3: .references-item or .ref-item
-    pattern3 = r'\.(references?|ref)-item\s*\{([^}]+)\}'
-    for match in re.finditer(pattern3, content, re.DOTALL):
+    for rule in css_rules.selecting(rules, REF_ITEM_SELECTOR):
         styles_found.append({
-            'selector': match.group(0).split('{')[0].strip(),
-            'styles': match.group(2).strip()
+            'selector': rule.prelude,
+            'styles': rule.body(document.content).strip()
         })
 
     # Pattern 4: Dynamic styling in JavaScript (document.querySelectorAll)
-    js_pattern = r"querySelector(?:All)?\(['\"]\.reference[^'\"]*['\"]\)[^}]*backgroundColor\s*=\s*([^;]+);"
-    for match in re.finditer(js_pattern, content):
+    for match in JS_REFERENCE_PATTERN.finditer(document.data):
         styles_found.append({
             'selector': 'JS: .reference (dynamic)',
-            'styles': f'backgroundColor: {match.group(1).strip()}'
+            'styles': f'backgroundColor: {decode(match.group(1)).strip()}'
         })
 
     return styles_found
@@ -99,7 +108,8 @@ def check_if_neutral(color):
 def main():
     """Analyze all templates"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, changed_since=changed_since)
 
     print("=" * 100)
     print("COMPREHENSIVE REFERENCE SECTION BACKGROUND CHECK")
@@ -109,14 +119,13 @@ def main():
     templates_to_fix = {}
 
     for html_file in html_files:
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with mapped_template(html_file) as buffer:
+            # Skip if no reference section
+            if not has_references(buffer):
+                continue
 
-        # Skip if no reference section
-        if 'reference' not in content.lower():
-            continue
+        styles = extract_all_reference_styles(TemplateDocument(html_file))
 
-        styles = extract_all_reference_styles(content)
         if not styles:
             continue
 
@@ -131,7 +140,7 @@ def main():
                 })
 
         if issues:
-            templates_to_fix[html_file.name] = issues
+            templates_to_fix[template_name(html_file, template_dir)] = issues
 
     # Print results
     if not templates_to_fix:
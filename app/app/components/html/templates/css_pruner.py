@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Unused CSS rule elimination
+Collects every class and id a template can produce - static markup, class/id attributes
+inside JS template literals, className/classList/setAttribute in scripts - and drops
+<style> selectors that require anything else. Names built at runtime (`level-${n}`,
+'tag-' + kind) become prefix/suffix patterns; ALLOWLIST covers names added from outside.
+
+Usage:
+    python css_pruner.py                 # report what would be removed
+    python css_pruner.py --write         # rewrite the templates
+    python css_pruner.py --allow 'is-*'  # keep extra dynamic names
+"""
+
+import argparse
+import re
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+import css_rules
+from template_discovery import find_templates, template_name
+from template_document import Finding
+from template_edits import apply_span_edits
+from template_writes import write_if_changed
+
+TEMPLATE_DIR = Path(__file__).parent
+
+# Names the host page or browser may add that no template source mentions
+ALLOWLIST = ('print-*', 'dark-*')
+
+ATTRIBUTE = re.compile(r'''\b(class|id)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+JS_CLASS_SOURCES = [
+    re.compile(r'\.(?:className|id)\s*\+?=\s*([^;\n]+)'),
+    re.compile(r'\.classList\.(?:add|remove|toggle|replace|contains)\(([^)]*)\)'),
+    re.compile(r'''\.setAttribute\(\s*['"](?:class|id)['"]\s*,\s*([^)]*)\)'''),
+]
+STRING_LITERAL = re.compile(r'''"([^"\\\n]*)"|'([^'\\\n]*)'|`([^`]*)`''')
+NAME = re.compile(r'-?[_a-zA-Z][\w-]*')
+# A name glued to an interpolation or concatenation: its other half is only known at runtime
+PREFIX = re.compile(r'(-?[_a-zA-Z][\w-]*)(?:\$\{|[\'"`]\s*\+)')
+SUFFIX = re.compile(r'(?:\}|\+\s*[\'"`])([\w-]*[\w])')
+
+SELECTOR_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+SELECTOR_ID = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+# Parts of a selector that never make it impossible to match: attribute tests and the
+# arguments of functional pseudo-classes (:not(.x) does not require .x)
+SELECTOR_OPTIONAL = re.compile(r'\[[^\]]*\]|:(?:not|is|where|has|matches)\([^)]*\)')
+
+
+class ProducibleNames:
+    """Classes and ids a template can put on an element, plus runtime name patterns"""
+
+    def __init__(self, names: Set[str], patterns: Set[str]):
+        self.names = names
+        self.patterns = patterns
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names or any(fnmatch(name, pattern) for pattern in self.patterns)
+
+
+def producible_names(content: str, allowlist: Iterable[str] = ALLOWLIST) -> ProducibleNames:
+    """Every class or id the template's markup and scripts can produce"""
+    names = set()
+    patterns = set(allowlist)
+
+    def collect(text: str):
+        names.update(NAME.findall(text))
+        patterns.update(f"{prefix}*" for prefix in PREFIX.findall(text))
+        patterns.update(f"*{suffix}" for suffix in SUFFIX.findall(text))
+
+    for match in ATTRIBUTE.finditer(content):
+        collect(match.group(2) if match.group(2) is not None else match.group(3))
+
+    for pattern in JS_CLASS_SOURCES:
+        for match in pattern.finditer(content):
+            expression = match.group(1)
+            for literal in STRING_LITERAL.finditer(expression):
+                collect(next(group for group in literal.groups() if group is not None))
+            patterns.update(f"{prefix}*" for prefix in PREFIX.findall(expression))
+
+    return ProducibleNames(names, patterns)
+
+
+def selector_can_match(selector: str, producible: ProducibleNames) -> bool:
+    """False only when the selector requires a class or id the template never produces"""
+    if '\\' in selector:
+        return True
+    required = SELECTOR_OPTIONAL.sub('', selector)
+    return (all(name in producible for name in SELECTOR_CLASS.findall(required))
+            and all(name in producible for name in SELECTOR_ID.findall(required)))
+
+
+def _plan(rules: List[css_rules.CssRule], producible: ProducibleNames, edits: list, removed: List[str]) -> int:
+    """Queue edits for dead rules and selectors; returns how many rules survive"""
+    surviving = 0
+    for rule in rules:
+        if rule.children is not None:
+            if _plan(rule.children, producible, edits, removed) == 0 and rule.children:
+                edits[:] = [e for e in edits if not (rule.start <= e[0] < rule.end)]
+                edits.append((rule.start, rule.end, ''))
+            else:
+                surviving += 1
+            continue
+
+        if rule.is_at_rule:
+            surviving += 1
+            continue
+
+        selectors = rule.selectors()
+        live = [s for s in selectors if selector_can_match(s, producible)]
+        dead = [s for s in selectors if s not in live]
+        removed.extend(dead)
+
+        if not live:
+            edits.append((rule.start, rule.end, ''))
+        else:
+            surviving += 1
+            if dead:
+                edits.append((rule.prelude_start, rule.prelude_end, ', '.join(live) + ' '))
+
+    return surviving
+
+
+def prune_css(content: str, allowlist: Iterable[str] = ALLOWLIST,
+              rules: Optional[List[css_rules.CssRule]] = None) -> Tuple[str, List[str]]:
+    """Content without the rules and selectors that can never match, and the removed selectors"""
+    producible = producible_names(content, allowlist)
+    edits = []
+    removed = []
+    _plan(css_rules.template_rules(content) if rules is None else rules, producible, edits, removed)
+    return apply_span_edits(content, edits), removed
+
+
+def checker(template_dir: Path):
+    """Selectors that can never match, as a hirehub_templates checker"""
+    def check(document) -> List[Finding]:
+        _, removed = prune_css(document.content, rules=document.css_rules)
+        return [Finding('unused-css', None, selector) for selector in removed]
+
+    return check
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--write', action='store_true', help='rewrite templates in place')
+    parser.add_argument('--allow', action='append', default=[], metavar='PATTERN',
+                        help='class/id glob to always keep (repeatable)')
+    parser.add_argument('--changed-since', metavar='REF',
+                        help='only process templates changed since this git ref, plus templates sharing the changed code')
+    args = parser.parse_args()
+
+    template_dir = TEMPLATE_DIR
+    allowlist = ALLOWLIST + tuple(args.allow)
+
+    print("=" * 100)
+    print("UNUSED CSS" + (" - PRUNING" if args.write else " - DRY RUN"))
+    print("=" * 100)
+    print()
+
+    total_selectors = 0
+    total_bytes = 0
+    for path in find_templates(template_dir, changed_since=args.changed_since):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        pruned, removed = prune_css(content, allowlist)
+        if not removed:
+            continue
+
+        saved = len(content.encode('utf-8')) - len(pruned.encode('utf-8'))
+        total_selectors += len(removed)
+        total_bytes += saved
+        print(f"{template_name(path, template_dir)}: {len(removed)} selector(s), {saved:,} B")
+        for selector in removed:
+            print(f"    {selector}")
+
+        if args.write:
+            write_if_changed(path, pruned)
+
+    print()
+    print("=" * 100)
+    action = "Removed" if args.write else "Would remove"
+    print(f"{action} {total_selectors} selector(s), {total_bytes:,} B")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
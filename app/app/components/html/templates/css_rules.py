@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+<style> rule parsing
+Splits template CSS into rules (selector list + declaration body) with their offsets,
+aware of comments, strings and nested at-rules such as @media. The pruner and the reference
+checkers and fixers all read template CSS through these rules.
+"""
+
+import re
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+STYLE_BLOCK = re.compile(r'<style\b[^>]*>(.*?)</style>', re.DOTALL | re.IGNORECASE)
+
+# At-rules whose block holds further rules rather than declarations
+NESTING_AT_RULES = ('@media', '@supports', '@document', '@layer', '@container')
+
+
+class CssRule:
+    """A rule or at-rule; offsets are absolute positions in the template"""
+
+    __slots__ = ('prelude', 'start', 'end', 'prelude_start', 'prelude_end', 'body_start', 'body_end', 'children')
+
+    def __init__(self, prelude: str, start: int, end: int, prelude_start: int, prelude_end: int,
+                 body_start: int, body_end: int, children: Optional[List['CssRule']] = None):
+        self.prelude = prelude              # selector list, or the at-rule header
+        self.start = start                  # first character of the prelude
+        self.end = end                      # just past the closing brace
+        self.prelude_start = prelude_start
+        self.prelude_end = prelude_end
+        self.body_start = body_start        # just past the opening brace
+        self.body_end = body_end            # the closing brace
+        self.children = children            # nested rules for @media and friends, else None
+
+    @property
+    def is_at_rule(self) -> bool:
+        return self.prelude.startswith('@')
+
+    def selectors(self) -> List[str]:
+        """The comma-separated selectors of a style rule"""
+        return split_selectors(self.prelude)
+
+    def body(self, content: str) -> str:
+        """The declarations between the braces"""
+        return content[self.body_start:self.body_end]
+
+    def __repr__(self):
+        return f"CssRule({self.prelude!r}, {self.start}-{self.end})"
+
+
+def split_selectors(prelude: str) -> List[str]:
+    """Split a selector list on top-level commas (not those inside :is(...) or [attr])"""
+    selectors = []
+    depth = 0
+    current = []
+    for c in prelude:
+        if c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            selectors.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(c)
+    selectors.append(''.join(current).strip())
+    return [s for s in selectors if s]
+
+
+def _skip_string(css: str, i: int, end: int) -> int:
+    quote = css[i]
+    i += 1
+    while i < end and css[i] != quote:
+        i += 2 if css[i] == '\\' else 1
+    return i + 1
+
+
+def _matching_brace(css: str, i: int, end: int) -> int:
+    """Position of the brace closing the one at i"""
+    depth = 0
+    while i < end:
+        c = css[i]
+        if c in '"\'':
+            i = _skip_string(css, i, end)
+            continue
+        if css.startswith('/*', i):
+            stop = css.find('*/', i + 2, end)
+            i = end if stop == -1 else stop + 2
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return end
+
+
+def parse_rules(css: str, start: int = 0, end: Optional[int] = None) -> List[CssRule]:
+    """Rules in css[start:end]; statements such as @import ...; are skipped"""
+    if end is None:
+        end = len(css)
+
+    rules = []
+    prelude_start = None
+    i = start
+    while i < end:
+        c = css[i]
+        if css.startswith('/*', i):
+            stop = css.find('*/', i + 2, end)
+            i = end if stop == -1 else stop + 2
+            continue
+        if c in '"\'':
+            if prelude_start is None:
+                prelude_start = i
+            i = _skip_string(css, i, end)
+            continue
+        if c == ';' or c == '}':
+            prelude_start = None
+            i += 1
+            continue
+        if c == '{':
+            ps = prelude_start if prelude_start is not None else i
+            prelude = css[ps:i].strip()
+            close = _matching_brace(css, i, end)
+            children = None
+            if prelude.lower().startswith(NESTING_AT_RULES):
+                children = parse_rules(css, i + 1, close)
+            rules.append(CssRule(prelude, ps, min(close + 1, end), ps, i, i + 1, close, children))
+            prelude_start = None
+            i = close + 1
+            continue
+        if prelude_start is None and not c.isspace():
+            prelude_start = i
+        i += 1
+
+    return rules
+
+
+def style_blocks(content: str) -> List[Tuple[int, int]]:
+    """(start, end) of the CSS inside every <style> element"""
+    return [(m.start(1), m.end(1)) for m in STYLE_BLOCK.finditer(content)]
+
+
+def template_rules(content: str) -> List[CssRule]:
+    """Top-level rules of every <style> element, with absolute offsets"""
+    rules = []
+    for start, end in style_blocks(content):
+        rules.extend(parse_rules(content, start, end))
+    return rules
+
+
+def walk(rules: List[CssRule]) -> Iterator[CssRule]:
+    """Every rule, descending into nested at-rules"""
+    for rule in rules:
+        yield rule
+        if rule.children:
+            yield from walk(rule.children)
+
+
+def selecting(rules: List[CssRule], selector: Pattern) -> Iterator[CssRule]:
+    """Style rules, nested ones included, with a selector that selector.search matches"""
+    for rule in walk(rules):
+        if not rule.is_at_rule and any(selector.search(s) for s in rule.selectors()):
+            yield rule
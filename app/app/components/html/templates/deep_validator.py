@@ -6,170 +6,186 @@ Checks template strings, innerHTML, textContent, and all property accesses
 
 import json
 import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
-from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from function_cache import FunctionCache
+from git_changes import parse_changed_since
+from issue_counts import IssueCounter
+from issue_records import PROPERTY_ACCESS, TEMPLATE_STRING, IssueTable, StringTable
+from schema_inference import resume_schema
+from template_discovery import RESUME, find_templates, template_name
+from template_document import Finding
+from template_loader import process_templates
+
+# Variable names templates use for each resume category
+VAR_PATTERNS = {
+    'personalInfo': ['personal', 'personalInfo', 'contact'],
+    'employment': ['job', 'exp', 'employment'],
+    'education': ['edu', 'education'],
+    'skills': ['skill'],
+    'skillGroups': ['group', 'g', 'cat'],
+    'languages': ['lang', 'language'],
+    'projects': ['proj', 'project'],
+    'publications': ['pub', 'publication'],
+    'courses': ['course'],
+    'references': ['ref', 'reference'],
+    'awards': ['award'],
+    'volunteering': ['vol', 'volunteer'],
+    'websitesAndSocialLinks': ['link', 'social'],
+}
+
+# Where each category lives in resume.json content
+CATEGORY_PATHS = {
+    'personalInfo': 'personalInfo',
+    'employment': 'employmentHistory',
+    'education': 'education',
+    'skills': 'skills',
+    'skillGroups': 'skillGroups',
+    'languages': 'languages',
+    'projects': 'projects',
+    'publications': 'publications',
+    'courses': 'courses',
+    'references': 'references',
+    'awards': 'customSections.awards',
+    'volunteering': 'customSections.volunteering',
+    'websitesAndSocialLinks': 'personalInfo.websitesAndSocialLinks',
+}
+
+# JavaScript built-ins to ignore
+JS_BUILTINS = {
+    'forEach', 'map', 'filter', 'reduce', 'find', 'findIndex',
+    'some', 'every', 'includes', 'indexOf', 'length', 'push',
+    'pop', 'shift', 'unshift', 'slice', 'splice', 'join',
+    'concat', 'toString', 'valueOf', 'hasOwnProperty',
+    'toLowerCase', 'toUpperCase', 'trim', 'split', 'replace',
+    'charAt', 'charCodeAt', 'substring', 'substr',
+    'innerHTML', 'textContent', 'innerText', 'className',
+    'style', 'src', 'href', 'value', 'id', 'name',
+    'appendChild', 'removeChild', 'createElement',
+    'getElementById', 'querySelector', 'querySelectorAll',
+    'addEventListener', 'removeEventListener',
+    'preventDefault', 'stopPropagation',
+    'classList', 'dataset', 'attributes',
+    'parentNode', 'childNodes', 'firstChild', 'lastChild',
+    'nextSibling', 'previousSibling',
+    'display', 'color', 'background', 'width', 'height',
+    'toLocaleDateString', 'toLocaleString', 'getTime',
+}
+
+GLOBAL_OBJECTS = {
+    'document', 'window', 'console', 'Math', 'Date',
+    'Array', 'Object', 'String', 'JSON', 'localStorage',
+    'sessionStorage', 'navigator', 'location', 'history',
+}
+
+TEMPLATE_STRING_ACCESS = re.compile(r'\$\{([a-zA-Z_$][a-zA-Z0-9_$]*)\.([a-zA-Z_$][a-zA-Z0-9_$.]*)\}')
+DIRECT_ACCESS = re.compile(r'\b([a-zA-Z_$][a-zA-Z0-9_$]*)\.([a-zA-Z_$][a-zA-Z0-9_$.]+)\b')
+
+
+def variable_category(var_name: str, var_patterns: Dict[str, List[str]] = VAR_PATTERNS) -> Optional[str]:
+    """Category a loop variable name stands for (job -> employment), or None"""
+    for category, patterns in var_patterns.items():
+        if var_name in patterns:
+            return category
+    return None
+
 
 class DeepValidator:
-    def __init__(self, json_path: str):
+    # Bump when find_all_property_accesses changes what it reports
+    ACCESS_CACHE_VERSION = 2
+
+    def __init__(self, json_path: str, use_function_cache: bool = True):
         """Initialize with resume.json"""
         self.json_path = Path(json_path)
         self.json_data = {}
         self.valid_fields = self._load_structure()
+        # Shared by every IssueTable this validator returns
+        self.strings = StringTable()
+        # Accesses don't depend on resume.json, so they are cached per JS function
+        self.function_cache = (
+            FunctionCache('deep_validator.accesses', self.ACCESS_CACHE_VERSION)
+            if use_function_cache else None
+        )
 
     def _load_structure(self) -> Dict[str, Set[str]]:
         """Load resume.json and extract all valid field names by category"""
         with open(self.json_path, 'r', encoding='utf-8') as f:
             self.json_data = json.load(f)
 
-        content = self.json_data.get('content', {})
-
-        fields = {
-            'personalInfo': set(),
-            'employment': set(),
-            'education': set(),
-            'skills': set(),
-            'skillGroups': set(),
-            'languages': set(),
-            'projects': set(),
-            'publications': set(),
-            'courses': set(),
-            'references': set(),
-            'awards': set(),
-            'volunteering': set(),
-            'websitesAndSocialLinks': set(),
-        }
-
-        # Extract personalInfo fields
-        if 'personalInfo' in content:
-            fields['personalInfo'] = set(content['personalInfo'].keys())
-            # Add nested socialLinks fields
-            if 'socialLinks' in content['personalInfo']:
-                for key in content['personalInfo']['socialLinks'].keys():
-                    fields['personalInfo'].add(f'socialLinks.{key}')
-            # Add websitesAndSocialLinks item fields
-            if 'websitesAndSocialLinks' in content['personalInfo']:
-                if content['personalInfo']['websitesAndSocialLinks']:
-                    fields['websitesAndSocialLinks'] = set(
-                        content['personalInfo']['websitesAndSocialLinks'][0].keys()
-                    )
-
-        # Extract array item fields
-        array_mappings = [
-            ('employmentHistory', 'employment'),
-            ('education', 'education'),
-            ('skills', 'skills'),
-            ('skillGroups', 'skillGroups'),
-            ('languages', 'languages'),
-            ('projects', 'projects'),
-            ('publications', 'publications'),
-            ('courses', 'courses'),
-            ('references', 'references'),
-        ]
-
-        for json_key, field_key in array_mappings:
-            if json_key in content and content[json_key]:
-                if isinstance(content[json_key], list) and len(content[json_key]) > 0:
-                    fields[field_key] = set(content[json_key][0].keys())
+        # Every array item counts, and the saved corpus schema adds fields the sample lacks
+        schema = resume_schema(self.json_path)
+        fields = {category: schema.children(path) for category, path in CATEGORY_PATHS.items()}
 
-        # Extract customSections
-        if 'customSections' in content:
-            if 'awards' in content['customSections'] and content['customSections']['awards']:
-                fields['awards'] = set(content['customSections']['awards'][0].keys())
-            if 'volunteering' in content['customSections'] and content['customSections']['volunteering']:
-                fields['volunteering'] = set(content['customSections']['volunteering'][0].keys())
+        # Add nested socialLinks fields
+        fields['personalInfo'] |= {f'socialLinks.{key}' for key in schema.children('personalInfo.socialLinks')}
 
         return fields
 
     def find_all_property_accesses(self, content: str) -> List[Tuple[str, str, int, str]]:
         """
         Find ALL property accesses in JavaScript code
-        Returns: (variable, property, line_number, context)
+        Returns: (variable, property, line_number, access kind)
         """
         issues = []
-        lines = content.split('\n')
-
-        # Variable name patterns for each category
-        var_patterns = {
-            'personalInfo': ['personal', 'personalInfo', 'contact'],
-            'employment': ['job', 'exp', 'employment'],
-            'education': ['edu', 'education'],
-            'skills': ['skill'],
-            'skillGroups': ['group', 'g', 'cat'],
-            'languages': ['lang', 'language'],
-            'projects': ['proj', 'project'],
-            'publications': ['pub', 'publication'],
-            'courses': ['course'],
-            'references': ['ref', 'reference'],
-            'awards': ['award'],
-            'volunteering': ['vol', 'volunteer'],
-            'websitesAndSocialLinks': ['link', 'social'],
-        }
-
-        # JavaScript built-ins to ignore
-        js_builtins = {
-            'forEach', 'map', 'filter', 'reduce', 'find', 'findIndex',
-            'some', 'every', 'includes', 'indexOf', 'length', 'push',
-            'pop', 'shift', 'unshift', 'slice', 'splice', 'join',
-            'concat', 'toString', 'valueOf', 'hasOwnProperty',
-            'toLowerCase', 'toUpperCase', 'trim', 'split', 'replace',
-            'charAt', 'charCodeAt', 'substring', 'substr',
-            'innerHTML', 'textContent', 'innerText', 'className',
-            'style', 'src', 'href', 'value', 'id', 'name',
-            'appendChild', 'removeChild', 'createElement',
-            'getElementById', 'querySelector', 'querySelectorAll',
-            'addEventListener', 'removeEventListener',
-            'preventDefault', 'stopPropagation',
-            'classList', 'dataset', 'attributes',
-            'parentNode', 'childNodes', 'firstChild', 'lastChild',
-            'nextSibling', 'previousSibling',
-            'display', 'color', 'background', 'width', 'height',
-            'toLocaleDateString', 'toLocaleString', 'getTime',
-        }
+        for line_num, line in enumerate(content.split('\n'), 1):
+            if '.' not in line:
+                # Blanked function bodies and markup without any access
+                continue
+            for var_name, prop_chain, kind, _ in self.line_accesses(line):
+                issues.append((var_name, prop_chain, line_num, kind))
+        return issues
 
-        for line_num, line in enumerate(lines, 1):
-            # Skip comments
-            if line.strip().startswith('//') or line.strip().startswith('/*'):
+    def line_accesses(self, line: str) -> List[Tuple[str, str, str, int]]:
+        """
+        Property accesses on one line; every access is found from its line alone
+        Returns: (variable, property, access kind, column where the property starts)
+        """
+        # Skip comments
+        stripped = line.strip()
+        if stripped.startswith('//') or stripped.startswith('/*'):
+            return []
+
+        accesses = []
+
+        # Pattern 1: Template strings ${variable.property}
+        for match in TEMPLATE_STRING_ACCESS.finditer(line):
+            var_name = match.group(1)
+            prop_chain = match.group(2)
+            first_prop = prop_chain.split('.')[0]
+
+            if first_prop not in JS_BUILTINS and self._get_category(var_name, VAR_PATTERNS):
+                accesses.append((sys.intern(var_name), sys.intern(prop_chain), TEMPLATE_STRING, match.start(2)))
+
+        # Pattern 2: Direct property access variable.property
+        for match in DIRECT_ACCESS.finditer(line):
+            var_name = match.group(1)
+            prop_chain = match.group(2)
+            first_prop = prop_chain.split('.')[0]
+
+            # Skip common false positives
+            if var_name in GLOBAL_OBJECTS:
                 continue
 
-            # Pattern 1: Template strings ${variable.property}
-            template_pattern = r'\$\{([a-zA-Z_$][a-zA-Z0-9_$]*)\.([a-zA-Z_$][a-zA-Z0-9_$.]*)\}'
-            for match in re.finditer(template_pattern, line):
-                var_name = match.group(1)
-                prop_chain = match.group(2)
-                first_prop = prop_chain.split('.')[0]
-
-                if first_prop not in js_builtins:
-                    category = self._get_category(var_name, var_patterns)
-                    if category:
-                        issues.append((var_name, prop_chain, line_num, f'template string: {match.group(0)}'))
-
-            # Pattern 2: Direct property access variable.property
-            direct_pattern = r'\b([a-zA-Z_$][a-zA-Z0-9_$]*)\.([a-zA-Z_$][a-zA-Z0-9_$.]+)\b'
-            for match in re.finditer(direct_pattern, line):
-                var_name = match.group(1)
-                prop_chain = match.group(2)
-                first_prop = prop_chain.split('.')[0]
-
-                # Skip common false positives
-                if var_name in ['document', 'window', 'console', 'Math', 'Date',
-                               'Array', 'Object', 'String', 'JSON', 'localStorage',
-                               'sessionStorage', 'navigator', 'location', 'history']:
-                    continue
-
-                if first_prop not in js_builtins:
-                    category = self._get_category(var_name, var_patterns)
-                    if category:
-                        issues.append((var_name, prop_chain, line_num, f'property access: {match.group(0)}'))
+            if first_prop not in JS_BUILTINS and self._get_category(var_name, VAR_PATTERNS):
+                accesses.append((sys.intern(var_name), sys.intern(prop_chain), PROPERTY_ACCESS, match.start(2)))
 
-        return issues
+        return accesses
+
+    def _cached_property_accesses(self, content: str) -> List[Tuple[str, str, int, str]]:
+        """find_all_property_accesses, reusing the findings of functions already analyzed"""
+        def analyze(text):
+            return [(line, [var, prop, kind])
+                    for var, prop, line, kind in self.find_all_property_accesses(text)]
+
+        # Cached entries come back from JSON as fresh strings
+        return [(sys.intern(var), sys.intern(prop), line, kind)
+                for line, (var, prop, kind) in self.function_cache.analyze(content, analyze)]
 
     def _get_category(self, var_name: str, var_patterns: Dict[str, List[str]]) -> str:
         """Get category for a variable name"""
-        for category, patterns in var_patterns.items():
-            if var_name in patterns:
-                return category
-        return None
+        return variable_category(var_name, var_patterns)
 
     def validate_property(self, var_name: str, prop_chain: str, category: str) -> Tuple[bool, str]:
         """
@@ -229,64 +245,59 @@ class DeepValidator:
         # Return available fields
         return False, f"Available fields: {', '.join(sorted(list(valid_fields))[:5])}"
 
-    def validate_template(self, template_path: Path) -> Dict:
-        """Validate a single template"""
-        with open(template_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def validate_template(self, template_path: Path, content: str = None) -> Dict:
+        """Validate a single template (content is read from disk unless given)"""
+        if content is None:
+            with open(template_path, 'r', encoding='utf-8') as f:
+                content = f.read()
 
-        all_accesses = self.find_all_property_accesses(content)
+        if self.function_cache is not None:
+            all_accesses = self._cached_property_accesses(content)
+        else:
+            all_accesses = self.find_all_property_accesses(content)
 
-        issues = []
+        issues = IssueTable(self.strings)
         valid_count = 0
 
         # Variable patterns for category detection
-        var_patterns = {
-            'personalInfo': ['personal', 'personalInfo', 'contact'],
-            'employment': ['job', 'exp', 'employment'],
-            'education': ['edu', 'education'],
-            'skills': ['skill'],
-            'skillGroups': ['group', 'g', 'cat'],
-            'languages': ['lang', 'language'],
-            'projects': ['proj', 'project'],
-            'publications': ['pub', 'publication'],
-            'courses': ['course'],
-            'references': ['ref', 'reference'],
-            'awards': ['award'],
-            'volunteering': ['vol', 'volunteer'],
-            'websitesAndSocialLinks': ['link', 'social'],
-        }
-
-        for var_name, prop_chain, line_num, context in all_accesses:
-            category = self._get_category(var_name, var_patterns)
-            is_valid, suggestion = self.validate_property(var_name, prop_chain, category)
+        var_patterns = VAR_PATTERNS
+        # The same access repeats many times in a template; judge each once
+        verdicts = {}
+
+        for var_name, prop_chain, line_num, kind in all_accesses:
+            verdict = verdicts.get((var_name, prop_chain))
+            if verdict is None:
+                category = self._get_category(var_name, var_patterns)
+                verdict = verdicts[var_name, prop_chain] = (
+                    category, *self.validate_property(var_name, prop_chain, category))
+            category, is_valid, suggestion = verdict
 
             if is_valid:
                 valid_count += 1
             else:
-                issues.append({
-                    'line': line_num,
-                    'variable': var_name,
-                    'property': prop_chain,
-                    'context': context,
-                    'category': category,
-                    'suggestion': suggestion
-                })
+                issues.append(line_num, var_name, prop_chain, kind, category, suggestion)
 
         return {
-            'file': template_path.name,
+            'file': template_name(template_path, self.json_path.parent),
             'total_accesses': len(all_accesses),
             'valid_accesses': valid_count,
             'issues': issues
         }
 
-    def validate_all(self) -> Dict[str, Dict]:
-        """Validate all templates"""
+    def validate_all(self, changed_since: str = None) -> Dict[str, Dict]:
+        """Validate all templates (or only those changed since a git ref)"""
         template_dir = self.json_path.parent
-        html_files = sorted(template_dir.glob('*.html'))
+        html_files = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
+
+        # Files are prefetched asynchronously and validated on a worker pool
+        validated = process_templates(html_files, _validate_in_worker, initializer=_init_worker, initargs=(self,))
 
         results = {}
         for html_file in html_files:
-            results[html_file.name] = self.validate_template(html_file)
+            result = validated[html_file]
+            # Tables from pool workers arrive with their own few strings; share this validator's
+            result['issues'].reintern(self.strings)
+            results[template_name(html_file, template_dir)] = result
 
         return results
 
@@ -299,7 +310,7 @@ class DeepValidator:
 
         files_with_issues = 0
         total_issues = 0
-        all_issues_summary = defaultdict(list)
+        issue_counts = IssueCounter()
 
         for filename, result in sorted(results.items()):
             has_issues = len(result['issues']) > 0
@@ -314,13 +325,12 @@ class DeepValidator:
                 print()
 
                 for issue in result['issues']:
-                    key = f"{issue['variable']}.{issue['property']}"
-                    print(f"   ⚠️  Line {issue['line']}: {issue['context']}")
-                    print(f"      → {key}")
-                    print(f"      → Suggestion: {issue['suggestion']}")
+                    print(f"   ⚠️  Line {issue.line}: {issue.context}")
+                    print(f"      → {issue.variable}.{issue.prop}")
+                    print(f"      → Suggestion: {issue.suggestion}")
                     print()
 
-                    all_issues_summary[key].append(filename)
+                issue_counts.add_template(filename, result['issues'].keys())
 
         # Print summary
         print("\n" + "=" * 100)
@@ -328,12 +338,16 @@ class DeepValidator:
         print(f"Total undefined variables: {total_issues}")
         print("=" * 100)
 
-        if all_issues_summary:
+        top_issues = issue_counts.top(20, by='occurrences')
+        if top_issues:
             print("\nMOST COMMON UNDEFINED VARIABLES:")
             print("-" * 100)
-            for prop, files in sorted(all_issues_summary.items(), key=lambda x: len(x[1]), reverse=True):
-                print(f"  {prop}")
-                print(f"    Found in: {', '.join(files)}")
+            for prop, files, occurrences, examples in top_issues:
+                more = ', ...' if files > len(examples) else ''
+                print(f"  {prop} ({occurrences} access(es) in {files} file(s))")
+                print(f"    Found in: {', '.join(examples)}{more}")
+            if issue_counts.note():
+                print(issue_counts.note())
 
         # Print clean files
         clean_files = [name for name, result in results.items() if not result['issues']]
@@ -342,9 +356,39 @@ class DeepValidator:
             for name in clean_files:
                 print(f"  ✓ {name}")
 
+
+# The validator each pool worker uses, set once by the pool initializer rather than
+# pickled with every task
+_worker_validator = None
+
+
+def _init_worker(validator: DeepValidator):
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_in_worker(path: Path, content: str) -> Dict:
+    return _worker_validator.validate_template(path, content)
+
+
+def checker(template_dir: Path):
+    """Undefined property accesses, as a hirehub_templates checker"""
+    validator = DeepValidator(template_dir / 'resume.json')
+
+    def check(document) -> List[Finding]:
+        result = validator.validate_template(document.path, document.content)
+        return [
+            Finding('deep', issue.line, f"{issue.variable}.{issue.prop}",
+                    f"Suggestion: {issue.suggestion}")
+            for issue in result['issues']
+        ]
+
+    return check
+
 def main():
     """Main execution"""
     json_path = Path(__file__).parent / 'resume.json'
+    changed_since = parse_changed_since(__doc__)
 
     if not json_path.exists():
         print(f"❌ Error: resume.json not found")
@@ -353,7 +397,7 @@ def main():
     print("Running deep validation...\n")
 
     validator = DeepValidator(json_path)
-    results = validator.validate_all()
+    results = validator.validate_all(changed_since)
     validator.print_report(results)
 
 if __name__ == '__main__':
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Template x field coverage matrix
+Every template's field references are resolved once into a sparse (CSR) boolean matrix of
+the resume fields each template displays. Bulk questions are then column sums and masks
+over that matrix: fields no template displays, templates missing a section, coverage per
+field. The matrix is built with one sparse product instead of a field-by-field walk per
+template, so it stays cheap as templates and the schema grow, and it is exported for
+dashboards as .npz (scipy.sparse.csr_matrix((data, indices, indptr)) loads it) or as .csv.
+
+A template displays a field when it references the field or any of its parents; a
+reference to personal.X also counts as personalInfo.X (see field_references).
+
+Usage:
+    python field_coverage.py                        # coverage report
+    python field_coverage.py --export coverage.npz  # also write the matrix
+    python field_coverage.py --section skillGroups --section internships
+"""
+
+import argparse
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from field_references import find_field_references, get_resume_fields
+from template_discovery import RESUME, find_templates, template_name
+from template_loader import process_templates
+
+TEMPLATE_DIR = Path(__file__).parent
+
+# Referenced paths that are containers, not resume fields
+CONTAINERS = ('content', 'personalInfo', 'resumeData')
+
+
+def _csr(rows: List[np.ndarray], n_cols: int):
+    """(indptr, indices) of sorted, de-duplicated column ids per row"""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    indices = np.concatenate(rows).astype(np.int32) if rows else np.zeros(0, dtype=np.int32)
+    return indptr, indices
+
+
+def _sparse_product(a_indptr: np.ndarray, a_indices: np.ndarray,
+                    b_indptr: np.ndarray, b_indices: np.ndarray, n_cols: int):
+    """Boolean product of two CSR matrices, as (indptr, indices) with sorted rows"""
+    n_rows = len(a_indptr) - 1
+    # Every nonzero (i, k) of A contributes row k of B to row i
+    lengths = np.diff(b_indptr)[a_indices]
+    a_rows = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(a_indptr))
+    rows = np.repeat(a_rows, lengths)
+    ends = np.cumsum(lengths)
+    offsets = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - lengths, lengths)
+    cols = b_indices[np.repeat(b_indptr[a_indices], lengths) + offsets]
+
+    keys = np.unique(rows * n_cols + cols)
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(keys // n_cols, minlength=n_rows))
+    return indptr, (keys % n_cols).astype(np.int32)
+
+
+class FieldIndex:
+    """
+    Resume fields and every prefix of them, numbered once per schema
+    prefixes[i] -> fields having prefix i (itself included), as a CSR matrix
+    """
+
+    def __init__(self, resume_fields: Iterable[str]):
+        self.fields: List[str] = sorted(resume_fields)
+        self.field_ids: Dict[str, int] = {field: i for i, field in enumerate(self.fields)}
+
+        self.prefix_ids: Dict[str, int] = {}
+        descendants: List[List[int]] = []
+        for field_id, field in enumerate(self.fields):
+            parts = field.split('.')
+            for i in range(1, len(parts) + 1):
+                prefix = '.'.join(parts[:i])
+                prefix_id = self.prefix_ids.get(prefix)
+                if prefix_id is None:
+                    prefix_id = self.prefix_ids[prefix] = len(descendants)
+                    descendants.append([])
+                descendants[prefix_id].append(field_id)
+        self.descendants = _csr([np.array(ids, dtype=np.int32) for ids in descendants], len(self.fields))
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def referenced(self, template_fields: Set[str]) -> np.ndarray:
+        """Sorted prefix ids a template's references resolve to"""
+        ids = set()
+        for field in template_fields:
+            for path in (field, f'personalInfo.{field}') if not field.startswith('personalInfo') else (field,):
+                prefix_id = self.prefix_ids.get(path)
+                if prefix_id is not None:
+                    ids.add(prefix_id)
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def undefined(self, template_fields: Set[str]) -> Set[str]:
+        """References that are neither a resume field nor a parent of one"""
+        return {
+            field for field in template_fields
+            if field not in self.prefix_ids
+            and f'personalInfo.{field}' not in self.field_ids
+            and field not in CONTAINERS
+        }
+
+
+class CoverageMatrix:
+    """Templates x fields, True where a template displays the field; stored as CSR"""
+
+    def __init__(self, templates: List[str], fields: List[str], indptr: np.ndarray, indices: np.ndarray):
+        self.templates = templates
+        self.fields = fields
+        self.indptr = indptr
+        self.indices = indices
+        self.template_ids = {name: i for i, name in enumerate(templates)}
+        self.field_ids = {field: i for i, field in enumerate(fields)}
+
+    @classmethod
+    def build(cls, template_fields: Dict[str, Set[str]], index: FieldIndex) -> 'CoverageMatrix':
+        """From each template's referenced field paths (find_field_references)"""
+        templates = list(template_fields)
+        ref_indptr, ref_indices = _csr([index.referenced(template_fields[name]) for name in templates],
+                                       len(index.prefix_ids))
+        indptr, indices = _sparse_product(ref_indptr, ref_indices, *index.descendants, max(len(index), 1))
+        return cls(templates, index.fields, indptr, indices)
+
+    @property
+    def shape(self):
+        return len(self.templates), len(self.fields)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def row(self, template: str) -> np.ndarray:
+        """Field ids a template displays"""
+        i = self.template_ids[template]
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def row_ids(self) -> np.ndarray:
+        """Template id of every stored entry"""
+        return np.repeat(np.arange(len(self.templates)), np.diff(self.indptr))
+
+    def displayed_counts(self) -> np.ndarray:
+        """Templates displaying each field"""
+        return np.bincount(self.indices, minlength=len(self.fields))
+
+    def missing_counts(self) -> np.ndarray:
+        """Templates not displaying each field"""
+        return len(self.templates) - self.displayed_counts()
+
+    def coverage(self) -> np.ndarray:
+        """Percentage of templates displaying each field"""
+        if not self.templates:
+            return np.zeros(len(self.fields))
+        return self.displayed_counts() * (100.0 / len(self.templates))
+
+    def missing_fields(self, template: str) -> List[str]:
+        """Fields a template does not display, sorted"""
+        shown = np.zeros(len(self.fields), dtype=bool)
+        shown[self.row(template)] = True
+        return [self.fields[i] for i in np.flatnonzero(~shown)]
+
+    def missing_per_template(self) -> np.ndarray:
+        return len(self.fields) - np.diff(self.indptr)
+
+    def undisplayed_fields(self) -> List[str]:
+        """Fields no template displays"""
+        return [self.fields[i] for i in np.flatnonzero(self.displayed_counts() == 0)]
+
+    def templates_missing(self, field: str) -> List[str]:
+        """Templates that do not display a field or section"""
+        shown = np.zeros(len(self.templates), dtype=bool)
+        shown[self.row_ids()[self.indices == self.field_ids[field]]] = True
+        return [self.templates[i] for i in np.flatnonzero(~shown)]
+
+    def most_missing(self, k: int) -> List[tuple]:
+        """[(field, templates missing it)] for the k most missed fields, ties by field name"""
+        missing = self.missing_counts()
+        # Fields are sorted, so the field id breaks ties alphabetically
+        order = np.argsort(-missing, kind='stable')[:k]
+        return [(self.fields[i], int(missing[i])) for i in order if missing[i]]
+
+    def to_dense(self) -> np.ndarray:
+        dense = np.zeros(self.shape, dtype=bool)
+        dense[self.row_ids(), self.indices] = True
+        return dense
+
+    def export(self, path: Path):
+        """.npz with the CSR arrays and labels, or .csv with one (template, field) row per entry"""
+        path = Path(path)
+        if path.suffix == '.csv':
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['template', 'field'])
+                for t, i in zip(self.row_ids(), self.indices):
+                    writer.writerow([self.templates[t], self.fields[i]])
+            return
+        np.savez_compressed(
+            path, data=np.ones(self.nnz, dtype=bool), indices=self.indices, indptr=self.indptr,
+            shape=np.array(self.shape), templates=np.array(self.templates), fields=np.array(self.fields),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> 'CoverageMatrix':
+        with np.load(path) as data:
+            return cls(data['templates'].tolist(), data['fields'].tolist(), data['indptr'], data['indices'])
+
+
+def template_references(template_paths: List[Path], template_dir: Path = TEMPLATE_DIR) -> Dict[str, Set[str]]:
+    """find_field_references for every template, keyed by template name in path order"""
+    found = process_templates(template_paths, lambda path, content: find_field_references(content), workers=0)
+    return {template_name(path, template_dir): found[path] for path in template_paths}
+
+
+def build_coverage(template_dir: Path = TEMPLATE_DIR, changed_since: Optional[str] = None) -> CoverageMatrix:
+    """Coverage of every resume template in template_dir"""
+    index = FieldIndex(get_resume_fields(template_dir))
+    templates = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
+    return CoverageMatrix.build(template_references(templates, template_dir), index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--export', metavar='PATH', help='write the matrix to a .npz or .csv file')
+    parser.add_argument('--section', action='append', default=[], metavar='FIELD',
+                        help='list the templates missing this field (default: every top-level section)')
+    parser.add_argument('--changed-since', metavar='REF',
+                        help='only templates changed since this git ref, plus templates sharing the changed code')
+    args = parser.parse_args()
+
+    matrix = build_coverage(changed_since=args.changed_since)
+    n_templates, n_fields = matrix.shape
+
+    print("=" * 100)
+    print("TEMPLATE FIELD COVERAGE")
+    print("=" * 100)
+    print()
+    print(f"Templates: {n_templates}   Fields: {n_fields}   "
+          f"Displayed: {matrix.nnz:,} of {n_templates * n_fields:,} template-field pairs")
+
+    if not n_templates:
+        print("\nNo templates")
+        return
+
+    undisplayed = matrix.undisplayed_fields()
+    print(f"\n❌ FIELDS NO TEMPLATE DISPLAYS ({len(undisplayed)}):")
+    print("-" * 100)
+    for field in undisplayed:
+        print(f"  • {field}")
+    if not undisplayed:
+        print("  ✓ none")
+
+    sections = args.section or [field for field in matrix.fields if '.' not in field]
+    print("\n⚠️  TEMPLATES MISSING A SECTION:")
+    print("-" * 100)
+    for section in sections:
+        if section not in matrix.field_ids:
+            print(f"  {section:40} not a resume field")
+            continue
+        missing = matrix.templates_missing(section)
+        if missing:
+            print(f"  {section:40} {len(missing):>3}: {', '.join(missing)}")
+
+    coverage = matrix.coverage()
+    print("\nCOVERAGE PER FIELD (least displayed first):")
+    print("-" * 100)
+    for i in np.argsort(coverage, kind='stable'):
+        print(f"  {matrix.fields[i]:50} {coverage[i]:>6.1f}%")
+
+    if args.export:
+        matrix.export(Path(args.export))
+        print(f"\n✓ Exported {n_templates} x {n_fields} matrix to {args.export}")
+
+    print()
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
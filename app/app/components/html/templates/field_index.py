@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Reverse index from resume field to template usage sites
+Maps every field path (personalInfo.website, employmentHistory.currentlyWorking, ...)
+to the (template, line, column, kind) sites that read it. The index is persisted in
+.cache/field_index.json and rescanned only for templates whose content hash changed.
+
+Usage:
+    python field_index.py                          # fields with usage counts
+    python field_index.py personal.website         # sites reading a field
+    python field_index.py --prefix personalInfo.socialLinks
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from bisect import bisect_right
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import js_functions
+from deep_validator import CATEGORY_PATHS, VAR_PATTERNS
+from template_discovery import find_templates, template_name
+
+TEMPLATE_DIR = Path(__file__).parent
+INDEX_PATH = TEMPLATE_DIR / '.cache' / 'field_index.json'
+INDEX_VERSION = 1
+
+# Kinds of usage site
+CODE = 'code'
+COMMENT = 'comment'
+STRING = 'string'
+
+# Roots that hold the whole resume content
+CONTENT_ROOTS = ('resumeData', 'data.content')
+
+# Variable name -> resume path it stands for (personal -> personalInfo, job -> employmentHistory)
+ALIASES = {
+    alias: CATEGORY_PATHS[category]
+    for category, aliases in VAR_PATTERNS.items()
+    for alias in aliases
+}
+
+# Methods and properties that end a field chain (job.description.split -> job.description)
+JS_MEMBERS = {
+    'forEach', 'map', 'filter', 'reduce', 'find', 'findIndex', 'some', 'every', 'includes',
+    'indexOf', 'lastIndexOf', 'length', 'push', 'pop', 'shift', 'unshift', 'slice', 'splice',
+    'join', 'concat', 'toString', 'valueOf', 'hasOwnProperty', 'toLowerCase', 'toUpperCase',
+    'trim', 'split', 'replace', 'match', 'charAt', 'charCodeAt', 'substring', 'substr',
+    'startsWith', 'endsWith', 'toLocaleDateString', 'toLocaleString', 'getTime',
+    'getMonth', 'getFullYear', 'getDate',
+}
+
+FIELD_ACCESS = re.compile(
+    r'(?<![\w$.])(' + '|'.join(re.escape(root) for root in sorted(
+        CONTENT_ROOTS + tuple(ALIASES), key=len, reverse=True
+    )) + r')((?:\??\.[A-Za-z_$][\w$]*)+)'
+)
+
+Site = Tuple[str, int, int, str]
+
+
+def canonical_field(expression: str) -> str:
+    """
+    Resume path for a field expression as written in a template
+    personal.website -> personalInfo.website, job.currentlyWorking -> employmentHistory.currentlyWorking
+    Paths that are already canonical are returned unchanged
+    """
+    expression = expression.replace('?.', '.')
+    for root in CONTENT_ROOTS:
+        if expression.startswith(root + '.'):
+            return expression[len(root) + 1:]
+
+    head, _, rest = expression.partition('.')
+    if head in ALIASES and head not in CATEGORY_PATHS.values():
+        return f"{ALIASES[head]}.{rest}" if rest else ALIASES[head]
+    return expression
+
+
+def _field_path(root: str, chain: str) -> Optional[str]:
+    """Canonical path for root + chain, cut at the first JavaScript member"""
+    parts = []
+    for part in chain.replace('?.', '.').split('.')[1:]:
+        if part in JS_MEMBERS:
+            break
+        parts.append(part)
+
+    if root in CONTENT_ROOTS:
+        return '.'.join(parts) or None
+    if not parts:
+        return None
+    return f"{ALIASES[root]}.{'.'.join(parts)}"
+
+
+def _site_kind(scan: Optional[js_functions.JsScan], pos: int) -> str:
+    if scan is None or scan.in_code(pos):
+        return CODE
+    for start, end in scan.comments:
+        if start <= pos < end:
+            return COMMENT
+    return STRING
+
+
+def find_field_sites(content: str) -> List[Tuple[str, int, int, str]]:
+    """(field, line, column, kind) for every resume field read in a template"""
+    line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+    scripts = js_functions.script_spans(content)
+    scans = {}
+
+    sites = []
+    for match in FIELD_ACCESS.finditer(content):
+        field = _field_path(match.group(1), match.group(2))
+        if field is None:
+            continue
+
+        pos = match.start()
+        span = next(((s, e) for s, e in scripts if s <= pos < e), None)
+        scan = None
+        if span is not None:
+            if span not in scans:
+                scans[span] = js_functions.scan_js(content, *span)
+            scan = scans[span]
+
+        line = bisect_right(line_starts, pos)
+        column = pos - line_starts[line - 1] + 1
+        sites.append((field, line, column, _site_kind(scan, pos)))
+
+    return sites
+
+
+def _file_hash(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class FieldIndex:
+    """Inverted index of field paths to usage sites, kept in sync by file hash"""
+
+    def __init__(self, files: Optional[Dict[str, dict]] = None):
+        # name -> {'size', 'mtime', 'sha1', 'sites': [[field, line, column, kind], ...]}
+        self.files = files or {}
+        self._fields = None
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> 'FieldIndex':
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get('version') != INDEX_VERSION:
+            return cls()
+        return cls(data.get('files', {}))
+
+    def save(self, path: Path = INDEX_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, separators=(',', ':'))
+        tmp.replace(path)
+
+    def update(self, template_paths: Iterable[Path], template_dir: Optional[Path] = None) -> List[str]:
+        """Rescan templates whose content changed and drop deleted ones; returns rescanned names"""
+        rescanned = []
+        seen = set()
+
+        for path in template_paths:
+            name = template_name(path, template_dir)
+            seen.add(name)
+            stat = Path(path).stat()
+            entry = self.files.get(name)
+
+            # Unchanged stat: trust the stored hash without reading the file
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+                continue
+
+            digest = _file_hash(path)
+            if entry and entry['sha1'] == digest:
+                entry['size'], entry['mtime'] = stat.st_size, stat.st_mtime_ns
+                continue
+
+            with open(path, 'r', encoding='utf-8') as f:
+                sites = find_field_sites(f.read())
+            self.files[name] = {
+                'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha1': digest,
+                'sites': [list(site) for site in sites],
+            }
+            rescanned.append(name)
+
+        for name in set(self.files) - seen:
+            del self.files[name]
+            rescanned.append(name)
+
+        if rescanned:
+            self._fields = None
+        return rescanned
+
+    @property
+    def fields(self) -> Dict[str, List[Site]]:
+        """field -> [(template, line, column, kind)], built on first use"""
+        if self._fields is None:
+            fields = defaultdict(list)
+            for name in sorted(self.files):
+                for field, line, column, kind in self.files[name]['sites']:
+                    fields[field].append((name, line, column, kind))
+            self._fields = dict(fields)
+        return self._fields
+
+    def lookup(self, field: str, prefix: bool = False) -> List[Site]:
+        """Sites reading field (as written in a template or canonical); prefix includes nested fields"""
+        field = canonical_field(field)
+        if not prefix:
+            return list(self.fields.get(field, []))
+
+        sites = []
+        for name, field_sites in self.fields.items():
+            if name == field or name.startswith(field + '.'):
+                sites.extend(field_sites)
+        return sorted(sites)
+
+    def templates_using(self, field: str, prefix: bool = False) -> List[str]:
+        return sorted({site[0] for site in self.lookup(field, prefix)})
+
+
+def load_index(template_dir: Optional[Path] = None) -> FieldIndex:
+    """Load the persisted index, refresh it against the templates on disk and save it"""
+    template_dir = Path(template_dir) if template_dir else TEMPLATE_DIR
+    index = FieldIndex.load()
+    if index.update(find_templates(template_dir), template_dir):
+        index.save()
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reverse index from resume field to template usage sites')
+    parser.add_argument('fields', nargs='*', help='field paths, e.g. personal.website or job.currentlyWorking')
+    parser.add_argument('--prefix', action='store_true', help='include fields nested under each path')
+    parser.add_argument('--kind', choices=(CODE, COMMENT, STRING), help='only sites of this kind')
+    parser.add_argument('--rebuild', action='store_true', help='discard the persisted index first')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        INDEX_PATH.unlink(missing_ok=True)
+    index = load_index()
+
+    if not args.fields:
+        print("=" * 100)
+        print("FIELD USAGE")
+        print("=" * 100)
+        for field, sites in sorted(index.fields.items()):
+            templates = len({site[0] for site in sites})
+            print(f"  {field:55} {len(sites):>5} site(s) in {templates:>3} template(s)")
+        print("=" * 100)
+        print(f"SUMMARY: {len(index.fields)} field(s) across {len(index.files)} template(s)")
+        return
+
+    found = False
+    for field in args.fields:
+        sites = [site for site in index.lookup(field, args.prefix) if not args.kind or site[3] == args.kind]
+        templates = {site[0] for site in sites}
+        print(f"{canonical_field(field)}: {len(sites)} site(s) in {len(templates)} template(s)")
+        for name, line, column, kind in sites:
+            print(f"  {name}:{line}:{column}  [{kind}]")
+        found = found or bool(sites)
+
+    sys.exit(0 if found else 1)
+
+
+if __name__ == '__main__':
+    main()
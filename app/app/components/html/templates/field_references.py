@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Resume field paths and the template references to them
+Shared by the completeness check, the coverage matrix and the compatibility matrix
+"""
+
+import re
+from pathlib import Path
+
+from schema_inference import resume_schema
+
+def extract_all_json_paths(obj, prefix=''):
+    """Extract all possible field paths from JSON structure"""
+    paths = set()
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            current_path = f"{prefix}.{key}" if prefix else key
+            paths.add(current_path)
+
+            # Recursively extract nested paths
+            if isinstance(value, (dict, list)):
+                paths.update(extract_all_json_paths(value, current_path))
+
+    elif isinstance(obj, list) and obj:
+        # For arrays, analyze the first item to get structure
+        if isinstance(obj[0], dict):
+            for key in obj[0].keys():
+                current_path = f"{prefix}.{key}" if prefix else key
+                paths.add(current_path)
+
+                # Recursively extract nested paths
+                if isinstance(obj[0][key], (dict, list)):
+                    paths.update(extract_all_json_paths(obj[0][key], current_path))
+
+    return paths
+
+def get_resume_fields(template_dir=None):
+    """Field paths of resume.json, plus every path the saved corpus schema has seen"""
+    return resume_schema(Path(template_dir or Path(__file__).parent) / 'resume.json').field_paths()
+
+def find_field_references(content):
+    """Find all resumeData field references in template"""
+    # JavaScript methods to exclude
+    js_methods = {'forEach', 'map', 'filter', 'reduce', 'length', 'push', 'pop', 'shift', 'unshift',
+                  'slice', 'splice', 'charAt', 'charCodeAt', 'indexOf', 'lastIndexOf', 'substring',
+                  'toUpperCase', 'toLowerCase', 'trim', 'split', 'join', 'replace', 'match',
+                  'toLocaleDateString', 'toLocaleString', 'getMonth', 'getFullYear', 'getDate'}
+
+    # Patterns to match
+    patterns = [
+        # resumeData.field or personal.field
+        r'(?:resumeData|personal|data\.content)\.(\w+(?:\.\w+)*)',
+    ]
+
+    found_fields = set()
+
+    for pattern in patterns:
+        matches = re.finditer(pattern, content)
+        for match in matches:
+            field_path = match.group(1)
+
+            # Skip if it's a JavaScript method
+            parts = field_path.split('.')
+            if any(part in js_methods for part in parts):
+                continue
+
+            # Handle nested paths
+            found_fields.add(field_path)
+
+            # Also add parent paths
+            for i in range(1, len(parts)):
+                parent_path = '.'.join(parts[:i])
+                if parent_path not in js_methods:
+                    found_fields.add(parent_path)
+
+    return found_fields
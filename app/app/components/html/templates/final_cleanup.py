@@ -6,6 +6,10 @@ Final cleanup - fix all remaining education references and other issues
 import re
 from pathlib import Path
 
+from git_changes import parse_changed_since
+from template_discovery import RESUME, find_templates, template_name
+from template_writes import write_if_changed
+
 def fix_template(content: str) -> str:
     """Apply final fixes"""
 
@@ -56,13 +60,16 @@ def fix_template(content: str) -> str:
 def main():
     """Process all templates"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
 
     fixed_count = 0
 
     print("Applying final cleanup fixes...\n")
 
     for html_file in html_files:
+        name = template_name(html_file, template_dir)
+
         try:
             with open(html_file, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -71,15 +78,14 @@ def main():
             content = fix_template(content)
 
             if content != original:
-                with open(html_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"✓ Fixed {html_file.name}")
+                write_if_changed(html_file, content)
+                print(f"✓ Fixed {name}")
                 fixed_count += 1
             else:
-                print(f"  {html_file.name} (no changes)")
+                print(f"  {name} (no changes)")
 
         except Exception as e:
-            print(f"❌ Error with {html_file.name}: {e}")
+            print(f"❌ Error with {name}: {e}")
 
     print(f"\n✓ Fixed {fixed_count} template(s)")
     print("\nRun validate_templates.py to verify fixes.")
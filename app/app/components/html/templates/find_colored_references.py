@@ -6,23 +6,31 @@ Find all templates with colored reference section backgrounds
 import re
 from pathlib import Path
 
+import css_rules
+from git_changes import parse_changed_since
+from template_discovery import find_templates, template_name
+from template_document import TemplateDocument
+from template_scan import has_references, mapped_template
+
+# Pattern 1: .reference-item with background color
+REF_ITEM_SELECTOR = re.compile(r'\.reference-item$')
+
+# Pattern 2: .reference with background (.reference h4, .reference:hover)
+REF_SELECTOR = re.compile(r'\.reference(?![-\w])')
+
 def analyze_reference_styling(filepath):
     """Analyze reference section styling in a template"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Check if template has references section
-    if 'reference' not in content.lower():
-        return None
+    with mapped_template(filepath) as buffer:
+        # Check if template has references section
+        if not has_references(buffer):
+            return None
 
+    document = TemplateDocument(filepath)
     issues = []
 
     # Pattern 1: .reference-item with background color
-    ref_item_pattern = r'\.reference-item\s*\{([^}]+)\}'
-    matches = re.finditer(ref_item_pattern, content, re.DOTALL)
-
-    for match in matches:
-        styles = match.group(1)
+    for rule in css_rules.selecting(document.css_rules, REF_ITEM_SELECTOR):
+        styles = rule.body(document.content)
 
         # Check for background color
         bg_match = re.search(r'background(-color)?:\s*([^;]+);', styles)
@@ -39,15 +47,12 @@ def analyze_reference_styling(filepath):
                     'type': 'reference-item background',
                     'current_bg': bg_color,
                     'border': border,
-                    'full_match': match.group(0)
+                    'full_match': document.content[rule.start:rule.end]
                 })
 
     # Pattern 2: .reference with background
-    ref_pattern = r'\.reference[^-\w][^{]*\{([^}]+)\}'
-    matches = re.finditer(ref_pattern, content, re.DOTALL)
-
-    for match in matches:
-        styles = match.group(1)
+    for rule in css_rules.selecting(document.css_rules, REF_SELECTOR):
+        styles = rule.body(document.content)
         bg_match = re.search(r'background(-color)?:\s*([^;]+);', styles)
         if bg_match:
             bg_color = bg_match.group(2).strip()
@@ -59,7 +64,7 @@ def analyze_reference_styling(filepath):
                     'type': 'reference background',
                     'current_bg': bg_color,
                     'border': border,
-                    'full_match': match.group(0)
+                    'full_match': document.content[rule.start:rule.end]
                 })
 
     return issues if issues else None
@@ -105,7 +110,8 @@ def is_neutral_color(color):
 def main():
     """Find all templates with colored reference sections"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, changed_since=changed_since)
 
     print("=" * 100)
     print("COLORED REFERENCE SECTIONS REPORT")
@@ -117,7 +123,7 @@ def main():
     for html_file in html_files:
         issues = analyze_reference_styling(html_file)
         if issues:
-            templates_with_issues[html_file.name] = issues
+            templates_with_issues[template_name(html_file, template_dir)] = issues
 
     if not templates_with_issues:
         print("✓ No templates with colored reference backgrounds found!")
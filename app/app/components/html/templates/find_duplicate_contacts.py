@@ -7,15 +7,27 @@ causing duplicate information
 import re
 from pathlib import Path
 
+from git_changes import parse_changed_since
+from template_discovery import RESUME, find_templates, template_name
+from template_document import Finding
+from template_scan import LineCounter, mapped_template
+
+# One alternation per tracked field, so the file is scanned once
+CONTACT_FIELD_PATTERN = re.compile(
+    rb'\bpersonal\.(?:'
+    rb'(?P<websitesAndSocialLinks>websitesAndSocialLinks)'
+    rb'|(?P<old_website>website)\b'
+    rb'|(?P<old_socialLinks>socialLinks\.(?:linkedin|github|twitter))'
+    rb')'
+)
+
 def analyze_contact_fields(filepath):
     """Analyze how a template displays contact information"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Skip if no personal info
-    if 'personalInfo' not in content and 'personal' not in content:
-        return None
+    with mapped_template(filepath) as buffer:
+        return _contact_fields(buffer)
 
+def _contact_fields(buffer):
+    """Contact field usage of a mapped template; None unless fields are duplicated"""
     issues = {
         'has_old_website': False,
         'has_old_socialLinks': False,
@@ -25,23 +37,24 @@ def analyze_contact_fields(filepath):
         'websitesAndSocialLinks_lines': []
     }
 
-    lines = content.split('\n')
+    # Skip if no personal info ('personal' also covers 'personalInfo')
+    if buffer.find(b'personal') == -1:
+        return None
+
+    lines = LineCounter(buffer)
+    last_line = {}
 
-    for i, line in enumerate(lines, 1):
-        # Check for old website field
-        if re.search(r'\bpersonal\.website\b', line):
-            issues['has_old_website'] = True
-            issues['old_website_lines'].append(i)
+    for match in CONTACT_FIELD_PATTERN.finditer(buffer):
+        key = match.lastgroup
+        line = lines.line_at(match.start())
 
-        # Check for old socialLinks fields
-        if re.search(r'\bpersonal\.socialLinks\.(linkedin|github|twitter)', line):
-            issues['has_old_socialLinks'] = True
-            issues['old_socialLinks_lines'].append(i)
+        # One entry per line and field, as the line-by-line scan reported
+        if last_line.get(key) == line:
+            continue
+        last_line[key] = line
 
-        # Check for websitesAndSocialLinks array
-        if re.search(r'\bpersonal\.websitesAndSocialLinks', line):
-            issues['has_websitesAndSocialLinks'] = True
-            issues['websitesAndSocialLinks_lines'].append(i)
+        issues[f'has_{key}'] = True
+        issues[f'{key}_lines'].append(line)
 
     # Check if there's potential duplication
     has_duplication = issues['has_websitesAndSocialLinks'] and (
@@ -53,10 +66,26 @@ def analyze_contact_fields(filepath):
 
     return issues
 
+def checker(template_dir):
+    """Old contact fields shown next to websitesAndSocialLinks, as a hirehub_templates checker"""
+    def check(document):
+        issues = _contact_fields(document.data)
+        if not issues:
+            return []
+        lines = issues['old_website_lines'] + issues['old_socialLinks_lines']
+        return [Finding('duplicate-contacts', line,
+                        "old contact field displayed next to personal.websitesAndSocialLinks",
+                        f"websitesAndSocialLinks on line{'s' if len(issues['websitesAndSocialLinks_lines']) > 1 else ''} "
+                        f"{', '.join(map(str, issues['websitesAndSocialLinks_lines'][:3]))}")
+                for line in sorted(lines)]
+
+    return check
+
 def main():
     """Find all templates with duplicate contact information"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
 
     print("=" * 100)
     print("DUPLICATE CONTACT INFORMATION CHECK")
@@ -68,7 +97,7 @@ def main():
     for html_file in html_files:
         issues = analyze_contact_fields(html_file)
         if issues:
-            templates_with_duplicates[html_file.name] = issues
+            templates_with_duplicates[template_name(html_file, template_dir)] = issues
 
     if not templates_with_duplicates:
         print("✓ No templates found with duplicate contact information!")
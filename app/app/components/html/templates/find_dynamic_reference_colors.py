@@ -6,73 +6,66 @@ Find templates that dynamically apply background colors to reference sections vi
 import re
 from pathlib import Path
 
+import color_schemes
+from git_changes import parse_changed_since
+from template_discovery import find_templates, template_name
+from template_document import Finding
+from template_scan import decode, has_references, mapped_template
+
+DYNAMIC_BACKGROUND_PATTERN = re.compile(
+    rb"querySelector(?:All)?\(['\"]\.reference[^'\"]*['\"]\)[^}]*?backgroundColor\s*=\s*([^;]+);",
+    re.DOTALL
+)
+
 def find_dynamic_reference_styling(filepath):
     """Find JavaScript code that applies background colors to reference elements"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with mapped_template(filepath) as buffer:
+        return _dynamic_styling(buffer)
 
+def _dynamic_styling(buffer, content=None):
+    """Dynamic reference coloring in a mapped template (content: its decoded text, if at hand)"""
     issues = []
 
     # Pattern 1: querySelector('.reference-item').forEach with backgroundColor
-    pattern1 = r"querySelector(?:All)?\(['\"]\.reference[^'\"]*['\"]\)[^}]*?backgroundColor\s*=\s*([^;]+);"
-    for match in re.finditer(pattern1, content, re.DOTALL):
-        bg_value = match.group(1).strip()
+    for match in DYNAMIC_BACKGROUND_PATTERN.finditer(buffer):
+        bg_value = decode(match.group(1)).strip()
         issues.append({
             'type': 'Dynamic JS backgroundColor',
             'value': bg_value,
-            'context': match.group(0)[:100]
+            'context': decode(match.group(0)[:100])
         })
 
-    # Pattern 2: Look for color scheme objects with secondary colors
-    pattern2 = r"const\s+colorSchemes?\s*=\s*\{([^}]+secondary[^}]+)\};"
-    for match in re.finditer(pattern2, content, re.DOTALL):
-        # Extract all secondary color values
-        secondary_pattern = r"secondary:\s*['\"]?([#\w]+)['\"]?"
-        secondary_colors = re.findall(secondary_pattern, match.group(1))
-
-        if secondary_colors:
-            # Check if any are not neutral
-            colored = []
-            for color in secondary_colors:
-                if not is_neutral(color):
-                    colored.append(color)
-
-            if colored:
-                issues.append({
-                    'type': 'Color scheme with colored secondary',
-                    'value': ', '.join(set(colored)),
-                    'context': 'colorSchemes object'
-                })
+    # Pattern 2: Color scheme roles used for reference backgrounds
+    # Only templates that can paint references from colorSchemes are decoded
+    if color_schemes.may_have_reference_roles(buffer):
+        entry = color_schemes.analyze_template(content if content is not None else decode(buffer[:]))
+        colored = color_schemes.find_colored_reference_roles(entry)
+        if colored:
+            roles = sorted(set(color['role'] for color in colored))
+            issues.append({
+                'type': f"Color scheme with colored {'/'.join(roles)}",
+                'value': ', '.join(sorted(set(color['value'] for color in colored))),
+                'context': 'colorSchemes: ' + ', '.join(f"{color['scheme']}.{color['role']}" for color in colored)
+            })
 
     return issues if issues else None
 
-def is_neutral(color):
-    """Check if color is white, gray, or transparent"""
-    color = color.lower().strip()
-
-    if not color.startswith('#'):
-        return color in ['white', 'transparent', 'fff', 'ffffff']
-
-    hex_color = color[1:]
-    if len(hex_color) == 3:
-        hex_color = ''.join([c*2 for c in hex_color])
-
-    if len(hex_color) == 6:
-        try:
-            r = int(hex_color[0:2], 16)
-            g = int(hex_color[2:4], 16)
-            b = int(hex_color[4:6], 16)
-            # Check if it's pure white or pure gray (R=G=B)
-            return (r == 255 and g == 255 and b == 255) or (r == g == b)
-        except:
-            return False
+def checker(template_dir):
+    """Reference backgrounds colored from JavaScript, as a hirehub_templates checker"""
+    def check(document):
+        if not has_references(document.data):
+            return []
+        issues = _dynamic_styling(document.data, document.content) or []
+        return [Finding('dynamic-reference-colors', None, f"{issue['type']}: {issue['value']}", issue['context'])
+                for issue in issues]
 
-    return False
+    return check
 
 def main():
     """Find all templates with dynamic reference coloring"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, changed_since=changed_since)
 
     print("=" * 100)
     print("DYNAMIC REFERENCE COLOR APPLICATION CHECK")
@@ -83,14 +76,13 @@ def main():
 
     for html_file in html_files:
         # Skip if no reference section
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if 'reference' not in content.lower():
+        with mapped_template(html_file) as buffer:
+            if not has_references(buffer):
                 continue
 
         issues = find_dynamic_reference_styling(html_file)
         if issues:
-            templates_with_issues[html_file.name] = issues
+            templates_with_issues[template_name(html_file, template_dir)] = issues
 
     if not templates_with_issues:
         print("✓ No templates found with dynamic colored reference backgrounds!")
@@ -8,6 +8,21 @@ Comprehensive check for reference section styling issues:
 import re
 from pathlib import Path
 
+import css_rules
+from git_changes import parse_changed_since
+from template_discovery import find_templates, template_name
+from template_document import Finding, TemplateDocument
+from template_scan import LineCounter, decode, has_references, mapped_template
+
+# Selectors of the rules that style reference sections, matched per selector of a rule
+CSS_SELECTORS = [
+    re.compile(r'\.reference-item$'),
+    re.compile(r'\.reference$'),
+    re.compile(r'\.(ref|references)-item$'),
+]
+
+JS_SECONDARY_PATTERN = re.compile(rb'secondary:\s*["\']?([#\w]+)["\']?')
+
 def is_neutral_background(color):
     """Check if background color is neutral (white/gray)"""
     if not color:
@@ -49,13 +64,15 @@ def is_neutral_background(color):
 
 def analyze_template(filepath):
     """Analyze a template for reference section styling issues"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with mapped_template(filepath) as buffer:
+        # Skip if no reference section
+        if not has_references(buffer):
+            return None
 
-    # Skip if no reference section
-    if 'reference' not in content.lower():
-        return None
+    return _analyze(TemplateDocument(filepath))
 
+def _analyze(document):
+    """Run the reference styling checks over a TemplateDocument"""
     issues = {
         'border_radius': [],
         'colored_backgrounds': [],
@@ -63,17 +80,10 @@ def analyze_template(filepath):
     }
 
     # Pattern 1: CSS .reference-item or .reference with border-radius
-    css_patterns = [
-        (r'\.reference-item\s*\{([^}]+)\}', 1),
-        (r'\.reference\s+\{([^}]+)\}', 1),
-        (r'\.(ref|references)-item\s*\{([^}]+)\}', 2)
-    ]
-
-    for pattern, group_index in css_patterns:
-        matches = re.finditer(pattern, content, re.DOTALL)
-        for match in matches:
-            styles = match.group(group_index)
-            selector = match.group(0).split('{')[0].strip()
+    for selector_pattern in CSS_SELECTORS:
+        for rule in css_rules.selecting(document.css_rules, selector_pattern):
+            styles = rule.body(document.content)
+            selector = rule.prelude
 
             # Check for border-radius
             br_match = re.search(r'border-radius:\s*([^;]+);', styles)
@@ -81,7 +91,7 @@ def analyze_template(filepath):
                 issues['border_radius'].append({
                     'selector': selector,
                     'value': br_match.group(1).strip(),
-                    'line': content[:match.start()].count('\n') + 1
+                    'line': document.line_at(rule.start)
                 })
 
             # Check for colored background
@@ -92,21 +102,22 @@ def analyze_template(filepath):
                     issues['colored_backgrounds'].append({
                         'selector': selector,
                         'value': bg_color,
-                        'line': content[:match.start()].count('\n') + 1
+                        'line': document.line_at(rule.start)
                     })
 
     # Pattern 2: JavaScript color schemes with secondary colors
-    js_pattern = r'secondary:\s*["\']?([#\w]+)["\']?'
-    for match in re.finditer(js_pattern, content):
-        color = match.group(1)
+    buffer = document.data
+    lines = LineCounter(buffer)
+    for match in JS_SECONDARY_PATTERN.finditer(buffer):
+        color = decode(match.group(1))
         if not is_neutral_background(color):
             # Check if this is in a colorSchemes object
             start = max(0, match.start() - 200)
-            context = content[start:match.start()]
+            context = decode(buffer[start:match.start()])
             if 'colorScheme' in context or 'color' in context.lower():
                 issues['js_colored_backgrounds'].append({
                     'value': color,
-                    'line': content[:match.start()].count('\n') + 1
+                    'line': lines.line_at(match.start())
                 })
 
     # Return None if no issues found
@@ -115,10 +126,28 @@ def analyze_template(filepath):
 
     return issues
 
+def checker(template_dir):
+    """Rounded or colored reference sections, as a hirehub_templates checker"""
+    def check(document):
+        if not has_references(document.data):
+            return []
+        issues = _analyze(document) or {}
+        findings = []
+        for issue in issues.get('border_radius', []):
+            findings.append(Finding('reference-styling', issue['line'], f"border-radius: {issue['value']}", issue['selector']))
+        for issue in issues.get('colored_backgrounds', []):
+            findings.append(Finding('reference-styling', issue['line'], f"background: {issue['value']}", issue['selector']))
+        for issue in issues.get('js_colored_backgrounds', []):
+            findings.append(Finding('reference-styling', issue['line'], f"secondary: {issue['value']}", 'colorSchemes'))
+        return sorted(findings, key=lambda finding: finding.line)
+
+    return check
+
 def main():
     """Scan all templates"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, changed_since=changed_since)
 
     print("=" * 100)
     print("COMPREHENSIVE REFERENCE SECTION STYLING CHECK")
@@ -135,10 +164,10 @@ def main():
             continue
 
         if issues['border_radius']:
-            templates_with_border_radius[html_file.name] = issues['border_radius']
+            templates_with_border_radius[template_name(html_file, template_dir)] = issues['border_radius']
 
         if issues['colored_backgrounds'] or issues['js_colored_backgrounds']:
-            templates_with_colored_bg[html_file.name] = {
+            templates_with_colored_bg[template_name(html_file, template_dir)] = {
                 'css': issues['colored_backgrounds'],
                 'js': issues['js_colored_backgrounds']
             }
@@ -8,75 +8,50 @@ Automatically fix all reference section styling issues:
 import re
 from pathlib import Path
 
+import color_schemes
+import css_rules
+from git_changes import parse_changed_since
+from template_discovery import find_templates, template_name
+from template_edits import apply_span_edits
+from template_writes import write_if_changed
+
+# Rules styling reference sections: .reference-item, .reference, .ref-item, .references-item
+REFERENCE_SELECTOR = re.compile(r'\.(reference|reference-item|ref-item|references-item)$')
+BORDER_RADIUS = re.compile(r'border-radius:\s*[^;]+;')
+
 def fix_border_radius(content):
     """Remove border-radius from reference sections"""
-    # Pattern: Find .reference-item or similar with border-radius
-    patterns = [
-        # Match .reference-item { ... border-radius: XXX; ... }
-        (r'(\.reference-item\s*\{[^}]*?)border-radius:\s*[^;]+;', r'\1'),
-        # Match .reference { ... border-radius: XXX; ... }
-        (r'(\.reference\s+\{[^}]*?)border-radius:\s*[^;]+;', r'\1'),
-        # Match .ref-item or .references-item
-        (r'(\.(ref|references)-item\s*\{[^}]*?)border-radius:\s*[^;]+;', r'\1'),
-    ]
-
-    for pattern, replacement in patterns:
-        content = re.sub(pattern, replacement, content, flags=re.DOTALL)
-
-    return content
-
-def fix_colored_backgrounds(content, template_name):
+    edits = []
+    for rule in css_rules.selecting(css_rules.template_rules(content), REFERENCE_SELECTOR):
+        body = rule.body(content)
+        fixed = BORDER_RADIUS.sub('', body)
+        if fixed != body:
+            edits.append((rule.body_start, rule.body_end, fixed))
+
+    return apply_span_edits(content, edits)
+
+def fix_colored_backgrounds(content, entry=None):
     """Fix colored backgrounds in reference sections"""
+    # Driven by the colorSchemes table: every non-neutral color in a role
+    # that paints reference backgrounds is replaced by span
+    return color_schemes.fix_reference_colors(content, entry)
 
-    # Template-specific fixes based on the analysis
-    fixes = {
-        'Beige.html': [
-            ('secondary: \'#e8e0d8\'', 'secondary: \'#f5f5f5\''),
-            ('secondary: "#e8e0d8"', 'secondary: "#f5f5f5"'),
-        ],
-        'BrightPath.html': [
-            ('secondary: \'#f8f4e6\'', 'secondary: \'#fff\''),
-            ('secondary: "#f8f4e6"', 'secondary: "#fff"'),
-        ],
-        'Clarity.html': [
-            ('secondary: \'#f8f9fa\'', 'secondary: \'#f5f5f5\''),
-            ('secondary: "#f8f9fa"', 'secondary: "#f5f5f5"'),
-        ],
-        'Epure.html': [
-            ('secondary: \'#4a7bc8\'', 'secondary: \'#f5f5f5\''),
-            ('secondary: "#4a7bc8"', 'secondary: "#f5f5f5"'),
-            ('secondary: \'#4a7c22\'', 'secondary: \'#f5f5f5\''),
-            ('secondary: "#4a7c22"', 'secondary: "#f5f5f5"'),
-        ],
-        'Focus.html': [
-            ('secondary: \'#f8f9fa\'', 'secondary: \'#f5f5f5\''),
-            ('secondary: "#f8f9fa"', 'secondary: "#f5f5f5"'),
-        ],
-    }
-
-    if template_name in fixes:
-        for old, new in fixes[template_name]:
-            content = content.replace(old, new)
-
-    return content
-
-def process_template(filepath):
+def process_template(filepath, entry=None):
     """Process a single template file"""
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
 
     original = content
 
+    # Fix colored backgrounds first: the table spans refer to the file as read
+    content = fix_colored_backgrounds(content, entry)
+
     # Remove border-radius
     content = fix_border_radius(content)
 
-    # Fix colored backgrounds
-    content = fix_colored_backgrounds(content, filepath.name)
-
     # Only write if changed
     if content != original:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_if_changed(filepath, content)
         return True
 
     return False
@@ -84,21 +59,10 @@ def process_template(filepath):
 def main():
     """Fix all templates"""
     template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
 
-    # Templates that need fixes based on our analysis
-    templates_to_fix = [
-        # Border-radius issues
-        'BlueAccent.html',
-        'Elegance.html',
-        'Midnight.html',
-        'MidnightBlue.html',
-        # Colored background issues
-        'Beige.html',
-        'BrightPath.html',
-        'Clarity.html',
-        'Epure.html',
-        'Focus.html',
-    ]
+    html_files = find_templates(template_dir, changed_since=changed_since)
+    color_table = color_schemes.load_color_table(html_files)
 
     print("=" * 100)
     print("FIXING REFERENCE SECTION STYLING ISSUES")
@@ -107,15 +71,11 @@ def main():
 
     fixed_count = 0
 
-    for filename in templates_to_fix:
-        filepath = template_dir / filename
-
-        if not filepath.exists():
-            print(f"❌ Not found: {filename}")
-            continue
+    for filepath in html_files:
+        filename = template_name(filepath, template_dir)
 
         try:
-            was_fixed = process_template(filepath)
+            was_fixed = process_template(filepath, color_table[filename])
             if was_fixed:
                 print(f"✓ Fixed {filename}")
                 fixed_count += 1
@@ -1,18 +1,20 @@
 #!/usr/bin/env python3
 """
 Fix broken populateContactInfo functions that were damaged by automated scripts
+Functions and blocks are located structurally; a template whose shape doesn't match
+exactly one span is skipped rather than edited
 """
 
-import re
 from pathlib import Path
 
+from git_changes import parse_changed_since, select_changed_templates
+from js_edits import StructuralMatchError, find_function, replace_block_tail, replace_function_head
+from template_writes import write_if_changed
+
 def fix_beige(content):
     """Fix Beige.html - websitesAndSocialLinks is incorrectly nested in birthDate if block"""
-    # Find the broken section
-    pattern = r'(if \(personal\.birthDate\) \{[^\}]*?)// Website display removed.*?\n.*?personal\.websitesAndSocialLinks\.forEach.*?\n.*?\}\);\s*hasDetails = true;\s*\}'
-
-    # Replace with proper structure
-    replacement = r'''\1html += `<p><strong>Birth Date:</strong> ${formattedDate}</p>`;
+    # The broken section runs from the leftover comment to the end of the birthDate block
+    replacement = '''html += `<p><strong>Birth Date:</strong> ${formattedDate}</p>`;
         hasDetails = true;
       }
 
@@ -24,11 +26,16 @@ def fix_beige(content):
         hasDetails = true;
       }'''
 
-    return re.sub(pattern, replacement, content, flags=re.DOTALL)
+    return replace_block_tail(content, r'if \(personal\.birthDate\) \{', r'// Website display removed', replacement)
+
+def _require(content, function_name, text):
+    """Refuse to rewrite a function that doesn't have the expected shape"""
+    if text not in find_function(content, function_name).text:
+        raise StructuralMatchError(f"{function_name}() does not contain {text!r}")
 
 def fix_mono(content):
     """Fix Mono.html - completely broken function"""
-    pattern = r'function populateContactInfo\(\) \{[^}]*?if \(personal\.phone\).*?if \(hasDetails\) \{'
+    _require(content, 'populateContactInfo', 'if (personal.phone)')
 
     replacement = '''function populateContactInfo() {
       const personal = resumeData.personalInfo;
@@ -87,11 +94,11 @@ def fix_mono(content):
 
       if (hasDetails) {'''
 
-    return re.sub(pattern, replacement, content, flags=re.DOTALL)
+    return replace_function_head(content, 'populateContactInfo', r'if \(hasDetails\) \{', replacement)
 
 def fix_epure(content):
     """Fix Epure.html - broken function"""
-    pattern = r'function populateContactInfo\(\) \{[^}]*?if \(personal\.location\).*?if \(hasDetails\) \{'
+    _require(content, 'populateContactInfo', 'if (personal.location)')
 
     replacement = '''function populateContactInfo() {
       const personal = resumeData.personalInfo;
@@ -150,10 +157,11 @@ def fix_epure(content):
 
       if (hasDetails) {'''
 
-    return re.sub(pattern, replacement, content, flags=re.DOTALL)
+    return replace_function_head(content, 'populateContactInfo', r'if \(hasDetails\) \{', replacement)
 
 def main():
     template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
 
     fixes = {
         'Beige.html': fix_beige,
@@ -161,6 +169,10 @@ def main():
         'Epure.html': fix_epure,
     }
 
+    if changed_since:
+        selected = select_changed_templates([template_dir / name for name in fixes], changed_since, template_dir)
+        fixes = {path.name: fixes[path.name] for path in selected}
+
     print("=" * 80)
     print("FIXING BROKEN CONTACT FUNCTIONS")
     print("=" * 80)
@@ -178,11 +190,14 @@ def main():
                 content = f.read()
 
             original = content
-            content = fix_func(content)
+            try:
+                content = fix_func(content)
+            except StructuralMatchError as e:
+                print(f"  {filename} (no changes: {e})")
+                continue
 
             if content != original:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                write_if_changed(filepath, content)
                 print(f"✓ Fixed {filename}")
             else:
                 print(f"  {filename} (no changes)")
@@ -6,6 +6,10 @@ Fix double resumeData references and remaining issues
 import re
 from pathlib import Path
 
+from git_changes import parse_changed_since
+from template_discovery import RESUME, find_templates, template_name
+from template_writes import write_if_changed
+
 def fix_content(content: str) -> str:
     """Fix all remaining issues"""
 
@@ -41,13 +45,16 @@ def fix_content(content: str) -> str:
 def main():
     """Fix all templates"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
 
     fixed_count = 0
 
     print("Fixing double references and remaining issues...\n")
 
     for html_file in html_files:
+        name = template_name(html_file, template_dir)
+
         try:
             with open(html_file, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -56,15 +63,14 @@ def main():
             content = fix_content(content)
 
             if content != original:
-                with open(html_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"✓ Fixed {html_file.name}")
+                write_if_changed(html_file, content)
+                print(f"✓ Fixed {name}")
                 fixed_count += 1
             else:
-                print(f"  {html_file.name} (no changes)")
+                print(f"  {name} (no changes)")
 
         except Exception as e:
-            print(f"❌ Error with {html_file.name}: {e}")
+            print(f"❌ Error with {name}: {e}")
 
     print(f"\n✓ Fixed {fixed_count} template(s)")
 
@@ -7,6 +7,9 @@ Fix duplicate contact information by removing old field displays
 import re
 from pathlib import Path
 
+from git_changes import parse_changed_since, select_changed_templates
+from template_writes import write_if_changed
+
 def fix_template_duplicates(content, filename):
     """
     Remove duplicate contact field displays
@@ -58,6 +61,7 @@ def fix_template_duplicates(content, filename):
 def main():
     """Fix all templates with duplicate contact information"""
     template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
 
     # Templates identified as having duplicates
     templates_to_fix = [
@@ -98,6 +102,10 @@ def main():
 
     fixed_count = 0
 
+    if changed_since:
+        selected = select_changed_templates([template_dir / name for name in templates_to_fix], changed_since, template_dir)
+        templates_to_fix = [path.name for path in selected]
+
     for filename in templates_to_fix:
         filepath = template_dir / filename
 
@@ -112,8 +120,7 @@ def main():
             was_fixed, new_content = fix_template_duplicates(content, filename)
 
             if was_fixed:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                write_if_changed(filepath, new_content)
                 print(f"✓ Fixed {filename}")
                 fixed_count += 1
             else:
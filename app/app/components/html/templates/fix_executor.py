@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Concurrent fixer executor with edit-conflict detection
+Templates are fixed in parallel on a process pool. Within a template the fixers run one
+after another in hirehub_templates.fixer_order, each only on the templates its script
+would fix (FIXER_SCOPES), so a template ends up as running the fixer scripts in sequence
+leaves it; --self-check compares the two on a copy of the tree. Each pass is recorded as span edits against its input, and the
+text every pass wrote is followed through the later passes, so a rule rewriting what an
+earlier rule wrote is caught.
+
+That is expected when FIXER_DEPENDENCIES declares it (double_references collapsing the
+resumeData.resumeData. that manual leaves). Any other overlap is a conflict, which the
+'ordered' policy resolves by fixer order (the sequential result) and the 'refuse' policy
+refuses by leaving the template unchanged.
+
+Usage:
+    python fix_executor.py manual final_cleanup double_references     # dry run
+    python fix_executor.py --all --write --on-conflict refuse -j 8
+    python fix_executor.py --self-check
+"""
+
+import argparse
+import difflib
+import shutil
+import subprocess
+import sys
+import tempfile
+from functools import partial
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from hirehub_templates import FIXER_DEPENDENCIES, FIXER_SCOPES, FIXERS, TEMPLATE_DIR, fixer_order, load
+from template_discovery import RESUME, find_templates, template_name
+from template_edits import SpanEdit
+from template_loader import process_templates
+from template_writes import write_if_changed
+
+POLICIES = ('ordered', 'refuse')
+
+# Changed blocks longer than this are recorded as one edit instead of diffed per character
+CHAR_DIFF_LIMIT = 4000
+# Unchanged runs shorter than this inside a changed block are folded into the edit around them
+MIN_ANCHOR = 4
+
+# Fixers loaded in this process, by name
+_loaded: Dict[str, Callable[[str], str]] = {}
+# FIXER_SCOPES predicates loaded in this process, by fixer name
+_scopes: Dict[str, Callable[[str], bool]] = {}
+
+
+class FixPass:
+    """One fixer's edits, against the content it was given"""
+
+    __slots__ = ('name', 'edits')
+
+    def __init__(self, name: str, edits: List[SpanEdit]):
+        self.name = name
+        self.edits = edits
+
+    def __repr__(self):
+        return f"FixPass({self.name!r}, {len(self.edits)} edit(s))"
+
+
+class EditConflict:
+    """A later fixer rewriting text an earlier fixer wrote"""
+
+    __slots__ = ('earlier', 'later', 'line', 'expected')
+
+    def __init__(self, earlier: str, later: str, line: int, expected: bool):
+        self.earlier = earlier
+        self.later = later
+        self.line = line                # in the content the later fixer was given
+        self.expected = expected        # declared in FIXER_DEPENDENCIES
+
+    def __repr__(self):
+        return f"EditConflict({self.earlier!r} -> {self.later!r}, line {self.line})"
+
+
+class FileFix:
+    """Outcome of the fixers on one template"""
+
+    __slots__ = ('content', 'changed', 'passes', 'conflicts', 'refused')
+
+    def __init__(self, content: str, changed: bool, passes: List[FixPass], conflicts: List[EditConflict],
+                 refused: bool):
+        self.content = content
+        self.changed = changed          # passes can cancel out: manual's doubles, collapsed again
+        self.passes = passes
+        self.conflicts = conflicts
+        self.refused = refused
+
+    @property
+    def applied(self) -> List[str]:
+        return [] if self.refused else [p.name for p in self.passes]
+
+    @property
+    def unexpected(self) -> List[EditConflict]:
+        return [c for c in self.conflicts if not c.expected]
+
+
+def _line_offsets(lines: List[str]) -> List[int]:
+    return list(accumulate(map(len, lines), initial=0))
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Length of the common prefix, by binary search over slice comparisons"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _char_edits(old: str, new: str) -> List[SpanEdit]:
+    """Edits turning old into new, at character precision for small blocks"""
+    prefix = _common_prefix(old, new)
+    suffix = _common_prefix(old[prefix:][::-1], new[prefix:][::-1])
+    old_end, new_end = len(old) - suffix, len(new) - suffix
+    if old_end - prefix + new_end - prefix > CHAR_DIFF_LIMIT:
+        return [(prefix, old_end, new[prefix:new_end])]
+
+    spans = []
+    matcher = difflib.SequenceMatcher(None, old[prefix:old_end], new[prefix:new_end], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        if spans and i1 - spans[-1][1] < MIN_ANCHOR:
+            # A short unchanged run is part of one rewrite (employer -> company)
+            spans[-1] = (spans[-1][0], i2, spans[-1][2], j2)
+        else:
+            spans.append((i1, i2, j1, j2))
+    return [(prefix + i1, prefix + i2, new[prefix + j1:prefix + j2]) for i1, i2, j1, j2 in spans]
+
+
+def _changed_lines(old_lines: List[str], new_lines: List[str]) -> List[Tuple[int, int, int, int]]:
+    """(i1, i2, j1, j2) line ranges that differ; most passes rewrite lines in place"""
+    if len(old_lines) != len(new_lines):
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+        return [(i1, i2, j1, j2) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+    blocks = []
+    for i in [i for i, (old, new) in enumerate(zip(old_lines, new_lines)) if old != new]:
+        if blocks and blocks[-1][1] == i:
+            blocks[-1][1] = blocks[-1][3] = i + 1
+        else:
+            blocks.append([i, i + 1, i, i + 1])
+    return [tuple(block) for block in blocks]
+
+
+def pass_edits(before: str, after: str) -> List[SpanEdit]:
+    """Span edits against before that produce after: changed lines, then characters within them"""
+    old_lines = before.splitlines(keepends=True)
+    new_lines = after.splitlines(keepends=True)
+    old_offsets = _line_offsets(old_lines)
+    new_offsets = _line_offsets(new_lines)
+
+    edits = []
+    for i1, i2, j1, j2 in _changed_lines(old_lines, new_lines):
+        start = old_offsets[i1]
+        old = before[start:old_offsets[i2]]
+        new = after[new_offsets[j1]:new_offsets[j2]]
+        edits.extend((start + s, start + e, r) for s, e, r in _char_edits(old, new))
+    return edits
+
+
+def _overlaps(a: int, b: int, start: int, end: int) -> bool:
+    """Whether [a, b) and [start, end) touch the same text; empty spans are insertion points"""
+    if a == b and start == end:
+        return a == start
+    if a == b:
+        return start < a < end
+    if start == end:
+        return a < start < b
+    return start < b and a < end
+
+
+def _written(owned: List[Tuple[int, int, str]], edits: List[SpanEdit], name: str,
+             touched: set) -> List[Tuple[int, int, str]]:
+    """
+    Regions written so far, in the coordinates after edits
+    Regions an edit touched are replaced by that edit's own region
+    """
+    written = []
+    delta = 0
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+        written.append((start + delta, start + delta + len(replacement), name))
+        delta += len(replacement) - (end - start)
+
+    ends = [(start, end, len(replacement) - (end - start)) for start, end, replacement in edits]
+    for i, (a, b, rule) in enumerate(owned):
+        if i in touched:
+            continue
+        shift = sum(d for start, end, d in ends if end <= a)
+        written.append((a + shift, b + shift, rule))
+    return sorted(written)
+
+
+def applies(name: str, template: Optional[str]) -> bool:
+    """Whether fixer name runs on template (a template_name); scoped fixers need a name"""
+    target = FIXER_SCOPES.get(name)
+    if target is None:
+        return True
+    if template is None:
+        return False
+    scope = _scopes.get(name)
+    if scope is None:
+        scope = _scopes[name] = load(target)
+    return scope(template)
+
+
+def run_fixers(content: str, names: List[str], policy: str = 'ordered', template: Optional[str] = None) -> FileFix:
+    """
+    Apply the named fixers in fixer_order, recording each pass and any conflicts between them
+    template: the template_name of content; fixers in FIXER_SCOPES run only on the templates
+    their script lists, and not at all without a name
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown conflict policy {policy!r} (available: {', '.join(POLICIES)})")
+
+    original = current = content
+    passes: List[FixPass] = []
+    conflicts: List[EditConflict] = []
+    owned: List[Tuple[int, int, str]] = []
+
+    for name in fixer_order(names):
+        if not applies(name, template):
+            continue
+        fixer = _loaded.get(name)
+        if fixer is None:
+            fixer = _loaded[name] = load(FIXERS[name][0])
+
+        fixed = fixer(current)
+        if fixed == current:
+            continue
+        edits = pass_edits(current, fixed)
+        passes.append(FixPass(name, edits))
+
+        touched = set()
+        seen = set()
+        for start, end, _ in edits:
+            for i, (a, b, earlier) in enumerate(owned):
+                if not _overlaps(a, b, start, end):
+                    continue
+                touched.add(i)
+                line = current.count('\n', 0, start) + 1
+                if (earlier, line) not in seen:
+                    seen.add((earlier, line))
+                    conflicts.append(EditConflict(earlier, name, line, earlier in FIXER_DEPENDENCIES.get(name, ())))
+        owned = _written(owned, edits, name, touched)
+        current = fixed
+
+    refused = policy == 'refuse' and any(not c.expected for c in conflicts)
+    content = original if refused else current
+    return FileFix(content, content != original, passes, conflicts, refused)
+
+
+def _fix_file(path: Path, content: str, names: Tuple[str, ...], policy: str) -> FileFix:
+    return run_fixers(content, list(names), policy, template=template_name(path, TEMPLATE_DIR))
+
+
+def execute(paths: List[Path], names: List[str], policy: str = 'ordered',
+            workers: Optional[int] = None) -> Dict[Path, FileFix]:
+    """{path: FileFix} for every template, fixed on a process pool (workers=0 runs in-process)"""
+    fix_file = partial(_fix_file, names=tuple(names), policy=policy)
+    return process_templates(paths, fix_file, workers=workers)
+
+
+def report(results: Dict[Path, FileFix], names: List[str], write: bool, template_dir: Path) -> int:
+    """Print (and with write, save) executor results; 1 when any template was refused"""
+    print("=" * 100)
+    print(f"TEMPLATE FIXES: {', '.join(fixer_order(names))}" + ("" if write else " - DRY RUN"))
+    print("=" * 100)
+    print()
+
+    changed = refused = 0
+    for path, fix in sorted(results.items(), key=lambda item: template_name(item[0], template_dir)):
+        name = template_name(path, template_dir)
+        if fix.refused:
+            refused += 1
+            print(f"❌ {name}: refused, fixers overlap")
+        elif fix.changed:
+            changed += 1
+            if write:
+                write_if_changed(path, fix.content)
+            print(f"✓ {name}: {', '.join(fix.applied)}")
+        elif fix.unexpected:
+            print(f"  {name}: {', '.join(fix.applied)} (no net change)")
+        # Declared interactions (FIXER_DEPENDENCIES) are the intended order at work
+        for conflict in fix.unexpected:
+            print(f"   ⚠️  Line {conflict.line}: {conflict.later} rewrites {conflict.earlier}'s edit")
+
+    print()
+    print("=" * 100)
+    print(f"{'Fixed' if write else 'Would fix'} {changed} template(s)" +
+          (f", refused {refused} with conflicting fixers" if refused else ""))
+    print("=" * 100)
+    return 1 if refused else 0
+
+
+def self_check(template_dir: Path, workers: Optional[int] = None) -> List[str]:
+    """
+    Run every fixer script's main() in fixer_order on a copy of template_dir and compare the
+    resume templates it leaves with execute() over all fixers; returns the differences
+    """
+    paths = find_templates(template_dir, schema=RESUME)
+    results = execute(paths, list(FIXERS), workers=workers)
+    scripts = dict.fromkeys(FIXERS[name][0].partition(':')[0] for name in fixer_order(list(FIXERS)))
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = Path(tmp) / template_dir.name
+        shutil.copytree(template_dir, copy, ignore=shutil.ignore_patterns('.cache', '__pycache__'))
+        for script in scripts:
+            run = subprocess.run([sys.executable, f"{script}.py"], cwd=copy, stdout=subprocess.DEVNULL)
+            if run.returncode:
+                return [f"{script}.py exited with status {run.returncode}"]
+
+        for path in paths:
+            name = template_name(path, template_dir)
+            with open(copy / name, 'r', encoding='utf-8') as f:
+                if f.read() != results[path].content:
+                    failures.append(f"{name}: fixer scripts and executor disagree")
+    return failures
+
+
+def main():
+    template_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('fixers', nargs='*', help='fixer names, run in their declared order')
+    parser.add_argument('--all', action='store_true', help='every registered fixer')
+    parser.add_argument('--write', action='store_true', help='rewrite templates in place')
+    parser.add_argument('--on-conflict', choices=POLICIES, default='ordered',
+                        help='ordered: later fixers win (the sequential result); refuse: leave the template unchanged')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (0 runs in-process)')
+    parser.add_argument('--changed-since', metavar='REF',
+                        help='only templates changed since this git ref, plus templates sharing the changed code')
+    parser.add_argument('--self-check', action='store_true',
+                        help='check that --all gives what running the fixer scripts in sequence gives')
+    args = parser.parse_args()
+
+    if args.self_check:
+        failures = self_check(template_dir, args.jobs)
+        for failure in failures:
+            print(f"❌ {failure}")
+        print(f"{'❌' if failures else '✓'} executor {'differs from' if failures else 'matches'} the fixer scripts")
+        return 1 if failures else 0
+
+    names = list(FIXERS) if args.all else args.fixers
+    unknown = [name for name in names if name not in FIXERS]
+    if unknown or not names:
+        parser.error(f"unknown fixers: {', '.join(unknown)}" if unknown else "name fixers or pass --all")
+
+    paths = find_templates(template_dir, schema=RESUME, changed_since=args.changed_since)
+    results = execute(paths, names, args.on_conflict, args.jobs)
+    return report(results, names, args.write, template_dir)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -6,6 +6,22 @@ Fix project date references by making them conditional or removing them
 import re
 from pathlib import Path
 
+from git_changes import parse_changed_since, select_changed_templates
+from template_writes import write_if_changed
+
+# Templates with project date issues
+TEMPLATES = (
+    'Aurora.html',
+    'Gradiento.html',
+    'ProfessionalBlock.html',
+    'modern.html',
+    'pastel.html',
+)
+
+def applies_to(template: str) -> bool:
+    """Whether fix_project_dates is meant for this template"""
+    return template in TEMPLATES
+
 def fix_project_dates(content: str) -> str:
     """Make project date references conditional"""
 
@@ -70,19 +86,18 @@ def fix_project_dates(content: str) -> str:
 def main():
     """Fix templates with project date issues"""
     template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
 
-    templates_with_dates = [
-        'Aurora.html',
-        'Gradiento.html',
-        'ProfessionalBlock.html',
-        'modern.html',
-        'pastel.html',
-    ]
+    templates_with_dates = list(TEMPLATES)
 
     fixed_count = 0
 
     print("Fixing project date references...\n")
 
+    if changed_since:
+        selected = select_changed_templates([template_dir / name for name in templates_with_dates], changed_since, template_dir)
+        templates_with_dates = [path.name for path in selected]
+
     for filename in templates_with_dates:
         filepath = template_dir / filename
 
@@ -98,8 +113,7 @@ def main():
             content = fix_project_dates(content)
 
             if content != original:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                write_if_changed(filepath, content)
                 print(f"✓ Fixed {filename}")
                 fixed_count += 1
             else:
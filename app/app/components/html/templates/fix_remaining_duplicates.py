@@ -6,6 +6,20 @@ Fix remaining duplicate contact fields with various patterns
 import re
 from pathlib import Path
 
+from git_changes import parse_changed_since
+from regex_guard import register
+from template_discovery import RESUME, find_templates, template_name
+from template_writes import write_if_changed
+from verify_duplicate_fixes import analyze_contact_fields, contact_field_issues
+
+SKIP = (
+    'Aurora.html',  # Already fixed manually
+)
+
+def applies_to(template):
+    """Whether fix_content is meant for this template"""
+    return template not in SKIP
+
 def fix_array_pattern(content):
     """
     Fix pattern where website is in contacts array
@@ -17,6 +31,24 @@ def fix_array_pattern(content):
 
     return content
 
+# Inline website displays; DOTALL with stacked lazy quantifiers, so they run guarded
+INLINE_PATTERNS = [
+    # Template literals with website
+    (register('fix_remaining_duplicates.website_paragraph',
+              r"<p[^>]*>.*?Website:.*?\$\{personal\.website\}.*?</p>", re.DOTALL),
+     "<!-- Website moved to websitesAndSocialLinks -->"),
+
+    # String concatenation with website
+    (register('fix_remaining_duplicates.contact_str_website',
+              r"contactStr \+= .*?personal\.website.*?;", re.DOTALL),
+     "// contactStr += personal.website; // Removed: duplicate"),
+
+    # Direct website displays in HTML strings
+    (register('fix_remaining_duplicates.html_website',
+              r'html \+= .*?personal\.website.*?;', re.DOTALL),
+     '// Website display removed - using websitesAndSocialLinks'),
+]
+
 def fix_inline_pattern(content):
     """
     Fix inline displays of website/socialLinks
@@ -25,19 +57,8 @@ def fix_inline_pattern(content):
     # or contactStr += personal.website
 
     # Remove inline website displays
-    patterns = [
-        # Template literals with website
-        (r"<p[^>]*>.*?Website:.*?\$\{personal\.website\}.*?</p>", "<!-- Website moved to websitesAndSocialLinks -->"),
-
-        # String concatenation with website
-        (r"contactStr \+= .*?personal\.website.*?;", "// contactStr += personal.website; // Removed: duplicate"),
-
-        # Direct website displays in HTML strings
-        (r'html \+= .*?personal\.website.*?;', '// Website display removed - using websitesAndSocialLinks'),
-    ]
-
-    for pattern, replacement in patterns:
-        content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+    for pattern, replacement in INLINE_PATTERNS:
+        content = pattern.sub(replacement, content)
 
     return content
 
@@ -91,6 +112,17 @@ def fix_contact_section_pattern(content):
 
     return '\n'.join(new_lines)
 
+def fix_content(content):
+    """Apply the safe fix patterns to template content"""
+    # The patterns span from any html += to the next personal.website, so they only run
+    # on templates that really show old contact fields next to websitesAndSocialLinks
+    if contact_field_issues(content) is None:
+        return content
+    content = fix_array_pattern(content)
+    content = fix_inline_pattern(content)
+    # content = fix_contact_section_pattern(content)  # This one is risky, comment out for now
+    return content
+
 def process_template(filepath):
     """Process a single template"""
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -99,13 +131,10 @@ def process_template(filepath):
     original = content
 
     # Apply all fix patterns
-    content = fix_array_pattern(content)
-    content = fix_inline_pattern(content)
-    # content = fix_contact_section_pattern(content)  # This one is risky, comment out for now
+    content = fix_content(content)
 
     if content != original:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_if_changed(filepath, content)
         return True
 
     return False
@@ -113,24 +142,12 @@ def process_template(filepath):
 def main():
     """Fix remaining templates"""
     template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
 
-    # Remaining templates with duplicates
+    # Templates still displaying old contact fields next to websitesAndSocialLinks
     templates = [
-        # 'Aurora.html',  # Already fixed manually
-        'Balance.html',
-        'Beige.html',
-        'BrightPath.html',
-        'Clarity.html',
-        'CleanGradient.html',
-        'DiamondFlow.html',
-        'ElegantWatermark.html',
-        'Epure.html',
-        'Focus.html',
-        'ModernEdge.html',
-        'Mono.html',
-        'ProfessionalBlock.html',
-        'Sapphire.html',
-        'pastel.html',
+        html_file for html_file in find_templates(template_dir, schema=RESUME, changed_since=changed_since)
+        if applies_to(template_name(html_file, template_dir)) and analyze_contact_fields(html_file)
     ]
 
     print("=" * 100)
@@ -140,12 +157,8 @@ def main():
 
     fixed_count = 0
 
-    for filename in templates:
-        filepath = template_dir / filename
-
-        if not filepath.exists():
-            print(f"❌ Not found: {filename}")
-            continue
+    for filepath in templates:
+        filename = template_name(filepath, template_dir)
 
         try:
             was_fixed = process_template(filepath)
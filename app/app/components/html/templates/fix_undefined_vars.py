@@ -6,6 +6,30 @@ Fix all undefined variables found by deep_validator
 import re
 from pathlib import Path
 
+from git_changes import parse_changed_since
+from template_discovery import RESUME, find_templates, template_name
+from template_writes import write_if_changed
+
+# Templates left out when deep_validator's report was fixed; new templates are fixed
+SKIP = (
+    'Balance.html',
+    'Beige.html',
+    'BlueAccent.html',
+    'BrightPath.html',
+    'CleanGradient.html',
+    'Elegance.html',
+    'ElegantWatermark.html',
+    'GradientSidebar.html',
+    'Gridline.html',
+    'MidnightBlue.html',
+    'MinimalistFlow.html',
+    'Zenith.html',
+)
+
+def applies_to(template: str) -> bool:
+    """Whether fix_template is meant for this template"""
+    return template not in SKIP
+
 def fix_template(content: str) -> str:
     """Fix all undefined variable references"""
 
@@ -47,34 +71,19 @@ def fix_template(content: str) -> str:
 def main():
     """Fix all templates"""
     template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
 
-    # Templates with undefined variables (from deep_validator report)
     templates_to_fix = [
-        'Aurora.html',
-        'Clarity.html',
-        'DiamondFlow.html',
-        'Epure.html',
-        'Focus.html',
-        'Gradiento.html',
-        'Midnight.html',
-        'ModernEdge.html',
-        'Mono.html',
-        'ProfessionalBlock.html',
-        'Sapphire.html',
-        'modern.html',
-        'pastel.html',
+        html_file for html_file in find_templates(template_dir, schema=RESUME, changed_since=changed_since)
+        if applies_to(template_name(html_file, template_dir))
     ]
 
     fixed_count = 0
 
     print("Fixing undefined variables...\n")
 
-    for filename in templates_to_fix:
-        filepath = template_dir / filename
-
-        if not filepath.exists():
-            print(f"❌ Not found: {filename}")
-            continue
+    for filepath in templates_to_fix:
+        filename = template_name(filepath, template_dir)
 
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
@@ -84,8 +93,7 @@ def main():
             content = fix_template(content)
 
             if content != original:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                write_if_changed(filepath, content)
                 print(f"✓ Fixed {filename}")
                 fixed_count += 1
             else:
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Font usage analyzer
+Works out, per template, which of the font families it requests (Google Fonts css2 links
+and @imports, fonts.cdnfonts.com) are rendered by its CSS and JS, which are only offered
+in the font selector, and which are never used, together with the weights each one needs.
+Writes font_manifest.json so the app can emit preload hints and stylesheet requests for
+the rendered families only, load selectable families on demand, and subset local copies
+to the weights listed.
+"""
+
+import argparse
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+from js_functions import SCRIPT_BLOCK
+from template_discovery import find_templates, template_name
+from template_document import Finding
+from template_writes import write_if_changed
+
+TEMPLATE_DIR = Path(__file__).parent
+MANIFEST_PATH = TEMPLATE_DIR / 'font_manifest.json'
+FONTS_JS = TEMPLATE_DIR.parents[3] / 'utils' / 'fonts.js'
+
+MANIFEST_VERSION = 1
+
+GOOGLE_FONTS_URL = re.compile(r'https://fonts\.googleapis\.com/css2?\?[^"\')\s]+')
+CDN_FONTS_URL = re.compile(r'https://fonts\.cdnfonts\.com/css/([\w-]+)')
+FONT_FAMILY = re.compile(r'font-family\s*:\s*([^;{}<>\n]+)', re.IGNORECASE)
+FONT_WEIGHT = re.compile(r'''(?:font-weight\s*:|fontWeight\s*=)\s*['"]?(\w+)''', re.IGNORECASE)
+OPTION_VALUE = re.compile(r'''<option\b[^>]*\bvalue\s*=\s*(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+JS_STRING = re.compile(r'''"([^"\\\n]*)"|'([^'\\\n]*)\'''')
+# Elements the browser renders bold without any CSS
+BOLD_ELEMENTS = re.compile(r'<(?:h[1-6]|strong|b|th)\b', re.IGNORECASE)
+FONTS_JS_ENTRY = re.compile(r"^\s*[A-Z_]+:\s*'([^']+)'", re.MULTILINE)
+
+GENERIC_FAMILIES = {
+    'serif', 'sans-serif', 'monospace', 'cursive', 'fantasy', 'system-ui', 'ui-sans-serif',
+    'ui-serif', 'ui-monospace', '-apple-system', 'blinkmacsystemfont', 'segoe ui', 'arial',
+    'helvetica', 'helvetica neue', 'georgia', 'times new roman', 'courier new', 'verdana',
+    'inherit', 'initial', 'unset', 'var',
+}
+WEIGHT_KEYWORDS = {'normal': 400, 'bold': 700, 'bolder': 700, 'lighter': 300}
+
+# Weights a family is assumed to ship when its stylesheet does not list any
+ALL_WEIGHTS = None
+
+
+def parse_font_stack(value: str) -> List[str]:
+    """Family names of a font-family value, in order, without quotes"""
+    families = []
+    for part in value.split(','):
+        name = part.strip().strip('"\'').strip()
+        if name and not name.startswith('var('):
+            families.append(name)
+    return families
+
+
+def _weights(spec: str) -> Set[int]:
+    """Weights of a css2 axis spec such as 'wght@300;400' or 'ital,wght@0,400;1,700'"""
+    axes, _, values = spec.partition('@')
+    names = axes.split(',')
+    if 'wght' not in names:
+        return set()
+    index = names.index('wght')
+    weights = set()
+    for combo in values.split(';'):
+        parts = combo.split(',')
+        if len(parts) > index and parts[index].isdigit():
+            weights.add(int(parts[index]))
+    return weights
+
+
+def requested_fonts(content: str) -> Dict[str, dict]:
+    """family -> {'weights': set or ALL_WEIGHTS, 'url': stylesheet} for every font the template loads"""
+    requested = {}
+    for match in GOOGLE_FONTS_URL.finditer(content):
+        url = match.group(0).replace('&amp;', '&')
+        query = parse_qs(urlsplit(url).query)
+        for family_spec in query.get('family', []):
+            # Old css API: Roboto:400,700|Lato
+            for spec in family_spec.split('|'):
+                name, _, axes = spec.partition(':')
+                if axes and '@' not in axes:
+                    weights = {int(w) for w in re.findall(r'\d+', axes)}
+                else:
+                    weights = _weights(axes) if axes else {400}
+                entry = requested.setdefault(name.strip(), {'weights': set(), 'url': url})
+                entry['weights'] |= weights
+
+    for match in CDN_FONTS_URL.finditer(content):
+        name = match.group(1).replace('-', ' ').title()
+        requested.setdefault(name, {'weights': ALL_WEIGHTS, 'url': match.group(0)})
+
+    return requested
+
+
+def known_families(fonts_js: Path = FONTS_JS) -> Set[str]:
+    """Families the app defines in utils/fonts.js (a template may use one without requesting it)"""
+    try:
+        with open(fonts_js, 'r', encoding='utf-8') as f:
+            source = f.read()
+    except OSError:
+        return set()
+    families = set()
+    for stack in FONTS_JS_ENTRY.findall(source):
+        families.update(f for f in parse_font_stack(stack) if f.lower() not in GENERIC_FAMILIES)
+    return families
+
+
+def used_weights(content: str) -> Set[int]:
+    """Every weight the template's CSS, inline styles and scripts can ask for"""
+    weights = {400}
+    for value in FONT_WEIGHT.findall(content):
+        value = value.lower()
+        if value.isdigit():
+            weights.add(int(value))
+        elif value in WEIGHT_KEYWORDS:
+            weights.add(WEIGHT_KEYWORDS[value])
+    if BOLD_ELEMENTS.search(content):
+        weights.add(700)
+    return weights
+
+
+def match_weight(desired: int, available: Iterable[int]) -> Optional[int]:
+    """The face a browser picks for desired among available (CSS Fonts font-weight matching)"""
+    available = sorted(available)
+    if not available:
+        return None
+    if desired in available:
+        return desired
+    below = [w for w in available if w < desired]
+    above = [w for w in available if w > desired]
+    if 400 <= desired <= 500:
+        # Up to 500 first, then lighter, then heavier
+        up_to_500 = [w for w in above if w <= 500]
+        if up_to_500:
+            return up_to_500[0]
+        if below:
+            return below[-1]
+        return above[0]
+    if desired < 400:
+        return below[-1] if below else above[0]
+    return above[0] if above else below[-1]
+
+
+def _first_loaded(stack: List[str], requested: Dict[str, dict], known: Set[str]) -> Optional[str]:
+    """The family of a stack the browser would download: the first one that is a web font"""
+    for family in stack:
+        if family in requested or family in known:
+            return family
+        if family.lower() in GENERIC_FAMILIES:
+            return None
+    return None
+
+
+class FontUsage:
+    """Requested, rendered and selectable families of one template"""
+
+    def __init__(self, content: str, known: Set[str]):
+        self.requested = requested_fonts(content)
+        self.weights = used_weights(content)
+        self.rendered: Set[str] = set()
+        self.selectable: Set[str] = set()
+
+        stacks = [parse_font_stack(value) for value in FONT_FAMILY.findall(content)]
+        # Font stacks as JS string literals: applyFont("'Inter', sans-serif"), el.style.fontFamily = '...'
+        for script in SCRIPT_BLOCK.finditer(content):
+            for literal in JS_STRING.finditer(script.group(1)):
+                text = literal.group(1) if literal.group(1) is not None else literal.group(2)
+                if ',' in text or text in self.requested:
+                    stacks.append(parse_font_stack(text))
+
+        for stack in stacks:
+            family = _first_loaded(stack, self.requested, known)
+            if family:
+                self.rendered.add(family)
+
+        # Offered in the font selector: loaded only once the user picks it
+        for match in OPTION_VALUE.finditer(content):
+            value = match.group(1) if match.group(1) is not None else match.group(2)
+            family = _first_loaded(parse_font_stack(value), self.requested, known)
+            if family and family not in self.rendered:
+                self.selectable.add(family)
+
+    def faces(self, family: str) -> Optional[List[int]]:
+        """Weights of family the template needs, snapped to the weights it requests"""
+        entry = self.requested.get(family)
+        if entry is None or entry['weights'] is ALL_WEIGHTS:
+            return sorted(self.weights)
+        return sorted({match_weight(w, entry['weights']) for w in self.weights} - {None})
+
+    @property
+    def unused(self) -> Set[str]:
+        return set(self.requested) - self.rendered - self.selectable
+
+    @property
+    def missing(self) -> Set[str]:
+        """Rendered web fonts the template never loads (they silently fall back)"""
+        return self.rendered - set(self.requested)
+
+    def stylesheets(self, families: Iterable[str]) -> List[str]:
+        """Stylesheet URLs loading just these families at the weights the template needs"""
+        google = []
+        other = []
+        for family in sorted(families):
+            entry = self.requested.get(family)
+            if entry is None:
+                continue
+            if 'fonts.googleapis.com' in entry['url']:
+                weights = ';'.join(str(w) for w in self.faces(family))
+                google.append(f"family={quote_plus(family)}:wght@{weights}")
+            elif entry['url'] not in other:
+                other.append(entry['url'])
+        urls = [f"https://fonts.googleapis.com/css2?{'&'.join(google)}&display=swap"] if google else []
+        return urls + other
+
+    def manifest_entry(self) -> Dict:
+        return {
+            'preload': {family: self.faces(family) for family in sorted(self.rendered - self.missing)},
+            'selectable': {family: self.faces(family) for family in sorted(self.selectable)},
+            'unused': sorted(self.unused),
+            'missing': sorted(self.missing),
+            'stylesheets': self.stylesheets(self.rendered),
+        }
+
+
+def analyze(template_paths: List[Path], template_dir: Path = TEMPLATE_DIR) -> Dict[str, FontUsage]:
+    known = known_families()
+    usages = {}
+    for path in template_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            usages[template_name(path, template_dir)] = FontUsage(f.read(), known)
+    return usages
+
+
+def checker(template_dir: Path = TEMPLATE_DIR):
+    """Fonts loaded but never used, or used but never loaded, as a hirehub_templates checker"""
+    known = known_families()
+
+    def check(document) -> List[Finding]:
+        usage = FontUsage(document.content, known)
+        findings = [Finding('fonts', None, f"{family} is loaded but never used") for family in sorted(usage.unused)]
+        findings += [Finding('fonts', None, f"{family} is used but not loaded") for family in sorted(usage.missing)]
+        return findings
+
+    return check
+
+
+def write_manifest(usages: Dict[str, FontUsage], path: Path = MANIFEST_PATH) -> bool:
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'templates': {name: usage.manifest_entry() for name, usage in sorted(usages.items())},
+    }
+    return write_if_changed(path, json.dumps(manifest, indent=2) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report font families and weights each template actually uses')
+    parser.add_argument('--manifest', default=str(MANIFEST_PATH), help='where to write the manifest (default: font_manifest.json)')
+    parser.add_argument('--no-manifest', action='store_true', help='only print the report')
+    args = parser.parse_args()
+
+    usages = analyze(find_templates(TEMPLATE_DIR))
+
+    print("=" * 100)
+    print("FONT USAGE")
+    print("=" * 100)
+    print()
+
+    totals = defaultdict(int)
+    for name, usage in sorted(usages.items()):
+        totals['requested'] += len(usage.requested)
+        totals['rendered'] += len(usage.rendered - usage.missing)
+        totals['selectable'] += len(usage.selectable)
+        totals['unused'] += len(usage.unused)
+        print(f"{name:36} requests {len(usage.requested):>2}   renders {len(usage.rendered - usage.missing):>2}   "
+              f"selectable {len(usage.selectable):>2}   unused {len(usage.unused):>2}")
+        rendered = ', '.join(f"{family} {usage.faces(family)}" for family in sorted(usage.rendered - usage.missing))
+        if rendered:
+            print(f"    renders: {rendered}")
+        if usage.unused:
+            print(f"    ⚠️  never used: {', '.join(sorted(usage.unused))}")
+        if usage.missing:
+            print(f"    ❌ used but not loaded: {', '.join(sorted(usage.missing))}")
+
+    print()
+    print("=" * 100)
+    print(f"Families requested up front: {totals['requested']}, needed at first paint: {totals['rendered']} "
+          f"({totals['selectable']} on demand from the font selector, {totals['unused']} never used)")
+    if not args.no_manifest:
+        written = write_manifest(usages, Path(args.manifest))
+        print(f"Manifest: {args.manifest}" + ("" if written else " (unchanged)"))
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Function-level content-addressed analysis cache
+Templates are split into their top-level JS functions; a checker runs once per distinct
+function body and its findings are stored under the body's hash in .cache/functions/,
+shared by every template (and every worker process) that carries a copy of the function.
+Only the text outside functions is re-analyzed for each template.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import js_functions
+
+CACHE_ROOT = Path(__file__).parent / '.cache' / 'functions'
+
+# Everything but line breaks, blanked out of function bodies
+NOT_NEWLINE = re.compile(r'[^\n]')
+
+# A finding anchored on a 1-based line, with a JSON-serializable payload
+Finding = Tuple[int, object]
+
+
+def analysis_key(function: js_functions.JsFunction) -> str:
+    """
+    Content hash of a function for line-based analyses
+    Indentation and trailing whitespace are ignored like function_hash, but line breaks
+    and comments are kept, because findings carry line numbers and line-based checkers
+    treat comment lines differently
+    """
+    lines = (line.strip() for line in function.text.split('\n'))
+    return hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+class FunctionCache:
+    """On-disk store of per-function findings for one analyzer, keyed by analysis_key"""
+
+    def __init__(self, namespace: str, version: int = 1, root: Path = CACHE_ROOT):
+        # Bumping version orphans every entry written by an older analyzer
+        self.directory = Path(root) / f"{namespace}.v{version}"
+        self.memory = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[list]:
+        if key in self.memory:
+            return self.memory[key]
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.memory[key] = value
+        return value
+
+    def put(self, key: str, value: list):
+        self.memory[key] = value
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: several worker processes or threads may store the same function at once
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+        tmp.replace(path)
+
+    def analyze(self, content: str, analyze: Callable[[str], List[Finding]]) -> List[Finding]:
+        """
+        Findings for a whole template, with analyze(text) -> [(line, payload)] run only on
+        functions missing from the cache and on the text outside functions
+        """
+        functions = js_functions.find_functions(content)
+        findings = []
+
+        # Text outside functions, with function bodies blanked so line numbers are kept
+        pieces = []
+        cursor = 0
+        for function in functions:
+            pieces.append(content[cursor:function.start])
+            pieces.append(NOT_NEWLINE.sub(' ', function.text))
+            cursor = function.end
+        pieces.append(content[cursor:])
+        findings.extend(analyze(''.join(pieces)))
+
+        for function in functions:
+            key = analysis_key(function)
+            cached = self.get(key)
+            if cached is None:
+                self.misses += 1
+                cached = [[line, payload] for line, payload in analyze(function.text)]
+                self.put(key, cached)
+            else:
+                self.hits += 1
+
+            first_line = content.count('\n', 0, function.start)
+            findings.extend((first_line + line, payload) for line, payload in cached)
+
+        # Stable: findings on one line keep the order the analyzer produced them in
+        findings.sort(key=lambda finding: finding[0])
+        return findings
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Git-aware selection of templates changed since a ref
+Adds templates that carry a copy of any function that changed, and falls back to
+every template when a shared input (resume.json, resume.schema.json or the scripts) changed
+"""
+
+import argparse
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Set
+
+import js_functions
+
+TEMPLATE_DIR = Path(__file__).parent
+
+# Inputs every template check depends on
+SHARED_INPUTS = ('resume.json', 'resume.schema.json', '*.py')
+
+
+def _git(args: List[str], cwd: Path) -> str:
+    result = subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def git_changed_paths(ref: str, cwd: Optional[Path] = None) -> Set[Path]:
+    """Files changed between ref and the working tree, plus untracked files"""
+    cwd = Path(cwd) if cwd else TEMPLATE_DIR
+    toplevel = Path(_git(['rev-parse', '--show-toplevel'], cwd).strip())
+
+    changed = _git(['diff', '--name-only', '-z', ref, '--'], cwd).split('\0')
+    untracked = _git(['ls-files', '--others', '--exclude-standard', '-z', '--full-name'], cwd).split('\0')
+
+    return {(toplevel / name).resolve() for name in changed + untracked if name}
+
+
+def git_show(ref: str, path: Path) -> Optional[str]:
+    """Contents of path at ref, or None if it did not exist there"""
+    path = Path(path).resolve()
+    try:
+        return _git(['show', f'{ref}:./{path.name}'], path.parent)
+    except subprocess.CalledProcessError:
+        return None
+
+
+def _function_hashes(content: str) -> Set[str]:
+    return {js_functions.function_hash(f) for f in js_functions.find_functions(content)}
+
+
+def select_changed_templates(templates: List[Path], ref: str,
+                             template_dir: Optional[Path] = None) -> List[Path]:
+    """
+    Limit templates to those changed since ref, plus templates sharing changed code
+    Order of the input list is preserved
+    """
+    template_dir = Path(template_dir) if template_dir else TEMPLATE_DIR
+    changed = git_changed_paths(ref, template_dir)
+
+    for pattern in SHARED_INPUTS:
+        if any(path.parent == template_dir.resolve() and path.match(pattern) for path in changed):
+            return list(templates)
+
+    resolved = {Path(t).resolve(): t for t in templates}
+    selected = {path for path in resolved if path in changed}
+
+    # Code that was edited in a changed template: the old bodies of its functions
+    edited_hashes = set()
+    for path in selected:
+        old = git_show(ref, path)
+        if old is None or not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            new_hashes = _function_hashes(f.read())
+        edited_hashes |= _function_hashes(old) - new_hashes
+
+    if edited_hashes:
+        for path in resolved:
+            if path in selected:
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                if _function_hashes(f.read()) & edited_hashes:
+                    selected.add(path)
+
+    return [t for path, t in resolved.items() if path in selected]
+
+
+def parse_changed_since(description: Optional[str] = None) -> Optional[str]:
+    """Parse the shared --changed-since option from the command line"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--changed-since', metavar='REF',
+        help='only process templates changed since this git ref, plus templates sharing the changed code'
+    )
+    return parser.parse_args().changed_since
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+hirehub-templates - one entry point for the template checkers, fixers and reports
+The registry below names modules as strings and imports them only when a command needs
+them, so running one checker does not load the others. Templates are discovered once and
+read once; every selected checker runs over the same TemplateDocument, so the decoded text,
+JS functions and CSS rules are shared instead of rebuilt per script.
+
+Checker protocol: a module-level checker(template_dir) returning check(document) -> [Finding]
+Fixer protocol:   a function taking template content and returning the fixed content;
+                  fixers run in registry order, constrained by FIXER_DEPENDENCIES, on the
+                  templates FIXER_SCOPES allows
+Reports:          a module's own main(), run with the remaining arguments
+
+Usage:
+    python hirehub_templates.py list
+    python hirehub_templates.py check                       # every checker
+    python hirehub_templates.py check deep fields -t 'Clarity*'
+    python hirehub_templates.py fix manual final_cleanup    # dry run
+    python hirehub_templates.py fix double_references --write --changed-since origin/main
+    python hirehub_templates.py report fonts --no-manifest
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from collections import defaultdict
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from template_discovery import RESUME, default_roots, discover_templates
+
+TEMPLATE_DIR = Path(__file__).parent
+
+# name -> (target, schema the checked templates must have, or None for all, description)
+CHECKERS = {
+    'deep': ('deep_validator:checker', RESUME, 'undefined property accesses in template code'),
+    'fields': ('validate_templates:checker', RESUME, 'data field references missing from resume.json'),
+    'completeness': ('validate_template_completeness:checker', RESUME, 'resume fields a template never handles'),
+    'duplicate-contacts': ('find_duplicate_contacts:checker', RESUME, 'old contact fields next to websitesAndSocialLinks'),
+    'reference-styling': ('find_reference_styling_issues:checker', None, 'rounded or colored reference sections'),
+    'dynamic-reference-colors': ('find_dynamic_reference_colors:checker', None, 'reference backgrounds colored from JS'),
+    'unused-css': ('css_pruner:checker', None, 'CSS selectors that can never match'),
+    'fonts': ('font_usage:checker', None, 'fonts loaded but unused, or used but not loaded'),
+}
+
+# name -> (target, description); applied in this order, the order the scripts are meant to run
+FIXERS = {
+    'undefined_vars': ('fix_undefined_vars:fix_template', 'rename or drop fields deep_validator reports'),
+    'project_dates': ('fix_project_dates:fix_project_dates', 'make project dates conditional'),
+    'manual': ('manual_fixes:fix_content', 'field renames that need special handling'),
+    'final_cleanup': ('final_cleanup:fix_template', 'remaining education references'),
+    'double_references': ('fix_double_references:fix_content', 'collapse resumeData.resumeData and renamed fields'),
+    'old_contact_fields': ('remove_old_contact_fields:remove_old_contact_displays', 'drop personal.website/socialLinks displays'),
+    'remaining_duplicates': ('fix_remaining_duplicates:fix_content', 'comment out duplicate contact entries'),
+    'border_radius': ('fix_all_reference_issues:fix_border_radius', 'remove border-radius from references'),
+    'reference_colors': ('fix_all_reference_issues:fix_colored_backgrounds', 'neutral reference backgrounds'),
+}
+
+# name -> fixers that must run before it when both are applied. A fixer listed here may
+# rewrite text those fixers wrote: manual turns resumeData.education.forEach into
+# resumeData.resumeData.education.forEach, which double_references then collapses
+FIXER_DEPENDENCIES = {
+    'final_cleanup': ('manual',),
+    'double_references': ('manual', 'final_cleanup'),
+}
+
+# name -> applies_to(template name) of a fixer whose script lists the templates it fixes or
+# skips; run_fixers skips the fixer elsewhere. Unlisted fixers run on every resume template
+FIXER_SCOPES = {
+    'undefined_vars': 'fix_undefined_vars:applies_to',
+    'project_dates': 'fix_project_dates:applies_to',
+    'old_contact_fields': 'remove_old_contact_fields:applies_to',
+    'remaining_duplicates': 'fix_remaining_duplicates:applies_to',
+}
+
+# name -> (module whose main() prints the report, description)
+REPORTS = {
+    'deep': ('deep_validator', 'deep validation report'),
+    'fields': ('validate_templates', 'field validation report and auto_fix_templates.py'),
+    'completeness': ('validate_template_completeness', 'field coverage per template'),
+    'coverage': ('field_coverage', 'template x field coverage matrix (--export for dashboards)'),
+    'duplicate-contacts': ('find_duplicate_contacts', 'duplicate contact information'),
+    'verify-duplicates': ('verify_duplicate_fixes', 'verify duplicate contact fixes'),
+    'reference-styling': ('find_reference_styling_issues', 'reference section styling'),
+    'reference-check': ('comprehensive_reference_check', 'all reference section styles'),
+    'colored-references': ('find_colored_references', 'colored reference backgrounds'),
+    'dynamic-reference-colors': ('find_dynamic_reference_colors', 'reference colors applied from JS'),
+    'color-schemes': ('color_schemes', 'colorSchemes objects'),
+    'unused-css': ('css_pruner', 'unused CSS (--write prunes)'),
+    'fonts': ('font_usage', 'font usage and font_manifest.json'),
+    'matrix': ('compatibility_matrix', 'resume x template compatibility'),
+    'field-index': ('field_index', 'where each resume field is used'),
+    'families': ('template_families', 'near-duplicate template families'),
+    'schema': ('schema_inference', 'inferred resume schema'),
+    'resume-validator': ('resume_validator', 'validate resumes against the schema'),
+    'runtime': ('runtime_validator', 'render templates in a JS engine'),
+    'regex-fuzz': ('regex_fuzz', 'guarded regex fuzzing'),
+    'discovery': ('template_discovery', 'discovered templates by schema'),
+    'build': ('build_templates', 'build minified templates into dist/'),
+}
+
+
+def load(target: str):
+    """Import 'module' or 'module:attribute' on first use"""
+    module_name, _, attribute = target.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute) if attribute else module
+
+
+def fixer_order(names: List[str]) -> List[str]:
+    """names in an order meeting FIXER_DEPENDENCIES, otherwise in registry order"""
+    pending = [name for name in FIXERS if name in names]
+    ordered = []
+    while pending:
+        ready = next((name for name in pending
+                      if all(dep not in pending for dep in FIXER_DEPENDENCIES.get(name, ()))), None)
+        if ready is None:
+            raise ValueError(f"circular fixer dependencies among: {', '.join(pending)}")
+        ordered.append(ready)
+        pending.remove(ready)
+    return ordered
+
+
+def _unknown(kind: str, names: List[str], registry: Dict) -> Optional[str]:
+    unknown = [name for name in names if name not in registry]
+    if unknown:
+        return f"unknown {kind}: {', '.join(unknown)} (available: {', '.join(registry)})"
+    return None
+
+
+def select_templates(template_dir: Path, patterns: List[str], changed_since: Optional[str]):
+    """Discovered templates as {path: (name, schema)}, filtered by name globs and git changes"""
+    templates = discover_templates(default_roots(template_dir), base=template_dir)
+    if patterns:
+        templates = [t for t in templates if any(fnmatch(t.name, pattern) for pattern in patterns)]
+    selected = {t.path: (t.name, t.schema) for t in templates}
+
+    if changed_since:
+        from git_changes import select_changed_templates
+        changed = set(select_changed_templates(list(selected), changed_since, template_dir))
+        selected = {path: value for path, value in selected.items() if path in changed}
+
+    return selected
+
+
+def run_checks(names: List[str], templates: Dict, template_dir: Path = TEMPLATE_DIR):
+    """{template name: [Finding]} for every template, plus per-checker seconds"""
+    from template_document import TemplateDocument
+    from template_loader import process_templates
+
+    timings = defaultdict(float)
+    checks = {}
+    for name in names:
+        start = time.perf_counter()
+        checks[name] = load(CHECKERS[name][0])(template_dir)
+        timings[name] += time.perf_counter() - start
+
+    def check_template(path: Path, content: str):
+        template, schema = templates[path]
+        document = TemplateDocument(path, template, content)
+        findings = []
+        for name, check in checks.items():
+            required = CHECKERS[name][1]
+            if required is not None and schema != required:
+                continue
+            start = time.perf_counter()
+            findings.extend(check(document))
+            timings[name] += time.perf_counter() - start
+        return findings
+
+    # Checkers hold unpicklable state, so they run in-process while reads are prefetched
+    results = process_templates(list(templates), check_template, workers=0)
+    return {templates[path][0]: findings for path, findings in results.items()}, timings
+
+
+def check_command(args) -> int:
+    names = args.checkers or list(CHECKERS)
+    error = _unknown('checkers', names, CHECKERS)
+    if error:
+        print(f"❌ {error}")
+        return 2
+
+    templates = select_templates(TEMPLATE_DIR, args.template, args.changed_since)
+    results, timings = run_checks(names, templates)
+
+    print("=" * 100)
+    print(f"TEMPLATE CHECKS: {', '.join(names)}")
+    print("=" * 100)
+
+    by_checker = defaultdict(int)
+    failing = 0
+    for template, findings in sorted(results.items()):
+        if not findings:
+            continue
+        failing += 1
+        print(f"\n❌ {template}")
+        for finding in findings:
+            by_checker[finding.checker] += 1
+            where = f"Line {finding.line}" if finding.line is not None else "File"
+            print(f"   ⚠️  [{finding.checker}] {where}: {finding.message}")
+            if finding.detail:
+                print(f"      → {finding.detail}")
+
+    print("\n" + "=" * 100)
+    print(f"SUMMARY: {failing}/{len(results)} templates with findings")
+    for name in names:
+        print(f"  {name:26} {by_checker[name]:>6} finding(s)   {timings[name] * 1000:>8.1f} ms")
+    print("=" * 100)
+    return 1 if failing else 0
+
+
+def fix_command(args) -> int:
+    error = _unknown('fixers', args.fixers, FIXERS)
+    if error:
+        print(f"❌ {error}")
+        return 2
+
+    from fix_executor import execute, report
+
+    templates = select_templates(TEMPLATE_DIR, args.template, args.changed_since)
+    paths = sorted(path for path, (_, schema) in templates.items() if schema == RESUME)
+    results = execute(paths, args.fixers, args.on_conflict, args.jobs)
+    return report(results, args.fixers, args.write, TEMPLATE_DIR)
+
+
+def report_command(args) -> int:
+    module_name = REPORTS[args.report][0]
+    main = load(f"{module_name}:main")
+    # Report scripts parse sys.argv themselves
+    sys.argv = [str(TEMPLATE_DIR / f"{module_name}.py")] + args.args
+    result = main()
+    return result if isinstance(result, int) else 0
+
+
+def list_command(args) -> int:
+    for title, registry in (('CHECKERS (check)', CHECKERS), ('FIXERS (fix)', FIXERS), ('REPORTS (report)', REPORTS)):
+        print(title)
+        for name, entry in registry.items():
+            print(f"  {name:26} {entry[-1]}")
+        print()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='hirehub-templates', description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def selection(subparser):
+        subparser.add_argument('-t', '--template', action='append', default=[], metavar='GLOB',
+                               help='only templates whose name matches (repeatable)')
+        subparser.add_argument('--changed-since', metavar='REF',
+                               help='only templates changed since this git ref, plus templates sharing the changed code')
+
+    check = commands.add_parser('check', help='run checkers over one shared parse of each template')
+    check.add_argument('checkers', nargs='*', help='checker names (default: all)')
+    selection(check)
+    check.set_defaults(run=check_command)
+
+    fix = commands.add_parser('fix', help='apply content fixers in their declared order, on a process pool')
+    fix.add_argument('fixers', nargs='+', help='fixer names')
+    fix.add_argument('--write', action='store_true', help='rewrite templates in place')
+    fix.add_argument('--on-conflict', choices=('ordered', 'refuse'), default='ordered',
+                     help='when fixers rewrite each other\'s edits: apply in order, or leave the template unchanged')
+    fix.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (0 runs in-process)')
+    selection(fix)
+    fix.set_defaults(run=fix_command)
+
+    report = commands.add_parser('report', help="run a script's full report")
+    report.add_argument('report', choices=list(REPORTS))
+    report.add_argument('args', nargs=argparse.REMAINDER, help='arguments for the report')
+    report.set_defaults(run=report_command)
+
+    listing = commands.add_parser('list', help='show registered checkers, fixers and reports')
+    listing.set_defaults(run=list_command)
+
+    args = parser.parse_args()
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory issue aggregation for the "most common" report sections
+Counts are exact while there are few distinct issues, which covers every report over the
+shipped templates. Past EXACT_LIMIT distinct keys a counter spills into a SpaceSaving
+summary that tracks the heaviest keys and a Count-Min sketch that bounds every other key,
+so a corpus run producing millions of issues still aggregates in constant memory.
+"""
+
+import heapq
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Distinct keys counted exactly before spilling into the sketches
+EXACT_LIMIT = 10_000
+# SpaceSaving slots; the top k are reliable for k well below this
+SUMMARY_CAPACITY = 1_000
+SKETCH_WIDTH = 4096
+SKETCH_DEPTH = 4
+# Template names remembered per issue for display
+EXAMPLES = 8
+
+
+class SpaceSaving:
+    """
+    Heavy hitters with weighted adds (Metwally, Agrawal, El Abbadi), pruned in batches
+    Up to twice capacity keys are held; when that fills, the lighter half is evicted at
+    once and floor rises to the heaviest evicted count. A key arriving (or returning)
+    starts at floor, so every count is an upper bound that overstates by at most floor.
+    """
+
+    __slots__ = ('capacity', 'counts', 'errors', 'floor')
+
+    def __init__(self, capacity: int = SUMMARY_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        # How much a key's count may overstate it
+        self.errors: Dict[str, int] = {}
+        self.floor = 0
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, int], capacity: int = SUMMARY_CAPACITY) -> 'SpaceSaving':
+        """Seed a summary with exact counts"""
+        summary = cls(capacity)
+        summary.counts = dict(counts)
+        summary.errors = dict.fromkeys(counts, 0)
+        if len(summary.counts) > 2 * capacity:
+            summary._prune()
+        return summary
+
+    def add(self, key: str, count: int = 1):
+        counts = self.counts
+        current = counts.get(key)
+        if current is not None:
+            counts[key] = current + count
+            return
+        counts[key] = self.floor + count
+        self.errors[key] = self.floor
+        if len(counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        kept = heapq.nlargest(self.capacity, self.counts.items(), key=lambda item: item[1])
+        evicted = kept[-1][1] if len(kept) == self.capacity else 0
+        # Every evicted key weighed at most the lightest kept one
+        self.floor = max(self.floor, evicted)
+        self.counts = dict(kept)
+        self.errors = {key: self.errors[key] for key in self.counts}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.counts
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+class CountMinSketch:
+    """Frequency upper bounds for any key in SKETCH_DEPTH x SKETCH_WIDTH counters"""
+
+    __slots__ = ('bits', 'mask', 'rows')
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        # Each row takes its own bit slice of one 64-bit hash
+        self.bits = max(1, (width - 1).bit_length())
+        if self.bits * depth > 64:
+            raise ValueError(f"a {width}x{depth} sketch needs more than 64 hash bits")
+        self.mask = (1 << self.bits) - 1
+        self.rows = [array('q', bytes(8 << self.bits)) for _ in range(depth)]
+
+    def add(self, key: str, count: int = 1):
+        h = hash(key)
+        bits, mask = self.bits, self.mask
+        for row in self.rows:
+            row[h & mask] += count
+            h >>= bits
+
+    def estimate(self, key: str) -> int:
+        h = hash(key)
+        bits, mask = self.bits, self.mask
+        least = None
+        for row in self.rows:
+            value = row[h & mask]
+            if least is None or value < least:
+                least = value
+            h >>= bits
+        return least
+
+
+class StreamCounter:
+    """Counts per key: exact up to exact_limit distinct keys, then SpaceSaving plus Count-Min"""
+
+    __slots__ = ('exact_limit', 'capacity', 'exact', 'summary', 'sketch', 'total')
+
+    def __init__(self, exact_limit: int = EXACT_LIMIT, capacity: int = SUMMARY_CAPACITY):
+        self.exact_limit = exact_limit
+        self.capacity = capacity
+        self.exact: Optional[Dict[str, int]] = {}
+        self.summary: Optional[SpaceSaving] = None
+        self.sketch: Optional[CountMinSketch] = None
+        self.total = 0
+
+    @property
+    def is_exact(self) -> bool:
+        return self.exact is not None
+
+    def add(self, key: str, count: int = 1):
+        self.total += count
+        exact = self.exact
+        if exact is not None:
+            exact[key] = exact.get(key, 0) + count
+            if len(exact) > self.exact_limit:
+                self._spill()
+            return
+        self.summary.add(key, count)
+        self.sketch.add(key, count)
+
+    def _spill(self):
+        self.sketch = CountMinSketch()
+        for key, count in self.exact.items():
+            self.sketch.add(key, count)
+        self.summary = SpaceSaving.from_counts(self.exact, self.capacity)
+        self.exact = None
+
+    def count(self, key: str) -> int:
+        """Exact count, or an upper bound once spilled"""
+        if self.exact is not None:
+            return self.exact.get(key, 0)
+        estimate = self.sketch.estimate(key)
+        tracked = self.summary.counts.get(key)
+        return estimate if tracked is None else min(tracked, estimate)
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """The k most frequent keys, ties broken by key"""
+        items = self.exact.items() if self.exact is not None else self.summary.counts.items()
+        ranked = heapq.nsmallest(k, items, key=lambda item: (-item[1], item[0]))
+        if self.exact is None:
+            ranked = [(key, self.count(key)) for key, _ in ranked]
+        return ranked
+
+
+class IssueCounter:
+    """
+    Occurrences and affected templates per issue, fed one template at a time
+    Ranks either by templates affected or by occurrences; both are exact until spilled
+    """
+
+    def __init__(self, exact_limit: int = EXACT_LIMIT, capacity: int = SUMMARY_CAPACITY,
+                 examples: int = EXAMPLES):
+        self.occurrences = StreamCounter(exact_limit, capacity)
+        self.templates = StreamCounter(exact_limit, capacity)
+        self.max_examples = examples
+        self.examples: Dict[str, List[str]] = {}
+        self.template_count = 0
+
+    @property
+    def is_exact(self) -> bool:
+        return self.occurrences.is_exact and self.templates.is_exact
+
+    def add_template(self, template: str, keys: Iterable[str]):
+        """Count one template's issues: one key per occurrence"""
+        for key, count in Counter(keys).items():
+            self.occurrences.add(key, count)
+            self.templates.add(key)
+            names = self.examples.get(key)
+            if names is None:
+                self.examples[key] = [template]
+            elif len(names) < self.max_examples:
+                names.append(template)
+        self.template_count += 1
+
+        # Once spilled, names are only kept for keys the summary still tracks
+        if not self.is_exact and len(self.examples) > 2 * self.templates.capacity:
+            tracked = self.templates.summary
+            self.examples = {key: names for key, names in self.examples.items() if key in tracked}
+
+    def top(self, k: int, by: str = 'templates') -> List[Tuple[str, int, int, List[str]]]:
+        """[(key, templates, occurrences, example templates)] for the k heaviest keys"""
+        ranking = self.templates if by == 'templates' else self.occurrences
+        return [
+            (key, self.templates.count(key), self.occurrences.count(key), self.examples.get(key, []))
+            for key, _ in ranking.top(k)
+        ]
+
+    def distinct(self) -> Optional[int]:
+        """Distinct issue keys, when still counted exactly"""
+        return len(self.templates.exact) if self.templates.is_exact else None
+
+    def note(self) -> str:
+        """A line to print under an approximate ranking; empty while exact"""
+        if self.is_exact:
+            return ''
+        return (f"  (approximate: more than {self.templates.exact_limit:,} distinct issues over "
+                f"{self.template_count:,} templates; counts are upper bounds)")
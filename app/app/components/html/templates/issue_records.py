@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Columnar issue records
+An issue is a row of small integers: its line number and ids into a string table shared by
+every table of one validator, so a variable, field, category or suggestion is stored once
+however many issues repeat it. Context snippets are not stored at all: they are rendered
+from the access kind, variable and property when a report asks for them. A pickled table
+carries only the strings its rows use, and is re-interned into the receiving validator's.
+"""
+
+import threading
+from array import array
+from typing import Dict, Iterator, List
+
+# How an access was written; the context snippet is rebuilt from this
+TEMPLATE_STRING = 'template string'
+PROPERTY_ACCESS = 'property access'
+KINDS = (TEMPLATE_STRING, PROPERTY_ACCESS)
+_KIND_IDS = {kind: i for i, kind in enumerate(KINDS)}
+
+
+def render_context(kind: str, variable: str, prop: str) -> str:
+    """The snippet the access was found in, as reports print it"""
+    if kind == TEMPLATE_STRING:
+        return f"{kind}: ${{{variable}.{prop}}}"
+    return f"{kind}: {variable}.{prop}"
+
+
+class StringTable:
+    """Interned strings by id; safe to share between threads"""
+
+    __slots__ = ('strings', 'ids', 'lock')
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.ids: Dict[str, int] = {}
+        # Only taken for new strings, which stop arriving once the vocabulary is seen
+        self.lock = threading.Lock()
+
+    def id(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            with self.lock:
+                string_id = self.ids.get(value)
+                if string_id is None:
+                    self.strings.append(value)
+                    string_id = self.ids[value] = len(self.strings) - 1
+        return string_id
+
+    def __getstate__(self):
+        return self.strings
+
+    def __setstate__(self, strings):
+        self.strings = strings
+        self.ids = {value: i for i, value in enumerate(strings)}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class IssueRecord:
+    """A read-only view of one row; made on demand while a report iterates"""
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: 'IssueTable', row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def line(self) -> int:
+        return self._table.lines[self._row]
+
+    @property
+    def variable(self) -> str:
+        return self._table.strings.strings[self._table.variables[self._row]]
+
+    @property
+    def prop(self) -> str:
+        return self._table.strings.strings[self._table.properties[self._row]]
+
+    @property
+    def kind(self) -> str:
+        return KINDS[self._table.kinds[self._row]]
+
+    @property
+    def category(self) -> str:
+        return self._table.strings.strings[self._table.categories[self._row]]
+
+    @property
+    def suggestion(self) -> str:
+        return self._table.strings.strings[self._table.suggestions[self._row]]
+
+    @property
+    def context(self) -> str:
+        return render_context(self.kind, self.variable, self.prop)
+
+    def to_dict(self) -> Dict:
+        return {
+            'line': self.line,
+            'variable': self.variable,
+            'property': self.prop,
+            'context': self.context,
+            'category': self.category,
+            'suggestion': self.suggestion,
+        }
+
+    def __repr__(self):
+        return f"IssueRecord(line={self.line}, {self.variable}.{self.prop})"
+
+
+class IssueTable:
+    """Issues of one template as parallel arrays"""
+
+    __slots__ = ('strings', 'lines', 'variables', 'properties', 'kinds', 'categories', 'suggestions')
+
+    def __init__(self, strings: StringTable):
+        self.strings = strings
+        self.lines = array('I')
+        self.variables = array('I')
+        self.properties = array('I')
+        self.kinds = array('B')
+        self.categories = array('I')
+        self.suggestions = array('I')
+
+    def append(self, line: int, variable: str, prop: str, kind: str, category: str, suggestion: str):
+        string_id = self.strings.id
+        self.lines.append(line)
+        self.variables.append(string_id(variable))
+        self.properties.append(string_id(prop))
+        self.kinds.append(_KIND_IDS[kind])
+        self.categories.append(string_id(category or ''))
+        self.suggestions.append(string_id(suggestion))
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __getitem__(self, row: int) -> IssueRecord:
+        if row < 0:
+            row += len(self.lines)
+        if not 0 <= row < len(self.lines):
+            raise IndexError(row)
+        return IssueRecord(self, row)
+
+    def __iter__(self) -> Iterator[IssueRecord]:
+        for row in range(len(self.lines)):
+            yield IssueRecord(self, row)
+
+    def keys(self) -> Iterator[str]:
+        """'variable.property' per issue, without building records"""
+        strings = self.strings.strings
+        for variable, prop in zip(self.variables, self.properties):
+            yield f"{strings[variable]}.{strings[prop]}"
+
+    def reintern(self, strings: StringTable) -> 'IssueTable':
+        """Move the rows onto another string table, such as the parent's after a pool worker"""
+        if strings is not self.strings:
+            ids = array('I', (strings.id(value) for value in self.strings.strings))
+            for name in ('variables', 'properties', 'categories', 'suggestions'):
+                setattr(self, name, array('I', (ids[string_id] for string_id in getattr(self, name))))
+            self.strings = strings
+        return self
+
+    def __getstate__(self):
+        # Only the strings these rows use travel with them, renumbered from 0, and the
+        # integer columns go as one buffer
+        columns = (self.variables, self.properties, self.categories, self.suggestions)
+        used = sorted(set().union(*columns))
+        local = {string_id: i for i, string_id in enumerate(used)}
+        packed = array('I', self.lines)
+        for column in columns:
+            packed.extend(local[string_id] for string_id in column)
+        return [self.strings.strings[string_id] for string_id in used], packed.tobytes(), self.kinds.tobytes()
+
+    def __setstate__(self, state):
+        vocabulary, packed, kinds = state
+        self.strings = StringTable()
+        self.strings.__setstate__(vocabulary)
+        self.kinds = array('B', kinds)
+        columns = array('I')
+        columns.frombytes(packed)
+        n = len(self.kinds)
+        self.lines, self.variables, self.properties, self.categories, self.suggestions = (
+            columns[i * n:(i + 1) * n] for i in range(5)
+        )
+
+    def nbytes(self) -> int:
+        """Bytes held by the columns (the shared string table is not counted)"""
+        return sum(column.itemsize * len(column) for column in
+                   (self.lines, self.variables, self.properties, self.kinds, self.categories, self.suggestions))
+
+    def to_dicts(self) -> List[Dict]:
+        return [record.to_dict() for record in self]
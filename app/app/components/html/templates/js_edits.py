@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Structural edits of template JavaScript
+Functions and blocks are located by brace matching over the JS token stream (see
+js_functions), so an edit can never run past the end of the function it targets.
+Every edit must resolve to exactly one span; anything else raises StructuralMatchError
+and leaves the content untouched.
+"""
+
+import re
+from bisect import bisect_left
+from typing import List, Pattern, Tuple, Union
+
+import js_functions
+from template_edits import apply_span_edits
+
+
+class StructuralMatchError(ValueError):
+    """Raised when a structural edit matches no span, or more than one"""
+
+
+def _compile(pattern: Union[str, Pattern]) -> Pattern:
+    return re.compile(pattern) if isinstance(pattern, str) else pattern
+
+
+def find_function(content: str, name: str) -> js_functions.JsFunction:
+    """The single top-level function with this name"""
+    matches = [f for f in js_functions.find_functions(content) if f.name == name]
+    if len(matches) != 1:
+        raise StructuralMatchError(f"expected one function {name}(), found {len(matches)}")
+    return matches[0]
+
+
+def find_blocks(content: str, header: Union[str, Pattern], start: int = 0,
+                end: int = None) -> List[Tuple[int, int, int]]:
+    """
+    (header_start, open_brace, close_brace) of every code-level block whose header matches
+    The header pattern must end at the block's opening brace, e.g. r'if \\(hasDetails\\) \\{'
+    """
+    header = _compile(header)
+    if end is None:
+        end = len(content)
+
+    blocks = []
+    for script_start, script_end in js_functions.script_spans(content):
+        lo, hi = max(start, script_start), min(end, script_end)
+        if lo >= hi:
+            continue
+
+        scan = js_functions.scan_js(content, script_start, script_end)
+        positions = [pos for pos, _ in scan.braces]
+
+        for match in header.finditer(content, lo, hi):
+            open_brace = match.end() - 1
+            if content[open_brace] != '{' or not scan.in_code(match.start()):
+                continue
+            k = bisect_left(positions, open_brace)
+            if k == len(positions) or positions[k] != open_brace:
+                continue
+
+            close_brace = _matching_brace(scan.braces, k)
+            if close_brace is not None and close_brace < hi:
+                blocks.append((match.start(), open_brace, close_brace))
+
+    return blocks
+
+
+def _matching_brace(braces: List[Tuple[int, str]], k: int):
+    depth = 0
+    for pos, ch in braces[k:]:
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return pos
+    return None
+
+
+def _single(spans: list, description: str):
+    if len(spans) != 1:
+        raise StructuralMatchError(f"expected one {description}, found {len(spans)}")
+    return spans[0]
+
+
+def replace_function(content: str, name: str, source: str) -> str:
+    """Replace the whole of function name with source"""
+    function = find_function(content, name)
+    return apply_span_edits(content, [(function.start, function.end, source)])
+
+
+def replace_function_head(content: str, name: str, marker: Union[str, Pattern], replacement: str) -> str:
+    """
+    Replace function name from its declaration up to the end of marker
+    marker must open a block directly in the function body (not nested), exactly once
+    """
+    function = find_function(content, name)
+    body_blocks = [
+        block for block in find_blocks(content, marker, function.body_start + 1, function.end - 1)
+        if _depth(content, function, block[0]) == 1
+    ]
+    _, open_brace, _ = _single(body_blocks, f"'{_compile(marker).pattern}' in {name}()")
+    return apply_span_edits(content, [(function.start, open_brace + 1, replacement)])
+
+
+def replace_block_tail(content: str, header: Union[str, Pattern], marker: Union[str, Pattern],
+                       replacement: str) -> str:
+    """
+    In the single block whose header matches and whose body contains marker, replace the
+    text from marker to the block's closing brace (inclusive) with replacement
+    """
+    marker = _compile(marker)
+    candidates = []
+    for header_start, open_brace, close_brace in find_blocks(content, header):
+        found = marker.search(content, open_brace + 1, close_brace)
+        if found:
+            candidates.append((found.start(), close_brace + 1))
+
+    start, end = _single(candidates, f"block '{_compile(header).pattern}' containing '{marker.pattern}'")
+    return apply_span_edits(content, [(start, end, replacement)])
+
+
+def _depth(content: str, function: js_functions.JsFunction, pos: int) -> int:
+    """Brace depth at pos relative to the function (1 = directly in its body)"""
+    scan = js_functions.scan_js(content, function.body_start, pos)
+    depth = 0
+    for _, ch in scan.braces:
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+    return depth
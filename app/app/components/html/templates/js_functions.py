@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Locate top-level JavaScript functions inside template <script> blocks
+Braces are matched over code only: strings, comments, regex literals and
+template literal text are skipped, so a '}' inside a string never ends a function
+"""
+
+import hashlib
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+SCRIPT_BLOCK = re.compile(r'<script\b[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+FUNCTION_DECLARATION = re.compile(r'\b(?:async\s+)?function\s+([A-Za-z_$][\w$]*)\s*\(')
+
+# Characters after which a '/' starts a regex literal rather than a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of')
+
+# Runs scan_js steps over without a decision per character
+BLANK_RUN = re.compile(r'[ \t\r\n]+')
+CODE_RUN = re.compile(r'[^ \t\r\n/\'"`{}()]+')
+TEMPLATE_TEXT_RUN = re.compile(r'[^\\`$]+')
+
+
+class JsScan:
+    """Structural scan of a JavaScript source range"""
+
+    def __init__(self, braces: List[Tuple[int, str]], comments: List[Tuple[int, int]],
+                 opaque: List[Tuple[int, int]]):
+        self.braces = braces        # (offset, char) for code-level {}()
+        self.comments = comments    # (start, end) of comments
+        self.opaque = opaque        # (start, end) of comments, strings, regex and template text
+        self._opaque_starts = [start for start, _ in opaque]
+
+    def in_code(self, pos: int) -> bool:
+        """True when pos is not inside a string, comment or template text"""
+        i = bisect_right(self._opaque_starts, pos) - 1
+        return i < 0 or pos >= self.opaque[i][1]
+
+
+def scan_js(content: str, start: int = 0, end: Optional[int] = None) -> JsScan:
+    """Scan content[start:end] once, recording code braces and non-code ranges"""
+    if end is None:
+        end = len(content)
+
+    braces = []
+    comments = []
+    opaque = []
+
+    # Stack of open template literals: each entry counts braces inside its current ${...}
+    templates = []
+    last_significant = ''
+    i = start
+
+    while i < end:
+        c = content[i]
+
+        # Inside template literal text
+        if templates and templates[-1] is None:
+            text_start = i
+            while i < end:
+                run = TEMPLATE_TEXT_RUN.match(content, i, end)
+                if run:
+                    i = run.end()
+                    continue
+                c = content[i]
+                if c == '\\':
+                    i += 2
+                    continue
+                if c == '`':
+                    templates.pop()
+                    i += 1
+                    break
+                if c == '$' and content.startswith('${', i):
+                    templates[-1] = 0
+                    i += 2
+                    break
+                i += 1
+            opaque.append((text_start, i))
+            last_significant = '`'
+            continue
+
+        if c in ' \t\r\n':
+            i = BLANK_RUN.match(content, i, end).end()
+            continue
+
+        run = CODE_RUN.match(content, i, end)
+        if run:
+            # Identifiers, numbers and operators: only the last one matters for regex detection
+            i = run.end()
+            last_significant = content[i - 1]
+            continue
+
+        if c == '/' and content.startswith('//', i):
+            stop = content.find('\n', i, end)
+            stop = end if stop == -1 else stop
+            comments.append((i, stop))
+            opaque.append((i, stop))
+            i = stop
+            continue
+
+        if c == '/' and content.startswith('/*', i):
+            stop = content.find('*/', i + 2, end)
+            stop = end if stop == -1 else stop + 2
+            comments.append((i, stop))
+            opaque.append((i, stop))
+            i = stop
+            continue
+
+        if c in '\'"':
+            stop = i + 1
+            while stop < end and content[stop] != c and content[stop] != '\n':
+                stop += 2 if content[stop] == '\\' else 1
+            stop = min(stop + 1, end)
+            opaque.append((i, stop))
+            i = stop
+            last_significant = c
+            continue
+
+        if c == '/' and _starts_regex(content, i, last_significant):
+            stop = i + 1
+            in_class = False
+            while stop < end and content[stop] != '\n':
+                ch = content[stop]
+                if ch == '\\':
+                    stop += 2
+                    continue
+                if ch == '[':
+                    in_class = True
+                elif ch == ']':
+                    in_class = False
+                elif ch == '/' and not in_class:
+                    break
+                stop += 1
+            stop = min(stop + 1, end)
+            opaque.append((i, stop))
+            i = stop
+            last_significant = '/'
+            continue
+
+        if c == '`':
+            templates.append(None)
+            i += 1
+            continue
+
+        if c == '{':
+            if templates:
+                templates[-1] += 1
+            braces.append((i, c))
+        elif c == '}':
+            if templates and templates[-1] == 0:
+                # End of a ${...} expression: back to template text
+                templates[-1] = None
+                i += 1
+                continue
+            if templates:
+                templates[-1] -= 1
+            braces.append((i, c))
+        elif c in '()':
+            braces.append((i, c))
+
+        last_significant = c
+        i += 1
+
+    return JsScan(braces, comments, opaque)
+
+
+def _starts_regex(content: str, pos: int, last_significant: str) -> bool:
+    """Heuristic: a '/' after an operator or keyword opens a regex literal"""
+    if not last_significant or last_significant in REGEX_PRECEDERS:
+        return True
+    if last_significant.isalpha():
+        line_start = content.rfind('\n', 0, pos) + 1
+        words = content[line_start:pos].split()
+        return bool(words) and words[-1] in REGEX_KEYWORDS
+    return False
+
+
+class JsFunction:
+    """A top-level function declaration and its source span"""
+
+    __slots__ = ('name', 'start', 'end', 'body_start', 'source')
+
+    def __init__(self, name: str, start: int, end: int, body_start: int, source: str):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.body_start = body_start
+        self.source = source
+
+    @property
+    def text(self) -> str:
+        return self.source[self.start:self.end]
+
+    def __repr__(self):
+        return f"JsFunction({self.name!r}, {self.start}-{self.end})"
+
+
+def script_spans(content: str) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the body of every <script> block"""
+    return [(m.start(1), m.end(1)) for m in SCRIPT_BLOCK.finditer(content)]
+
+
+def find_functions(content: str) -> List[JsFunction]:
+    """Find top-level function declarations in every <script> block"""
+    functions = []
+
+    for start, end in script_spans(content):
+        # The regex heuristic looks back to the start of the line, so the block is keyed from there
+        base = content.rfind('\n', 0, start) + 1
+        for name, fn_start, fn_end, body_start in _block_functions(content[base:end], start - base):
+            functions.append(JsFunction(name, base + fn_start, base + fn_end, base + body_start, content))
+
+    return functions
+
+
+@lru_cache(maxsize=128)
+def _block_functions(text: str, start: int) -> Tuple[Tuple[str, int, int, int], ...]:
+    """
+    (name, start, end, body_start) of the top-level functions in text[start:]
+    Memoized: a save usually leaves most script blocks of a template unchanged
+    """
+    functions = []
+    end = len(text)
+    scan = scan_js(text, start, end)
+    braces = scan.braces
+    positions = [pos for pos, _ in braces]
+
+    # Running brace depth before each structural character
+    depths = []
+    depth = 0
+    for _, ch in braces:
+        depths.append(depth)
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+
+    for match in FUNCTION_DECLARATION.finditer(text, start, end):
+        if not scan.in_code(match.start()):
+            continue
+
+        k = bisect_right(positions, match.start())
+        if k < len(depths) and depths[k] != 0:
+            continue
+        if k == len(depths) and depth != 0:
+            continue
+
+        span = _function_span(braces, k)
+        if span is None:
+            continue
+
+        body_start, body_end = span
+        functions.append((match.group(1), match.start(), body_end + 1, body_start))
+
+    return tuple(functions)
+
+
+def _function_span(braces: List[Tuple[int, str]], k: int) -> Optional[Tuple[int, int]]:
+    """From the parameter list at braces[k], find the body's opening and closing brace"""
+    parens = 0
+    body_start = None
+    depth = 0
+
+    for pos, ch in braces[k:]:
+        if body_start is None:
+            if ch == '(':
+                parens += 1
+            elif ch == ')':
+                parens -= 1
+            elif ch == '{' and parens == 0:
+                body_start = pos
+                depth = 1
+            continue
+
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return body_start, pos
+
+    return None
+
+
+def normalize_function(function: JsFunction) -> str:
+    """Function source with comments removed and whitespace collapsed"""
+    source = function.source
+    scan = scan_js(source, function.start, function.end)
+
+    pieces = []
+    cursor = function.start
+    for start, end in scan.comments:
+        pieces.append(source[cursor:start])
+        cursor = end
+    pieces.append(source[cursor:function.end])
+
+    return re.sub(r'\s+', ' ', ' '.join(pieces)).strip()
+
+
+def function_hash(function: JsFunction) -> str:
+    """Content hash of a function after whitespace normalization"""
+    return hashlib.sha1(normalize_function(function).encode('utf-8')).hexdigest()
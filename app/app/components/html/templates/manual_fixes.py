@@ -7,6 +7,10 @@ import re
 from pathlib import Path
 from typing import List, Tuple
 
+from git_changes import parse_changed_since
+from template_discovery import RESUME, find_templates, template_name
+from template_writes import write_if_changed
+
 def apply_replacements(content: str, replacements: List[Tuple[str, str]]) -> str:
     """Apply a list of find/replace operations"""
     for old_pattern, new_pattern in replacements:
@@ -130,6 +134,17 @@ def fix_job_fields(content: str) -> str:
 
     return apply_replacements(content, replacements)
 
+def fix_content(content: str) -> str:
+    """Apply all manual fixes to template content"""
+    content = fix_education_references(content)
+    content = fix_volunteering_fields(content)
+    content = fix_award_fields(content)
+    content = fix_project_fields(content)
+    content = fix_education_fields(content)
+    content = fix_personal_info_fields(content)
+    content = fix_job_fields(content)
+    return content
+
 def fix_template_file(filepath: Path) -> bool:
     """Apply all fixes to a template file"""
     try:
@@ -139,18 +154,11 @@ def fix_template_file(filepath: Path) -> bool:
         original_content = content
 
         # Apply all fixes
-        content = fix_education_references(content)
-        content = fix_volunteering_fields(content)
-        content = fix_award_fields(content)
-        content = fix_project_fields(content)
-        content = fix_education_fields(content)
-        content = fix_personal_info_fields(content)
-        content = fix_job_fields(content)
+        content = fix_content(content)
 
         # Only write if something changed
         if content != original_content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            write_if_changed(filepath, content)
             return True
 
         return False
@@ -162,18 +170,21 @@ def fix_template_file(filepath: Path) -> bool:
 def main():
     """Main execution"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
 
     fixed_count = 0
 
     print("Applying manual fixes to templates...\n")
 
     for html_file in html_files:
+        name = template_name(html_file, template_dir)
+
         if fix_template_file(html_file):
-            print(f"✓ Fixed {html_file.name}")
+            print(f"✓ Fixed {name}")
             fixed_count += 1
         else:
-            print(f"  {html_file.name} (no changes)")
+            print(f"  {name} (no changes)")
 
     print(f"\n✓ Applied fixes to {fixed_count} template(s)")
     print("\nRun validate_templates.py again to check remaining issues.")
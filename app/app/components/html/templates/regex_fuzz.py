@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Fuzz benchmark for guarded regex patterns
+Builds adversarial inputs for every pattern registered with regex_guard (openers without
+their closers, near-miss fragments, real templates) at growing sizes, times each pattern
+under its guard and reports those whose running time grows faster than the input.
+"""
+
+import argparse
+import importlib
+import math
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import regex_guard
+from template_discovery import find_templates
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+TEMPLATE_DIR = Path(__file__).parent
+
+SIZES = (4000, 8000, 16000, 32000, 64000)
+
+# Growth exponent above which a pattern is reported; 1.0 is linear, 2.0 quadratic
+SUPERLINEAR = 1.5
+
+# Below this, timings are mostly process overhead and say nothing about growth
+MIN_MEASURABLE = 0.005
+
+
+def load_registered_patterns():
+    """Import every script that registers guarded patterns"""
+    for path in sorted(TEMPLATE_DIR.glob('*.py')):
+        if path.stem in ('regex_guard', 'regex_fuzz'):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            if 'from regex_guard import' in f.read():
+                importlib.import_module(path.stem)
+
+
+def literal_runs(pattern: str, flags: int = 0) -> List[str]:
+    """Runs of literal text at the top level of a pattern, in order"""
+    runs = []
+    current = []
+    for op, arg in sre_parse.parse(pattern, flags):
+        if op is sre_parse.LITERAL:
+            current.append(chr(arg))
+            continue
+        if current:
+            runs.append(''.join(current))
+            current = []
+    if current:
+        runs.append(''.join(current))
+    return [run for run in runs if run.strip()]
+
+
+def adversarial_inputs(guarded: regex_guard.GuardedPattern, template: str) -> Dict[str, str]:
+    """Repeating units that drive a backtracking engine towards its worst case"""
+    runs = literal_runs(guarded.pattern, guarded.flags) or ['x']
+    inputs = {
+        # Every piece of the match except the last: each opener scans to the end and fails
+        'near-miss': ' x '.join(runs[:-1] or runs) + '\n',
+        # The opening literal alone, over and over
+        'opener flood': runs[0] + ' ',
+        # All pieces, but with the closing literal missing from every copy
+        'unclosed': ' '.join(runs[:-1]) + ' ' + runs[-1][:-1] + '\n' if len(runs[-1]) > 1 else runs[0] + '\n',
+    }
+    if template:
+        inputs['template'] = template
+    return inputs
+
+
+def _grow(unit: str, size: int) -> str:
+    return (unit * (size // max(1, len(unit)) + 1))[:size]
+
+
+def measure(guarded: regex_guard.GuardedPattern, unit: str) -> Tuple[List[Tuple[int, float]], bool]:
+    """[(size, seconds)] under the pattern's guard; True if the budget ran out"""
+    timings = []
+    for size in SIZES:
+        content = _grow(unit, size)
+        start = time.perf_counter()
+        finished, _ = regex_guard._runner.run(
+            (guarded.pattern, guarded.flags, 'spans', content, None), guarded.budget or regex_guard.DEFAULT_BUDGET
+        )
+        if not finished:
+            return timings, True
+        timings.append((size, time.perf_counter() - start))
+    return timings, False
+
+
+def growth_exponent(timings: List[Tuple[int, float]]) -> float:
+    """Slope of log(time) over log(size) across the measurable timings"""
+    points = [(math.log(size), math.log(seconds)) for size, seconds in timings if seconds >= MIN_MEASURABLE]
+    if len(points) < 2:
+        return 0.0
+    (x1, y1), (x2, y2) = points[0], points[-1]
+    return (y2 - y1) / (x2 - x1) if x2 != x1 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzz guarded regex patterns for super-linear behaviour')
+    parser.add_argument('patterns', nargs='*', default=['*'], help='pattern names (globs) to fuzz')
+    args = parser.parse_args()
+
+    load_registered_patterns()
+    templates = find_templates(TEMPLATE_DIR)
+    template = ''
+    if templates:
+        with open(max(templates, key=lambda p: p.stat().st_size), 'r', encoding='utf-8') as f:
+            template = f.read()
+
+    print("=" * 100)
+    print("REGEX FUZZ BENCHMARK")
+    print("=" * 100)
+    print()
+
+    flagged = []
+    for name, guarded in sorted(regex_guard.PATTERNS.items()):
+        if not any(fnmatch(name, pattern) for pattern in args.patterns):
+            continue
+
+        print(name)
+        worst = 0.0
+        for label, unit in adversarial_inputs(guarded, template).items():
+            timings, exceeded = measure(guarded, unit)
+            if exceeded:
+                largest = SIZES[len(timings)]
+                print(f"  {label:14} ❌ exceeded {guarded.budget:g}s budget at {largest:,} chars")
+                worst = math.inf
+                continue
+            exponent = growth_exponent(timings)
+            worst = max(worst, exponent)
+            print(f"  {label:14} {timings[-1][1] * 1000:>9.1f} ms at {timings[-1][0]:,} chars   growth ~n^{exponent:.2f}")
+
+        if worst > SUPERLINEAR:
+            flagged.append(name)
+        print()
+
+    print("=" * 100)
+    if flagged:
+        print(f"SUPER-LINEAR PATTERNS ({len(flagged)}):")
+        for name in flagged:
+            print(f"  ⚠️  {name}")
+    else:
+        print("✓ No super-linear patterns found")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
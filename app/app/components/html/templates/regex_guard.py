@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Regex execution guard
+Fixers register their heavy patterns here with a per-file time budget and a policy for
+when the budget runs out. Python's re cannot be interrupted, so a guarded pattern runs
+in a helper process that is killed once the budget expires; one pathological template
+then costs at most its budget instead of stalling the whole batch.
+"""
+
+import multiprocessing
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Policies when a pattern exceeds its budget
+ABORT = 'abort'          # raise RegexBudgetExceeded; callers report the file and move on
+FALLBACK = 'fallback'    # return the fallback's result (content unchanged if there is none)
+
+DEFAULT_BUDGET = 2.0
+
+PATTERNS: Dict[str, 'GuardedPattern'] = {}
+
+# Helpers come from a single-threaded fork server: forking a threaded caller such as the
+# validation daemon could copy a lock another thread holds (stdout, imports) into the helper
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    _context = multiprocessing.get_context('forkserver')
+    _context.set_forkserver_preload(['regex_guard'])
+else:
+    _context = multiprocessing.get_context()
+
+
+class RegexBudgetExceeded(TimeoutError):
+    """Raised when a guarded pattern runs past its budget under the abort policy"""
+
+    def __init__(self, name: str, budget: float):
+        super().__init__(f"pattern {name} exceeded its {budget:g}s budget")
+        self.name = name
+        self.budget = budget
+
+
+def _execute(pattern: str, flags: int, op: str, content: str, repl: Optional[str]):
+    compiled = re.compile(pattern, flags)
+    if op == 'sub':
+        return compiled.sub(repl, content)
+    if op == 'spans':
+        return [(m.start(), m.end()) for m in compiled.finditer(content)]
+    match = compiled.search(content)
+    return None if match is None else (match.start(), match.end())
+
+
+def _serve(conn):
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, _execute(*request)))
+        except Exception as e:
+            conn.send((False, e))
+
+
+class _Runner:
+    """A single helper process, replaced whenever a pattern has to be killed"""
+
+    def __init__(self):
+        self.process = None
+        self.conn = None
+        # One request at a time on the pipe, whichever thread sends it
+        self.lock = threading.Lock()
+
+    def _start(self):
+        parent, child = _context.Pipe()
+        self.process = _context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+
+    def stop(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def run(self, request: tuple, budget: float) -> Tuple[bool, object]:
+        """(finished, result); finished is False when the budget ran out"""
+        with self.lock:
+            if self.process is None or not self.process.is_alive():
+                self._start()
+
+            self.conn.send(request)
+            if not self.conn.poll(budget):
+                self.stop()
+                return False, None
+
+            ok, result = self.conn.recv()
+        if not ok:
+            raise result
+        return True, result
+
+
+_runner = _Runner()
+
+
+def _forget_helper():
+    # A forked worker (a fixer process pool) must start its own helper, not drive the parent's.
+    # Its copy of the fork server connection belongs to the parent too; pool workers are
+    # single-threaded, so they fork their helper directly
+    global _context
+    _context = multiprocessing.get_context('fork')
+    if _runner.conn is not None:
+        _runner.conn.close()
+    _runner.process = None
+    _runner.conn = None
+    _runner.lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_helper)
+
+
+def warm_up():
+    """Start the helper process now rather than on the first guarded match"""
+    with _runner.lock:
+        if _runner.process is None or not _runner.process.is_alive():
+            _runner._start()
+
+
+class GuardedPattern:
+    """A registered pattern with its budget and timeout policy"""
+
+    def __init__(self, name: str, pattern: str, flags: int = 0, budget: Optional[float] = DEFAULT_BUDGET,
+                 policy: str = ABORT, fallback: Optional[Callable] = None):
+        if policy not in (ABORT, FALLBACK):
+            raise ValueError(f"unknown policy {policy!r}")
+        self.name = name
+        self.pattern = pattern
+        self.flags = flags
+        self.budget = budget
+        self.policy = policy
+        self.fallback = fallback
+        self.compiled = re.compile(pattern, flags)
+
+    def __repr__(self):
+        return f"GuardedPattern({self.name!r}, budget={self.budget}, policy={self.policy!r})"
+
+    def _run(self, op: str, content: str, repl: Optional[str] = None):
+        if self.budget is None:
+            return True, _execute(self.pattern, self.flags, op, content, repl)
+        return _runner.run((self.pattern, self.flags, op, content, repl), self.budget)
+
+    def _timed_out(self, content: str, default):
+        if self.policy == ABORT:
+            raise RegexBudgetExceeded(self.name, self.budget)
+        if self.fallback is not None:
+            return self.fallback(content)
+        return default
+
+    def sub(self, repl: str, content: str) -> str:
+        """re.sub with a string replacement"""
+        finished, result = self._run('sub', content, repl)
+        return result if finished else self._timed_out(content, content)
+
+    def spans(self, content: str) -> List[Tuple[int, int]]:
+        """(start, end) of every match"""
+        finished, result = self._run('spans', content)
+        return result if finished else self._timed_out(content, [])
+
+    def search(self, content: str) -> Optional[Tuple[int, int]]:
+        """(start, end) of the first match, or None"""
+        finished, result = self._run('search', content)
+        return result if finished else self._timed_out(content, None)
+
+
+def register(name: str, pattern: str, flags: int = 0, budget: Optional[float] = DEFAULT_BUDGET,
+             policy: str = ABORT, fallback: Optional[Callable] = None) -> GuardedPattern:
+    """Register a pattern under a unique name (module.purpose) and return its guard"""
+    guarded = GuardedPattern(name, pattern, flags, budget, policy, fallback)
+    PATTERNS[name] = guarded
+    return guarded
+
@@ -7,34 +7,80 @@ to prevent duplicates with websitesAndSocialLinks
 import re
 from pathlib import Path
 
-def remove_old_contact_displays(content):
-    """Remove old website and socialLinks display code"""
+from git_changes import parse_changed_since, select_changed_templates
+from regex_guard import register
+from template_writes import write_if_changed
 
+# Old contact displays; DOTALL with stacked lazy quantifiers, so they run guarded
+OLD_CONTACT_PATTERNS = [
     # Pattern 1: Remove if (personal.website) { html += ... } blocks
     # This matches the entire if block for website
-    pattern1 = r'\s+if \(personal\.website\) \{[^}]*?html \+= `[^`]*?personal\.website[^`]*?`;[^}]*?\}\s*'
-    content = re.sub(pattern1, '\n\n      // Old website field removed - using websitesAndSocialLinks\n\n', content, flags=re.DOTALL)
+    (register('remove_old_contact_fields.website_block',
+              r'\s+if \(personal\.website\) \{[^}]*?html \+= `[^`]*?personal\.website[^`]*?`;[^}]*?\}\s*', re.DOTALL),
+     '\n\n      // Old website field removed - using websitesAndSocialLinks\n\n'),
 
     # Pattern 2: Remove if (personal.socialLinks && personal.socialLinks.linkedin) blocks
-    pattern2 = r'\s+if \(personal\.socialLinks && personal\.socialLinks\.linkedin\) \{[^}]*?html \+= `[^`]*?socialLinks\.linkedin[^`]*?`;[^}]*?\}\s*'
-    content = re.sub(pattern2, '', content, flags=re.DOTALL)
+    (register('remove_old_contact_fields.linkedin_block',
+              r'\s+if \(personal\.socialLinks && personal\.socialLinks\.linkedin\) \{[^}]*?html \+= `[^`]*?socialLinks\.linkedin[^`]*?`;[^}]*?\}\s*', re.DOTALL),
+     ''),
 
     # Pattern 3: Remove if (personal.socialLinks && personal.socialLinks.github) blocks
-    pattern3 = r'\s+if \(personal\.socialLinks && personal\.socialLinks\.github\) \{[^}]*?html \+= `[^`]*?socialLinks\.github[^`]*?`;[^}]*?\}\s*'
-    content = re.sub(pattern3, '', content, flags=re.DOTALL)
+    (register('remove_old_contact_fields.github_block',
+              r'\s+if \(personal\.socialLinks && personal\.socialLinks\.github\) \{[^}]*?html \+= `[^`]*?socialLinks\.github[^`]*?`;[^}]*?\}\s*', re.DOTALL),
+     ''),
 
     # Pattern 4: Remove if (personal.socialLinks && personal.socialLinks.twitter) blocks
-    pattern4 = r'\s+if \(personal\.socialLinks && personal\.socialLinks\.twitter\) \{[^}]*?html \+= `[^`]*?socialLinks\.twitter[^`]*?`;[^}]*?\}\s*'
-    content = re.sub(pattern4, '', content, flags=re.DOTALL)
+    (register('remove_old_contact_fields.twitter_block',
+              r'\s+if \(personal\.socialLinks && personal\.socialLinks\.twitter\) \{[^}]*?html \+= `[^`]*?socialLinks\.twitter[^`]*?`;[^}]*?\}\s*', re.DOTALL),
+     ''),
 
     # Pattern 5: Remove if (personal.socialLinks?.linkedin) blocks (optional chaining)
-    pattern5 = r'\s+if \(personal\.socialLinks\?\.linkedin\) \{[^}]*?socialLinks\.linkedin[^}]*?\}\s*'
-    content = re.sub(pattern5, '', content, flags=re.DOTALL)
+    (register('remove_old_contact_fields.linkedin_optional_block',
+              r'\s+if \(personal\.socialLinks\?\.linkedin\) \{[^}]*?socialLinks\.linkedin[^}]*?\}\s*', re.DOTALL),
+     ''),
 
     # Pattern 6: Handle inline displays like personal.website in template
     # Look for standalone website references in contact sections
-    pattern6 = r'<p[^>]*>\s*<strong>Website:</strong>.*?\$\{personal\.website[^<]*</p>'
-    content = re.sub(pattern6, '<!-- Website moved to websitesAndSocialLinks -->', content)
+    (register('remove_old_contact_fields.website_paragraph',
+              r'<p[^>]*>\s*<strong>Website:</strong>.*?\$\{personal\.website[^<]*</p>'),
+     '<!-- Website moved to websitesAndSocialLinks -->'),
+]
+
+# All templates with duplicates (excluding BlueAccent which we already fixed manually)
+TEMPLATES = (
+    'Aurora.html',
+    'Balance.html',
+    'Beige.html',
+    # 'BlueAccent.html',  # Already fixed manually
+    'BrightPath.html',
+    'Clarity.html',
+    'CleanGradient.html',
+    'DiamondFlow.html',
+    'Elegance.html',
+    'ElegantWatermark.html',
+    'Epure.html',
+    'Focus.html',
+    'GradientSidebar.html',
+    'Gridline.html',
+    'Midnight.html',
+    'MidnightBlue.html',
+    'MinimalistFlow.html',
+    'ModernEdge.html',
+    'Mono.html',
+    'ProfessionalBlock.html',
+    'Sapphire.html',
+    'modern.html',
+    'pastel.html',
+)
+
+def applies_to(template: str) -> bool:
+    """Whether remove_old_contact_displays is meant for this template"""
+    return template in TEMPLATES
+
+def remove_old_contact_displays(content):
+    """Remove old website and socialLinks display code"""
+    for pattern, replacement in OLD_CONTACT_PATTERNS:
+        content = pattern.sub(replacement, content)
 
     return content
 
@@ -50,8 +96,7 @@ def process_template(filepath):
 
     # Only write if changed
     if content != original:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_if_changed(filepath, content)
         return True
 
     return False
@@ -59,33 +104,9 @@ def process_template(filepath):
 def main():
     """Fix all templates"""
     template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
 
-    # All templates with duplicates (excluding BlueAccent which we already fixed manually)
-    templates_to_fix = [
-        'Aurora.html',
-        'Balance.html',
-        'Beige.html',
-        # 'BlueAccent.html',  # Already fixed manually
-        'BrightPath.html',
-        'Clarity.html',
-        'CleanGradient.html',
-        'DiamondFlow.html',
-        'Elegance.html',
-        'ElegantWatermark.html',
-        'Epure.html',
-        'Focus.html',
-        'GradientSidebar.html',
-        'Gridline.html',
-        'Midnight.html',
-        'MidnightBlue.html',
-        'MinimalistFlow.html',
-        'ModernEdge.html',
-        'Mono.html',
-        'ProfessionalBlock.html',
-        'Sapphire.html',
-        'modern.html',
-        'pastel.html',
-    ]
+    templates_to_fix = list(TEMPLATES)
 
     print("=" * 100)
     print("REMOVING OLD CONTACT FIELD DISPLAYS")
@@ -102,6 +123,10 @@ def main():
 
     fixed_count = 0
 
+    if changed_since:
+        selected = select_changed_templates([template_dir / name for name in templates_to_fix], changed_since, template_dir)
+        templates_to_fix = [path.name for path in selected]
+
     for filename in templates_to_fix:
         filepath = template_dir / filename
 
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Compiled resume content validator
+Turns a JSON Schema for resume `content` into specialised Python source, one straight-line
+function with the property lookups, type checks and loops unrolled (the fastjsonschema
+approach), instead of walking the schema for every document. Generated modules are cached
+in .cache/validators/ keyed by the schema hash.
+
+The schema is resume.schema.json, which declares the required and nullable fields; the
+template validators take their field lists from it too. The inferred schema (resume.json
+merged with the saved corpus schema) can only widen the types a declared field accepts,
+never add or drop a required field. --schema takes another JSON Schema file instead.
+
+Usage:
+    python resume_validator.py                        # validate resume.json
+    python resume_validator.py resumes.jsonl          # validate a corpus
+    python resume_validator.py --benchmark 20000      # compiled vs interpretive throughput
+    python resume_validator.py --dump-schema          # print the JSON Schema
+"""
+
+import argparse
+import copy
+import hashlib
+import importlib.util
+import json
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from schema_inference import (RESUME_JSON, RESUME_SCHEMA, Schema, declared_nodes, load_json_schema, load_resumes,
+                              node_types, resume_schema)
+from template_writes import write_if_changed
+
+TEMPLATE_DIR = Path(__file__).parent
+CACHE_DIR = TEMPLATE_DIR / '.cache' / 'validators'
+
+# Bump when the generated code changes shape
+COMPILER_VERSION = 2
+
+# json.loads only produces these exact types, so type() identity replaces isinstance
+# (and keeps bool out of integer and number)
+PYTHON_TYPES = {
+    'string': ('str',),
+    'number': ('int', 'float'),
+    'integer': ('int',),
+    'boolean': ('bool',),
+    'null': ('NoneType',),
+    'array': ('list',),
+    'object': ('dict',),
+}
+
+# A value of each type, used as the .get() default when only the type is checked
+TYPE_DEFAULTS = {'str': "''", 'int': '0', 'float': '0.0', 'bool': 'False', 'NoneType': 'None',
+                 'list': 'EMPTY_LIST', 'dict': 'EMPTY_DICT'}
+
+
+class ResumeValidationError(ValueError):
+    """Raised by validators for the first violation found; path locates it in the document"""
+
+    def __init__(self, message: str, path: str = 'data'):
+        super().__init__(f"{path} {message}")
+        self.path = path
+
+
+def widen(json_schema: Dict, schema: Schema) -> Dict:
+    """
+    json_schema with every declared field also accepting the types schema observed there;
+    required fields and undeclared fields are left as they are
+    """
+    widened = copy.deepcopy(json_schema)
+    for path, node in declared_nodes(widened):
+        stats = schema.paths.get(path)
+        if stats is None:
+            continue
+        types = node_types(node)
+        if types and not set(stats.types) <= types:
+            node['type'] = sorted(types | set(stats.types))
+        items = node.get('items')
+        if items is not None and node_types(items) and not set(stats.item_types) <= node_types(items):
+            items['type'] = sorted(node_types(items) | set(stats.item_types))
+    return widened
+
+
+def default_schema(schema_path: Path = RESUME_SCHEMA) -> Dict:
+    return widen(load_json_schema(schema_path), resume_schema(schema_path=schema_path))
+
+
+def _check_type(node: Dict, value, path: str):
+    types = node.get('type')
+    if types is None:
+        return
+    if isinstance(types, str):
+        types = [types]
+    for kind in types:
+        if kind == 'string' and isinstance(value, str):
+            return
+        if kind in ('number', 'integer') and isinstance(value, (int, float)) and not isinstance(value, bool):
+            if kind == 'number' or isinstance(value, int):
+                return
+        if kind == 'boolean' and isinstance(value, bool):
+            return
+        if kind == 'null' and value is None:
+            return
+        if kind == 'array' and isinstance(value, list):
+            return
+        if kind == 'object' and isinstance(value, dict):
+            return
+    raise ResumeValidationError(f"must be {' or '.join(types)}", path)
+
+
+def validate_generic(node: Dict, value, path: str = 'data'):
+    """Reference validator: walks the schema for every value"""
+    _check_type(node, value, path)
+    if 'enum' in node and value not in node['enum']:
+        raise ResumeValidationError(f"must be one of {node['enum']}", path)
+    if isinstance(value, str):
+        if 'minLength' in node and len(value) < node['minLength']:
+            raise ResumeValidationError(f"must be at least {node['minLength']} characters", path)
+        if 'maxLength' in node and len(value) > node['maxLength']:
+            raise ResumeValidationError(f"must be at most {node['maxLength']} characters", path)
+        if 'pattern' in node and not re.search(node['pattern'], value):
+            raise ResumeValidationError(f"must match {node['pattern']}", path)
+    if isinstance(value, dict):
+        for key in node.get('required', []):
+            if key not in value:
+                raise ResumeValidationError(f"must contain {key}", path)
+        properties = node.get('properties', {})
+        for key, item in value.items():
+            if key in properties:
+                validate_generic(properties[key], item, f"{path}.{key}")
+            elif node.get('additionalProperties') is False:
+                raise ResumeValidationError(f"must not contain {key}", path)
+    if isinstance(value, list):
+        if 'minItems' in node and len(value) < node['minItems']:
+            raise ResumeValidationError(f"must have at least {node['minItems']} items", path)
+        if 'maxItems' in node and len(value) > node['maxItems']:
+            raise ResumeValidationError(f"must have at most {node['maxItems']} items", path)
+        if 'items' in node:
+            for i, item in enumerate(value):
+                validate_generic(node['items'], item, f"{path}[{i}]")
+    return value
+
+
+class _Index:
+    """A loop index in an error path, as the source expression that computes it"""
+
+    __slots__ = ('expr',)
+
+    def __init__(self, expr: str):
+        self.expr = expr
+
+
+class _CodeGenerator:
+    """Emits the body of validate(data) for one schema"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.counter = 0
+        self.patterns: List[str] = []
+
+    def name(self, hint: str) -> str:
+        self.counter += 1
+        return f"{re.sub(r'[^0-9a-zA-Z_]', '_', hint)[:24]}_{self.counter}"
+
+    def emit(self, indent: int, line: str):
+        self.lines.append('    ' * indent + line)
+
+    def raise_(self, indent: int, message: str, path: List[str]):
+        self.emit(indent, f"raise ResumeValidationError({message!r}, {_path_expr(path)})")
+
+    def block(self, indent: int, headers: List[str], body: Callable[[int], None]):
+        """Emit headers (nested one level each) and body; drop them all if body emitted nothing"""
+        mark = len(self.lines)
+        for depth, header in enumerate(headers):
+            self.emit(indent + depth, header)
+        before = len(self.lines)
+        body(indent + len(headers))
+        if len(self.lines) == before:
+            del self.lines[mark:]
+
+    def generate(self, node: Dict, var: str, path: List[str], indent: int):
+        types = node.get('type')
+        if isinstance(types, str):
+            types = [types]
+
+        if types:
+            python_types = sorted({t for kind in types for t in PYTHON_TYPES[kind]})
+            if len(python_types) == 1:
+                self.emit(indent, f"if type({var}) is not {python_types[0]}:")
+            else:
+                self.emit(indent, f"if type({var}) not in ({', '.join(python_types)}):")
+            self.raise_(indent + 1, f"must be {' or '.join(types)}", path)
+
+        if 'enum' in node:
+            self.emit(indent, f"if {var} not in {tuple(node['enum'])!r}:")
+            self.raise_(indent + 1, f"must be one of {node['enum']}", path)
+
+        def guard(kind: str, python_type: str) -> List[str]:
+            # Type already enforced as exactly this kind: no isinstance test needed
+            return [] if types == [kind] else [f"if isinstance({var}, {python_type}):"]
+
+        self.block(indent, guard('string', 'str'), lambda i: self._string(node, var, path, i))
+        self.block(indent, guard('object', 'dict'), lambda i: self._object(node, var, path, i))
+        self.block(indent, guard('array', 'list'), lambda i: self._array(node, var, path, i))
+
+    def _string(self, node: Dict, var: str, path: List[str], indent: int):
+        if 'minLength' in node:
+            self.emit(indent, f"if len({var}) < {node['minLength']}:")
+            self.raise_(indent + 1, f"must be at least {node['minLength']} characters", path)
+        if 'maxLength' in node:
+            self.emit(indent, f"if len({var}) > {node['maxLength']}:")
+            self.raise_(indent + 1, f"must be at most {node['maxLength']} characters", path)
+        if 'pattern' in node:
+            self.patterns.append(node['pattern'])
+            self.emit(indent, f"if not PATTERNS[{len(self.patterns) - 1}].search({var}):")
+            self.raise_(indent + 1, f"must match {node['pattern']}", path)
+
+    def _object(self, node: Dict, var: str, path: List[str], indent: int):
+        for key in node.get('required', []):
+            self.emit(indent, f"if {key!r} not in {var}:")
+            self.raise_(indent + 1, f"must contain {key}", path)
+        properties = node.get('properties', {})
+        if node.get('additionalProperties') is False:
+            self.emit(indent, f"for key in {var}:")
+            self.emit(indent + 1, f"if key not in {tuple(properties)!r}:")
+            self.emit(indent + 2, f"raise ResumeValidationError('must not contain ' + key, {_path_expr(path)})")
+        for key, child in properties.items():
+            self._property(key, child, var, path, indent)
+
+    def _property(self, key: str, child: Dict, var: str, path: List[str], indent: int):
+        types = child.get('type')
+        if isinstance(types, str):
+            types = [types]
+        if types and set(child) == {'type'}:
+            # Leaf: a default of an allowed type makes an absent key pass the same test
+            python_types = sorted({t for kind in types for t in PYTHON_TYPES[kind]})
+            lookup = f"type({var}.get({key!r}, {TYPE_DEFAULTS[python_types[0]]}))"
+            if len(python_types) == 1:
+                self.emit(indent, f"if {lookup} is not {python_types[0]}:")
+            else:
+                self.emit(indent, f"if {lookup} not in ({', '.join(python_types)}):")
+            self.raise_(indent + 1, f"must be {' or '.join(types)}", path + [f".{key}"])
+            return
+
+        child_var = self.name(key)
+        mark = len(self.lines)
+        # One dict lookup per property: MISSING marks an absent key
+        self.emit(indent, f"{child_var} = {var}.get({key!r}, MISSING)")
+        self.emit(indent, f"if {child_var} is not MISSING:")
+        before = len(self.lines)
+        self.generate(child, child_var, path + [f".{key}"], indent + 1)
+        if len(self.lines) == before:
+            del self.lines[mark:]
+
+    def _array(self, node: Dict, var: str, path: List[str], indent: int):
+        if 'minItems' in node:
+            self.emit(indent, f"if len({var}) < {node['minItems']}:")
+            self.raise_(indent + 1, f"must have at least {node['minItems']} items", path)
+        if 'maxItems' in node:
+            self.emit(indent, f"if len({var}) > {node['maxItems']}:")
+            self.raise_(indent + 1, f"must have at most {node['maxItems']} items", path)
+        if 'items' in node:
+            item = self.name('item')
+            # No enumerate(): the index is looked up only when an error is raised. index()
+            # finds the first equal item, which fails the same way
+            self.block(indent, [f"for {item} in {var}:"],
+                       lambda i: self.generate(node['items'], item, path + [_Index(f"{var}.index({item})")], i))
+
+
+def _path_expr(path: List) -> str:
+    """
+    Source for the error path: the static text as string literals, loop indices added at run time
+    Keys come from corpus resumes, so they only ever appear repr'd, never inside an f-string
+    """
+    pieces = []
+    text = 'data'
+    for part in path:
+        if isinstance(part, _Index):
+            pieces += [repr(text + '['), f"str({part.expr})"]
+            text = ']'
+        else:
+            text += part
+    pieces.append(repr(text))
+    return ' + '.join(pieces)
+
+
+def generate_source(schema: Dict) -> str:
+    """Python source of a module defining validate(data) for schema"""
+    generator = _CodeGenerator()
+    generator.generate(schema, 'data', [], 1)
+    body = generator.lines or ['    pass']
+    header = [
+        f"# Generated by resume_validator.py (compiler v{COMPILER_VERSION}); do not edit",
+        "import re",
+        "",
+        "NoneType = type(None)",
+        "MISSING = object()",
+        "EMPTY_LIST = []",
+        "EMPTY_DICT = {}",
+        f"PATTERNS = [{', '.join(f're.compile({p!r})' for p in generator.patterns)}]",
+        "",
+        "",
+        "def validate(data):",
+    ]
+    return '\n'.join(header + body + ['    return data', ''])
+
+
+def schema_key(schema: Dict) -> str:
+    canonical = json.dumps(schema, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(f"v{COMPILER_VERSION}:{canonical}".encode('utf-8')).hexdigest()
+
+
+_compiled: Dict[str, Callable] = {}
+
+
+def compile_validator(schema: Dict, cache_dir: Path = CACHE_DIR) -> Callable:
+    """validate(data) for schema, generated once per schema and reused from disk afterwards"""
+    key = schema_key(schema)
+    if key in _compiled:
+        return _compiled[key]
+
+    path = Path(cache_dir) / f"resume_{key[:16]}.py"
+    if not path.exists():
+        write_if_changed(path, generate_source(schema))
+
+    # Imported as a module so Python keeps its bytecode in __pycache__ as well
+    spec = importlib.util.spec_from_file_location(f"_resume_validator_{key[:16]}", path)
+    module = importlib.util.module_from_spec(spec)
+    module.ResumeValidationError = ResumeValidationError
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        # Never leave a module behind that every later run would load again
+        path.unlink(missing_ok=True)
+        raise
+
+    _compiled[key] = module.validate
+    return module.validate
+
+
+def benchmark(schema: Dict, document: dict, rounds: int, repeat: int = 3) -> Dict[str, float]:
+    """Documents per second for the interpretive and the compiled validator, best of repeat runs"""
+    validate = compile_validator(schema)
+    results = {}
+    for label, func in (('interpretive', lambda d: validate_generic(schema, d)), ('compiled', validate)):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                func(document)
+            best = min(best, time.perf_counter() - start)
+        results[label] = rounds / best
+    return results
+
+
+# Keys a corpus resume could carry that must stay inert in generated source
+HOSTILE_KEYS = (
+    "x{__import__('os').getpid()}y",
+    "}",
+    "{",
+    "a'b\"c",
+    "\\",
+    "line\nbreak",
+    "{{data}}",
+)
+
+
+def self_check(cache_dir: Path) -> List[str]:
+    """
+    Compile validators for schemas keyed by HOSTILE_KEYS and compare their errors with the
+    interpretive validator on documents failing under an array item; returns the mismatches
+    """
+    failures = []
+    for key in HOSTILE_KEYS:
+        schema = {'type': 'object', 'properties': {'items': {'type': 'array', 'items': {
+            'type': 'object', 'properties': {key: {'type': 'string'}},
+        }}}}
+        document = {'items': [{key: 'ok'}, {key: 1}]}
+        try:
+            validate = compile_validator(schema, cache_dir)
+        except SyntaxError as e:
+            failures.append(f"{key!r}: generated source does not compile ({e})")
+            continue
+
+        errors = []
+        for func in (validate, lambda d: validate_generic(schema, d)):
+            try:
+                func(document)
+                errors.append(None)
+            except ResumeValidationError as e:
+                errors.append((str(e), e.path))
+        if errors[0] != errors[1] or errors[0] is None:
+            failures.append(f"{key!r}: compiled {errors[0]} != interpretive {errors[1]}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate resume content with a compiled validator')
+    parser.add_argument('resumes', nargs='?', default=str(RESUME_JSON),
+                        help='resume.json or a JSONL corpus of resumes (default: resume.json)')
+    parser.add_argument('--schema', help='JSON Schema file for resume content (default: resume.schema.json, widened)')
+    parser.add_argument('--dump-schema', action='store_true', help='print the JSON Schema and exit')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='time N validations of the first resume')
+    parser.add_argument('--self-check', action='store_true',
+                        help='check that hostile field names stay inert in generated validators')
+    args = parser.parse_args()
+
+    if args.self_check:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            failures = self_check(Path(cache_dir))
+        for failure in failures:
+            print(f"❌ {failure}")
+        print(f"{'❌' if failures else '✓'} {len(HOSTILE_KEYS) - len(failures)}/{len(HOSTILE_KEYS)} hostile keys handled")
+        return 1 if failures else 0
+
+    if args.schema:
+        with open(args.schema, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+    else:
+        schema = default_schema()
+
+    if args.dump_schema:
+        print(json.dumps(schema, indent=2))
+        return
+
+    print("=" * 100)
+    print("RESUME CONTENT VALIDATION")
+    print("=" * 100)
+    print()
+
+    validate = compile_validator(schema)
+
+    if args.benchmark:
+        document = next(load_resumes(Path(args.resumes)))
+        rates = benchmark(schema, document, args.benchmark)
+        print(f"Interpretive: {rates['interpretive']:>12,.0f} documents/s")
+        print(f"Compiled:     {rates['compiled']:>12,.0f} documents/s   ({rates['compiled'] / rates['interpretive']:.1f}x)")
+        print("=" * 100)
+        return
+
+    total = 0
+    invalid = 0
+    for i, content in enumerate(load_resumes(Path(args.resumes)), 1):
+        total += 1
+        try:
+            validate(content)
+        except ResumeValidationError as e:
+            invalid += 1
+            if invalid <= 20:
+                print(f"❌ resume {i}: {e}")
+
+    print()
+    print("=" * 100)
+    print(f"SUMMARY: {invalid}/{total} resume(s) invalid")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Runtime field-access validator
+Runs each template's inline <script> in a JavaScript engine against a stub DOM, with
+fetch('resume.json') answering a resume wrapped in a recording Proxy, and reports every
+property read that resolves to undefined. Unlike the static checkers this sees dynamic
+accesses (obj[key]) and ignores code that never runs.
+
+Requires Node.js (node on PATH). A pool of warm engines is kept, each caching compiled
+template scripts, so a corpus of resumes can be swept across every template.
+
+Usage:
+    python runtime_validator.py                      # resume.json against every template
+    python runtime_validator.py resumes.jsonl -j 8   # a corpus, 8 engines
+"""
+
+import argparse
+import hashlib
+import json
+import queue
+import shutil
+import subprocess
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from js_functions import SCRIPT_BLOCK
+from schema_inference import load_resumes
+from template_discovery import RESUME, find_templates, template_name
+
+TEMPLATE_DIR = Path(__file__).parent
+
+# Seconds one template may run against one resume
+RUN_TIMEOUT = 5.0
+
+# Runs inside node: one JSON request per stdin line, one JSON result per stdout line
+HARNESS = r"""
+const vm = require('vm');
+const readline = require('readline');
+
+// Reads that are protocol probes, not field accesses
+const IGNORED = new Set(['then', 'toJSON', 'constructor', 'valueOf', 'toString', 'inspect']);
+const compiled = new Map();
+
+function track(value, path, reads) {
+  if (value === null || typeof value !== 'object') return value;
+  return new Proxy(value, {
+    get(target, prop, receiver) {
+      const result = Reflect.get(target, prop, receiver);
+      if (typeof prop === 'symbol') return result;
+      if (Array.isArray(target) && /^\d+$/.test(prop)) return track(result, path, reads);
+      const childPath = path ? path + '.' + prop : prop;
+      if (!(prop in target)) {
+        if (!IGNORED.has(prop)) reads[childPath] = (reads[childPath] || 0) + 1;
+        return undefined;
+      }
+      return typeof result === 'function' ? result : track(result, childPath, reads);
+    }
+  });
+}
+
+const TEXT_PROPS = new Set(['innerHTML', 'textContent', 'innerText', 'value', 'className', 'src', 'href', 'id']);
+const LIST_METHODS = new Set(['querySelectorAll', 'getElementsByClassName', 'getElementsByTagName']);
+
+function stub(listeners) {
+  const store = {};
+  return new Proxy(function () {}, {
+    get(target, prop) {
+      if (prop === Symbol.iterator) return function* () {};
+      if (prop === Symbol.toPrimitive) return () => '';
+      if (typeof prop === 'symbol' || prop === 'then') return undefined;
+      if (prop in store) return store[prop];
+      if (TEXT_PROPS.has(prop)) return '';
+      if (prop === 'length') return 0;
+      if (prop === 'children' || prop === 'childNodes') return [];
+      if (LIST_METHODS.has(prop)) return () => [];
+      if (prop === 'addEventListener') return (type, cb) => listeners.push([type, cb]);
+      return stub(listeners);
+    },
+    set(target, prop, value) { store[prop] = value; return true; },
+    apply() { return stub(listeners); }
+  });
+}
+
+async function run(request) {
+  const reads = {};
+  const errors = [];
+  const listeners = [];
+  const timers = [];
+
+  let scripts = compiled.get(request.key);
+  if (!scripts) {
+    scripts = request.scripts.map((code, i) => new vm.Script(code, { filename: `script${i}.js` }));
+    compiled.set(request.key, scripts);
+  }
+
+  const resume = track(request.resume, '', reads);
+  const document = stub(listeners);
+  const sandbox = {
+    document,
+    console: { log() {}, warn() {}, info() {}, error: (...args) => errors.push(args.map(String).join(' ')) },
+    fetch: async () => ({ ok: true, json: async () => ({ content: resume }) }),
+    setTimeout: (fn) => { timers.push(fn); return timers.length; },
+    clearTimeout() {}, setInterval() { return 0; }, clearInterval() {},
+    requestAnimationFrame: (fn) => { timers.push(fn); return timers.length; },
+    localStorage: { getItem: () => null, setItem() {}, removeItem() {} },
+    navigator: { userAgent: 'node' },
+    location: { search: '', hash: '', href: '' },
+    URL, URLSearchParams,
+    alert() {}, print() {},
+    getComputedStyle: () => stub(listeners),
+  };
+  sandbox.window = sandbox;
+  sandbox.self = sandbox;
+  sandbox.addEventListener = (type, cb) => listeners.push([type, cb]);
+  const context = vm.createContext(sandbox);
+
+  const options = { timeout: request.timeout };
+  for (const script of scripts) {
+    try { script.runInContext(context, options); } catch (e) { errors.push(String(e)); }
+  }
+
+  sandbox.__listeners = listeners;
+  try {
+    vm.runInContext(`
+      for (const [type, cb] of __listeners.splice(0)) {
+        if (type === 'DOMContentLoaded' || type === 'load') cb({});
+      }
+      if (typeof window.onload === 'function') window.onload({});
+    `, context, options);
+  } catch (e) { errors.push(String(e)); }
+
+  // Let fetch/json promises settle and queued timers fire
+  for (let round = 0; round < 20; round++) {
+    await new Promise((resolve) => setImmediate(resolve));
+    for (const fn of timers.splice(0)) {
+      try { if (typeof fn === 'function') fn(); } catch (e) { errors.push(String(e)); }
+    }
+  }
+
+  return { reads, errors };
+}
+
+const rl = readline.createInterface({ input: process.stdin });
+rl.on('line', async (line) => {
+  let response;
+  try {
+    response = await run(JSON.parse(line));
+  } catch (e) {
+    response = { reads: {}, errors: ['harness: ' + String(e)] };
+  }
+  process.stdout.write(JSON.stringify(response) + '\n');
+});
+"""
+
+
+class RuntimeUnavailable(RuntimeError):
+    """Raised when no JavaScript runtime (node) is installed"""
+
+
+class EngineTimeout(TimeoutError):
+    """Raised when a template does not finish within the run timeout"""
+
+
+def template_scripts(content: str) -> List[str]:
+    """Inline script bodies of a template, in document order"""
+    return [m.group(1) for m in SCRIPT_BLOCK.finditer(content) if m.group(1).strip()]
+
+
+class JsEngine:
+    """One warm node process running the harness"""
+
+    def __init__(self, node: str):
+        self.process = subprocess.Popen(
+            [node, '-e', HARNESS], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, encoding='utf-8', bufsize=1
+        )
+        # Templates whose scripts this engine has already compiled
+        self.compiled = set()
+        # Output lines, read on a thread: select() on the buffered pipe can report a partial
+        # line as ready and readline() would then block past the timeout
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.lines.put(line)
+        self.lines.put('')
+
+    def run(self, key: str, scripts: List[str], resume: dict, timeout: float = RUN_TIMEOUT) -> dict:
+        request = {'key': key, 'resume': resume, 'timeout': int(timeout * 1000)}
+        if key not in self.compiled:
+            request['scripts'] = scripts
+        try:
+            self.process.stdin.write(json.dumps(request) + '\n')
+            self.process.stdin.flush()
+        except OSError as e:
+            raise RuntimeError("JavaScript engine exited") from e
+
+        try:
+            line = self.lines.get(timeout=timeout * 2)
+        except queue.Empty:
+            raise EngineTimeout(f"template {key[:8]} did not finish within {timeout:g}s") from None
+        if not line:
+            raise RuntimeError("JavaScript engine exited")
+        self.compiled.add(key)
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"JavaScript engine sent malformed output: {e}") from e
+
+    def close(self):
+        self.process.kill()
+        self.process.wait()
+
+
+class EnginePool:
+    """A fixed number of warm engines shared by worker threads"""
+
+    def __init__(self, size: int = 4, node: Optional[str] = None):
+        node = node or shutil.which('node')
+        if node is None:
+            raise RuntimeUnavailable("node is not installed; the runtime validator needs Node.js on PATH")
+        self.node = node
+        self.size = size
+        self.idle = queue.Queue()
+        for _ in range(size):
+            self.idle.put(JsEngine(node))
+
+    def run(self, key: str, scripts: List[str], resume: dict, timeout: float = RUN_TIMEOUT) -> dict:
+        engine = self.idle.get()
+        try:
+            return engine.run(key, scripts, resume, timeout)
+        except (EngineTimeout, RuntimeError, ValueError):
+            # A stuck or dead engine is replaced; its compiled scripts are lost with it
+            engine.close()
+            engine = JsEngine(self.node)
+            raise
+        finally:
+            self.idle.put(engine)
+
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get().close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RuntimeTemplate:
+    """A template's scripts, keyed by content so engines compile them once"""
+
+    def __init__(self, path: Path):
+        with open(path, 'r', encoding='utf-8') as f:
+            self.scripts = template_scripts(f.read())
+        self.path = path
+        self.key = hashlib.sha1('\0'.join(self.scripts).encode('utf-8')).hexdigest()
+
+
+def validate(pool: EnginePool, template: RuntimeTemplate, resume: dict) -> Dict:
+    """{'undefined': {field: reads}, 'errors': [...]} for one template and one resume"""
+    try:
+        result = pool.run(template.key, template.scripts, resume)
+    except (EngineTimeout, RuntimeError, ValueError) as e:
+        # The engine was replaced; the failure counts against this template only
+        return {'undefined': {}, 'errors': [str(e)]}
+    return {'undefined': result['reads'], 'errors': result['errors']}
+
+
+def sweep(template_paths: List[Path], resumes: Iterable[dict], pool: EnginePool) -> Dict[Path, Dict]:
+    """
+    Run every resume through every template
+    Returns {template: {'undefined': {field: resumes reading it}, 'errors': {message: count}, 'runs': n}}
+    """
+    templates = [RuntimeTemplate(path) for path in template_paths]
+    results = {t.path: {'undefined': defaultdict(int), 'errors': defaultdict(int), 'runs': 0} for t in templates}
+
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        for resume in resumes:
+            futures = [(t, executor.submit(validate, pool, t, resume)) for t in templates]
+            for template, future in futures:
+                outcome = future.result()
+                summary = results[template.path]
+                summary['runs'] += 1
+                for field in outcome['undefined']:
+                    summary['undefined'][field] += 1
+                for error in outcome['errors']:
+                    summary['errors'][error] += 1
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Execute templates against resumes and report undefined reads')
+    parser.add_argument('resumes', nargs='?', default=str(TEMPLATE_DIR / 'resume.json'),
+                        help='resume.json or a JSONL corpus of resumes (default: resume.json)')
+    parser.add_argument('-j', '--engines', type=int, default=4, help='warm JavaScript engines to keep')
+    parser.add_argument('--changed-since', metavar='REF',
+                        help='only process templates changed since this git ref, plus templates sharing the changed code')
+    args = parser.parse_args()
+
+    template_paths = find_templates(TEMPLATE_DIR, schema=RESUME, changed_since=args.changed_since)
+
+    print("=" * 100)
+    print("RUNTIME FIELD-ACCESS VALIDATION")
+    print("=" * 100)
+    print()
+
+    try:
+        pool = EnginePool(args.engines)
+    except RuntimeUnavailable as e:
+        print(f"❌ {e}")
+        return
+
+    with pool:
+        results = sweep(template_paths, load_resumes(Path(args.resumes)), pool)
+
+    files_with_issues = 0
+    for path in template_paths:
+        summary = results[path]
+        if not summary['undefined'] and not summary['errors']:
+            continue
+        files_with_issues += 1
+        print(f"\n❌ {template_name(path, TEMPLATE_DIR)}")
+        for field, count in sorted(summary['undefined'].items()):
+            print(f"   ⚠️  undefined: {field:50} ({count}/{summary['runs']} resume(s))")
+        for error, count in sorted(summary['errors'].items()):
+            print(f"   💥 error: {error[:120]} ({count}x)")
+
+    print("\n" + "=" * 100)
+    print(f"SUMMARY: {files_with_issues}/{len(template_paths)} templates read undefined fields or failed at runtime")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
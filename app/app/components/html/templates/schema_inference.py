@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Streaming resume schema inference
+Reads a resume corpus (resume.json or JSONL, one resume per line) one resume at a time and
+keeps fixed-size statistics per field path: value types, presence rate, empty rate, array
+lengths and string lengths. Every array item is observed, not just the first. Statistics
+from several workers merge exactly, so a large JSONL file is split into byte ranges and
+inferred in parallel.
+
+The schema is saved to .cache/resume_schema.json; the validators take their field lists from
+resume.json merged with it, so production variance is covered without loading the corpus.
+Fields declared in resume.schema.json, the JSON Schema resume_validator checks content
+against, are known fields as well, even before any resume carries them.
+
+Usage:
+    python schema_inference.py resumes.jsonl -j 8   # infer and save
+    python schema_inference.py                      # show the saved schema
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from template_writes import write_if_changed
+
+TEMPLATE_DIR = Path(__file__).parent
+RESUME_JSON = TEMPLATE_DIR / 'resume.json'
+SCHEMA_PATH = TEMPLATE_DIR / '.cache' / 'resume_schema.json'
+RESUME_SCHEMA = TEMPLATE_DIR / 'resume.schema.json'
+SCHEMA_VERSION = 1
+
+# Paths tracked at most; keys beyond this (free-form maps) are counted, not stored
+MAX_PATHS = 20000
+
+
+def load_resumes(path: Path) -> Iterator[dict]:
+    """Resume content from a resume.json file or a JSONL corpus, one object per line"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix != '.jsonl':
+            data = json.load(f)
+            yield data.get('content', data)
+            return
+
+        for line in f:
+            line = line.strip()
+            if line:
+                data = json.loads(line)
+                yield data.get('content', data)
+
+
+def load_json_schema(path: Path = RESUME_SCHEMA) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def node_types(node: Dict) -> Set[str]:
+    types = node.get('type', [])
+    return {types} if isinstance(types, str) else set(types)
+
+
+def declared_nodes(node: Dict, prefix: str = '') -> Iterator[Tuple[str, Dict]]:
+    """(path, JSON Schema node) of every declared property; array items add no path segment"""
+    for container in (node, node.get('items', {})):
+        for key, child in container.get('properties', {}).items():
+            path = f"{prefix}.{key}" if prefix else key
+            yield path, child
+            yield from declared_nodes(child, path)
+
+
+def json_type(value) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list):
+        return 'array'
+    return 'object'
+
+
+class Range:
+    """min / max / total / n of a length, mergeable"""
+
+    __slots__ = ('min', 'max', 'total', 'n')
+
+    def __init__(self, min=None, max=None, total=0, n=0):
+        self.min = min
+        self.max = max
+        self.total = total
+        self.n = n
+
+    def add(self, value: int):
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.total += value
+        self.n += 1
+
+    def merge(self, other: 'Range'):
+        if other.n == 0:
+            return
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.total += other.total
+        self.n += other.n
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+    def to_list(self) -> list:
+        return [self.min, self.max, self.total, self.n]
+
+    @classmethod
+    def from_list(cls, values: list) -> 'Range':
+        return cls(*values)
+
+
+class PathStats:
+    """Everything observed at one field path; constant size however many resumes are seen"""
+
+    __slots__ = ('count', 'empty', 'types', 'item_types', 'array_lengths', 'string_lengths')
+
+    def __init__(self):
+        self.count = 0                  # occurrences (once per enclosing object)
+        self.empty = 0                  # occurrences holding '', [], {} or null
+        self.types = Counter()
+        self.item_types = Counter()     # element types, for arrays
+        self.array_lengths = Range()
+        self.string_lengths = Range()
+
+    def observe(self, value):
+        self.count += 1
+        kind = json_type(value)
+        self.types[kind] += 1
+        if value is None or value == '' or value == [] or value == {}:
+            self.empty += 1
+        if kind == 'string':
+            self.string_lengths.add(len(value))
+        elif kind == 'array':
+            self.array_lengths.add(len(value))
+            self.item_types.update(json_type(item) for item in value)
+
+    def merge(self, other: 'PathStats'):
+        self.count += other.count
+        self.empty += other.empty
+        self.types.update(other.types)
+        self.item_types.update(other.item_types)
+        self.array_lengths.merge(other.array_lengths)
+        self.string_lengths.merge(other.string_lengths)
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count, 'empty': self.empty, 'types': dict(self.types),
+            'item_types': dict(self.item_types),
+            'array_lengths': self.array_lengths.to_list(), 'string_lengths': self.string_lengths.to_list(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PathStats':
+        stats = cls()
+        stats.count = data['count']
+        stats.empty = data['empty']
+        stats.types = Counter(data['types'])
+        stats.item_types = Counter(data['item_types'])
+        stats.array_lengths = Range.from_list(data['array_lengths'])
+        stats.string_lengths = Range.from_list(data['string_lengths'])
+        return stats
+
+
+class Schema:
+    """
+    Per-path statistics over a corpus. Paths follow extract_all_json_paths: array items
+    add no path segment, so employmentHistory.company covers every job of every resume.
+    """
+
+    def __init__(self, max_paths: int = MAX_PATHS):
+        self.resumes = 0
+        self.paths: Dict[str, PathStats] = {}
+        # Objects seen at each path ('' is the resume itself): the denominator of presence
+        self.objects = Counter()
+        self.max_paths = max_paths
+        self.overflow = 0
+        # path -> types from a JSON Schema; known fields, but never observed
+        self.declared: Dict[str, Set[str]] = {}
+
+    def add(self, content: dict):
+        self.resumes += 1
+        self._observe_object(content, '')
+
+    def _observe_object(self, obj: dict, prefix: str):
+        self.objects[prefix] += 1
+        for key, value in obj.items():
+            path = f"{prefix}.{key}" if prefix else key
+            stats = self.paths.get(path)
+            if stats is None:
+                if len(self.paths) >= self.max_paths:
+                    self.overflow += 1
+                    continue
+                stats = self.paths[path] = PathStats()
+            stats.observe(value)
+            self._descend(value, path)
+
+    def _descend(self, value, path: str):
+        if isinstance(value, dict):
+            self._observe_object(value, path)
+        elif isinstance(value, list):
+            for item in value:
+                self._descend(item, path)
+
+    def declare(self, json_schema: Dict):
+        """Add the fields json_schema declares"""
+        for path, node in declared_nodes(json_schema):
+            self.declared.setdefault(path, set()).update(node_types(node))
+
+    def merge(self, other: 'Schema') -> 'Schema':
+        for path, types in other.declared.items():
+            self.declared.setdefault(path, set()).update(types)
+        self.resumes += other.resumes
+        self.objects.update(other.objects)
+        self.overflow += other.overflow
+        for path, stats in other.paths.items():
+            mine = self.paths.get(path)
+            if mine is None:
+                if len(self.paths) >= self.max_paths:
+                    self.overflow += stats.count
+                    continue
+                mine = self.paths[path] = PathStats()
+            mine.merge(stats)
+        return self
+
+    def presence(self, path: str) -> float:
+        """Share of the enclosing objects that carry this path"""
+        parent = path.rpartition('.')[0]
+        enclosing = self.objects.get(parent, 0)
+        return self.paths[path].count / enclosing if enclosing else 0.0
+
+    def field_paths(self) -> Set[str]:
+        """Every path seen or declared, in the extract_all_json_paths format"""
+        return set(self.paths) | set(self.declared)
+
+    def children(self, path: str) -> Set[str]:
+        """Keys seen or declared directly under path (object keys, or item keys for arrays of objects)"""
+        prefix = path + '.' if path else ''
+        return {p[len(prefix):] for p in self.field_paths() if p.startswith(prefix) and '.' not in p[len(prefix):]}
+
+    def is_object(self, path: str) -> bool:
+        stats = self.paths.get(path)
+        return (stats is not None and stats.types.get('object', 0) > 0) or 'object' in self.declared.get(path, ())
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': SCHEMA_VERSION,
+            'resumes': self.resumes,
+            'overflow': self.overflow,
+            'objects': dict(self.objects),
+            'paths': {path: stats.to_dict() for path, stats in sorted(self.paths.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Schema':
+        schema = cls()
+        schema.resumes = data['resumes']
+        schema.overflow = data.get('overflow', 0)
+        schema.objects = Counter(data['objects'])
+        schema.paths = {path: PathStats.from_dict(stats) for path, stats in data['paths'].items()}
+        return schema
+
+    def save(self, path: Path = SCHEMA_PATH) -> bool:
+        return write_if_changed(Path(path), json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path: Path = SCHEMA_PATH) -> Optional['Schema']:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != SCHEMA_VERSION:
+            return None
+        return cls.from_dict(data)
+
+
+def _byte_ranges(path: Path, parts: int) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    step = max(1, -(-size // parts))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _infer_range(path: Path, start: int, end: int) -> Dict:
+    """Schema of the JSONL lines that start within [start, end)"""
+    schema = Schema()
+    with open(path, 'rb') as f:
+        if start:
+            # The line running through start belongs to the previous range
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            line = line.strip()
+            if line:
+                data = json.loads(line)
+                schema.add(data.get('content', data))
+    return schema.to_dict()
+
+
+def infer_schema(path: Path, workers: int = 1) -> Schema:
+    """Schema of a resume.json or JSONL corpus; JSONL is split across worker processes"""
+    path = Path(path)
+    if path.suffix != '.jsonl' or workers <= 1:
+        schema = Schema()
+        for content in load_resumes(path):
+            schema.add(content)
+        return schema
+
+    schema = Schema()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_infer_range, path, start, end) for start, end in _byte_ranges(path, workers * 4)]
+        for future in futures:
+            schema.merge(Schema.from_dict(future.result()))
+    return schema
+
+
+def resume_schema(json_path: Path = RESUME_JSON, corpus_path: Path = SCHEMA_PATH,
+                  schema_path: Path = RESUME_SCHEMA) -> Schema:
+    """
+    The sample resume's schema, merged with the saved corpus schema when there is one, with
+    the fields resume.schema.json declares
+    """
+    schema = infer_schema(json_path)
+    corpus = Schema.load(corpus_path)
+    if corpus is not None:
+        schema.merge(corpus)
+    schema.declare(load_json_schema(schema_path))
+    return schema
+
+
+def _format_range(values: Range) -> str:
+    if not values.n:
+        return '-'
+    return f"{values.min}/{values.mean:.0f}/{values.max}"
+
+
+def print_schema(schema: Schema):
+    print("=" * 100)
+    print(f"RESUME SCHEMA - {schema.resumes:,} resume(s), {len(schema.paths)} path(s)")
+    print("=" * 100)
+    print()
+    print(f"{'PATH':48} {'PRESENT':>8} {'EMPTY':>6}  {'TYPES':22} {'ARRAY LEN':>12} {'STRING LEN':>14}")
+    print("-" * 118)
+
+    mixed = []
+    for path, stats in sorted(schema.paths.items()):
+        types = {t for t in stats.types if t != 'null'}
+        if len(types) > 1:
+            mixed.append(path)
+        empty = stats.empty / stats.count if stats.count else 0
+        type_list = ','.join(sorted(stats.types))
+        if stats.item_types:
+            type_list += f" [{','.join(sorted(stats.item_types))}]"
+        marker = '⚠️ ' if len(types) > 1 else '  '
+        print(f"{marker}{path:46} {schema.presence(path):>7.0%} {empty:>6.0%}  {type_list:22} "
+              f"{_format_range(stats.array_lengths):>12} {_format_range(stats.string_lengths):>14}")
+
+    print()
+    print("=" * 100)
+    if mixed:
+        print(f"MIXED TYPES ({len(mixed)}): templates must handle every one of them")
+        for path in mixed:
+            print(f"  ⚠️  {path}: {dict(schema.paths[path].types)}")
+    if schema.overflow:
+        print(f"⚠️  {schema.overflow:,} value(s) beyond {schema.max_paths:,} paths were not tracked")
+    print("=" * 100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Infer per-path statistics from a resume corpus')
+    parser.add_argument('resumes', nargs='?', help='resume.json or a JSONL corpus; omit to show the saved schema')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help='worker processes for JSONL')
+    parser.add_argument('--merge', action='store_true', help='merge into the saved schema instead of replacing it')
+    args = parser.parse_args()
+
+    if args.resumes is None:
+        schema = Schema.load()
+        if schema is None:
+            print(f"❌ No saved schema at {SCHEMA_PATH}; run with a resume corpus first")
+            return
+        print_schema(schema)
+        return
+
+    schema = infer_schema(Path(args.resumes), args.workers)
+    if args.merge:
+        saved = Schema.load()
+        if saved is not None:
+            schema = saved.merge(schema)
+    schema.save()
+    print_schema(schema)
+    print(f"Saved: {SCHEMA_PATH}")
+
+
+if __name__ == '__main__':
+    main()
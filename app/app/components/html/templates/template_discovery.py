@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Template discovery - walks one or more template roots with os.scandir
+Each root assigns a schema (resume or cover letter) to the templates found under it
+"""
+
+import os
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from git_changes import select_changed_templates
+
+RESUME = 'resume'
+COVER_LETTER = 'coverletter'
+
+TEMPLATE_DIR = Path(__file__).parent
+
+# Directories never worth descending into (dist/ holds build_templates output)
+SKIPPED_DIRS = {'node_modules', '__pycache__', 'dist'}
+
+
+class TemplateRoot:
+    """A directory to search, with the schema its templates are rendered against"""
+
+    def __init__(self, path, schema: str = RESUME, include: Iterable[str] = ('*.html',),
+                 exclude: Iterable[str] = (), recursive: bool = True):
+        self.path = Path(path)
+        self.schema = schema
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.recursive = recursive
+
+    def __repr__(self):
+        return f"TemplateRoot({str(self.path)!r}, schema={self.schema!r})"
+
+
+class TemplateFile:
+    """A discovered template with the stat data gathered during the walk"""
+
+    __slots__ = ('path', 'name', 'schema', 'size', 'mtime')
+
+    def __init__(self, path: Path, name: str, schema: str, size: int, mtime: float):
+        self.path = path
+        self.name = name
+        self.schema = schema
+        self.size = size
+        self.mtime = mtime
+
+    def __repr__(self):
+        return f"TemplateFile({self.name!r}, schema={self.schema!r}, size={self.size})"
+
+
+def default_roots(template_dir: Optional[Path] = None) -> List[TemplateRoot]:
+    """Resume templates (including proto/) and cover letter templates"""
+    template_dir = Path(template_dir) if template_dir else TEMPLATE_DIR
+    return [
+        TemplateRoot(template_dir, schema=RESUME, exclude=('coverletter/*',)),
+        TemplateRoot(template_dir / 'coverletter', schema=COVER_LETTER),
+    ]
+
+
+def _walk(root: TemplateRoot, base: Path, include, exclude,
+          modified_since: Optional[float], min_size: Optional[int],
+          max_size: Optional[int]) -> Iterator[TemplateFile]:
+    """Iteratively scan a root, pruning excluded directories before descending"""
+    root_path = str(root.path)
+    stack = [root_path]
+
+    while stack:
+        current = stack.pop()
+        try:
+            scanner = os.scandir(current)
+        except OSError:
+            continue
+
+        with scanner:
+            for entry in scanner:
+                rel = os.path.relpath(entry.path, root_path).replace(os.sep, '/')
+
+                if entry.is_dir(follow_symlinks=False):
+                    if not root.recursive or entry.name.startswith('.') or entry.name in SKIPPED_DIRS:
+                        continue
+                    if any(fnmatch(rel + '/', pattern) for pattern in exclude):
+                        continue
+                    stack.append(entry.path)
+                    continue
+
+                if not entry.is_file():
+                    continue
+                if not any(fnmatch(entry.name, pattern) or fnmatch(rel, pattern) for pattern in include):
+                    continue
+                if any(fnmatch(rel, pattern) for pattern in exclude):
+                    continue
+
+                # DirEntry.stat() is cached by scandir where the platform allows
+                stat = entry.stat()
+                if modified_since is not None and stat.st_mtime < modified_since:
+                    continue
+                if min_size is not None and stat.st_size < min_size:
+                    continue
+                if max_size is not None and stat.st_size > max_size:
+                    continue
+
+                path = Path(entry.path)
+                try:
+                    name = path.relative_to(base).as_posix()
+                except ValueError:
+                    name = path.as_posix()
+
+                yield TemplateFile(path, name, root.schema, stat.st_size, stat.st_mtime)
+
+
+def discover_templates(roots: Optional[List[TemplateRoot]] = None, schema: Optional[str] = None,
+                       include: Iterable[str] = (), exclude: Iterable[str] = (),
+                       modified_since: Optional[float] = None, min_size: Optional[int] = None,
+                       max_size: Optional[int] = None, base: Optional[Path] = None) -> List[TemplateFile]:
+    """
+    Discover templates across all roots
+    include globs replace each root's own, exclude globs are added to them; names are relative to base
+    """
+    if roots is None:
+        roots = default_roots()
+    if base is None:
+        base = roots[0].path if roots else TEMPLATE_DIR
+
+    found = {}
+    for root in roots:
+        if schema is not None and root.schema != schema:
+            continue
+
+        root_include = tuple(include) or root.include
+        root_exclude = root.exclude + tuple(exclude)
+
+        for template in _walk(root, Path(base), root_include, root_exclude,
+                              modified_since, min_size, max_size):
+            # The first root that claims a file decides its schema
+            found.setdefault(template.path, template)
+
+    return sorted(found.values(), key=lambda t: t.name)
+
+
+def find_templates(template_dir: Optional[Path] = None, schema: Optional[str] = None,
+                   changed_since: Optional[str] = None) -> List[Path]:
+    """
+    Paths of all templates under the default roots, optionally limited to one schema
+    With changed_since, only templates changed since that git ref (and those sharing changed code)
+    """
+    template_dir = Path(template_dir) if template_dir else TEMPLATE_DIR
+    templates = discover_templates(default_roots(template_dir), schema=schema, base=template_dir)
+    paths = [template.path for template in templates]
+
+    if changed_since:
+        paths = select_changed_templates(paths, changed_since, template_dir)
+
+    return paths
+
+
+def template_name(path: Path, template_dir: Optional[Path] = None) -> str:
+    """Display name for a template: its path relative to the template directory"""
+    template_dir = Path(template_dir) if template_dir else TEMPLATE_DIR
+    try:
+        return Path(path).relative_to(template_dir).as_posix()
+    except ValueError:
+        return Path(path).name
+
+
+def main():
+    """List discovered templates by schema"""
+    roots = [TemplateRoot(arg) for arg in sys.argv[1:]] or default_roots()
+    templates = discover_templates(roots)
+
+    print("=" * 100)
+    print("TEMPLATE DISCOVERY")
+    print("=" * 100)
+    print()
+
+    for template in templates:
+        print(f"  {template.schema:12} {template.size:>9,} B  {template.name}")
+
+    print()
+    print("=" * 100)
+    by_schema = {}
+    for template in templates:
+        by_schema[template.schema] = by_schema.get(template.schema, 0) + 1
+    summary = ', '.join(f"{count} {schema}" for schema, count in sorted(by_schema.items()))
+    print(f"SUMMARY: {len(templates)} template(s) ({summary or 'none'})")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
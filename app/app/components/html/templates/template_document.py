@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+A template read once and parsed on demand
+Checkers run in one process receive the same TemplateDocument, so the file is read once
+and the decoded text, JavaScript functions and CSS rules are built at most once however
+many checkers ask for them.
+"""
+
+from bisect import bisect_right
+from functools import cached_property
+from pathlib import Path
+from typing import List, Optional
+
+
+class Finding:
+    """One problem a checker reports; line is None for template-wide findings"""
+
+    __slots__ = ('checker', 'line', 'message', 'detail')
+
+    def __init__(self, checker: str, line: Optional[int], message: str, detail: str = ''):
+        self.checker = checker
+        self.line = line
+        self.message = message
+        self.detail = detail
+
+    def __repr__(self):
+        return f"Finding({self.checker!r}, {self.line!r}, {self.message!r})"
+
+
+class TemplateDocument:
+    """Shared, lazily parsed view of one template file"""
+
+    def __init__(self, path: Path, name: Optional[str] = None, content: Optional[str] = None):
+        self.path = Path(path)
+        self.name = name or self.path.name
+        if content is not None:
+            # Unsaved editor buffers are checked as given
+            self.__dict__['content'] = content
+
+    @cached_property
+    def data(self) -> bytes:
+        """Raw bytes, for the checkers that scan with bytes patterns"""
+        if 'content' in self.__dict__:
+            return self.content.encode('utf-8')
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    @cached_property
+    def content(self) -> str:
+        return self.data.decode('utf-8')
+
+    @cached_property
+    def functions(self):
+        import js_functions
+        return js_functions.find_functions(self.content)
+
+    @cached_property
+    def css_rules(self):
+        import css_rules
+        return css_rules.template_rules(self.content)
+
+    @cached_property
+    def _line_starts(self) -> List[int]:
+        starts = [0]
+        find = self.content.find
+        pos = find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        return starts
+
+    def line_at(self, offset: int) -> int:
+        """1-based line number of a character offset into content"""
+        return bisect_right(self._line_starts, offset)
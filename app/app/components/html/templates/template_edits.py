@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Span-based editing helpers shared by the fixers
+Edits are (start, end, replacement) tuples against the original content
+"""
+
+from typing import List, Tuple
+
+SpanEdit = Tuple[int, int, str]
+
+
+class OverlappingEditError(ValueError):
+    """Raised when two span edits touch the same region of a file"""
+
+
+def apply_span_edits(content: str, edits: List[SpanEdit]) -> str:
+    """
+    Apply span edits to content in one linear pass
+    Edits are given against the original offsets and must not overlap
+    """
+    if not edits:
+        return content
+
+    ordered = sorted(edits, key=lambda e: (e[0], e[1]))
+
+    pieces = []
+    cursor = 0
+    for start, end, replacement in ordered:
+        if start < cursor:
+            raise OverlappingEditError(f"Edit {start}-{end} overlaps a previous edit ending at {cursor}")
+        pieces.append(content[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(content[cursor:])
+
+    return ''.join(pieces)
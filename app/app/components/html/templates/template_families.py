@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate template families
+Templates are shingled over their <script> and <style> blocks, MinHash signatures are
+bucketed with LSH, and templates whose estimated similarity passes a threshold are
+grouped into families: a fix made in one template usually belongs in the other members
+of its family too.
+
+Usage:
+    python template_families.py          # families at the default threshold
+    python template_families.py 0.8
+"""
+
+import re
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from js_functions import SCRIPT_BLOCK
+from template_discovery import find_templates, template_name
+
+STYLE_BLOCK = re.compile(r'<style\b[^>]*>(.*?)</style>', re.DOTALL | re.IGNORECASE)
+TOKEN = re.compile(r'[A-Za-z_$][\w$]*|\d+|[^\w\s]')
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 32
+DEFAULT_THRESHOLD = 0.5
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(0x7e3a)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def code_blocks(content: str) -> str:
+    """Script and style text of a template, the part copy-paste variants share"""
+    blocks = [m.group(1) for m in STYLE_BLOCK.finditer(content)]
+    blocks += [m.group(1) for m in SCRIPT_BLOCK.finditer(content)]
+    return '\n'.join(blocks)
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """32-bit hashes of every k-token shingle"""
+    tokens = TOKEN.findall(text)
+    if len(tokens) < k:
+        tokens = tokens + [''] * (k - len(tokens))
+    hashes = {zlib.crc32(' '.join(tokens[i:i + k]).encode('utf-8'))
+              for i in range(len(tokens) - k + 1)}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def minhash(shingle_hashes: np.ndarray) -> np.ndarray:
+    """MinHash signature: per permutation, the smallest permuted shingle hash"""
+    if not len(shingle_hashes):
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    # a * x + b stays below 2**63 for 31-bit a, b and 32-bit x
+    permuted = (_A[:, None] * (shingle_hashes[None, :] % _PRIME) + _B[:, None]) % _PRIME
+    return permuted.min(axis=1)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+
+class TemplateFamily:
+    """Templates that are near copies of a representative"""
+
+    def __init__(self, representative: Path, members: List[Path], similarities: Dict[Path, float]):
+        self.representative = representative
+        self.members = members              # every template in the family, representative included
+        self.similarities = similarities    # member -> estimated similarity to the representative
+
+    def __len__(self):
+        return len(self.members)
+
+    def __repr__(self):
+        return f"TemplateFamily({self.representative.name!r}, {len(self.members)} member(s))"
+
+
+def find_families(paths: List[Path], threshold: float = DEFAULT_THRESHOLD,
+                  contents: Optional[Dict[Path, str]] = None) -> List[TemplateFamily]:
+    """
+    Group templates into families of near duplicates
+    Templates without a close relative form a family of one
+    """
+    paths = list(paths)
+    signatures = {}
+    for path in paths:
+        if contents is not None and path in contents:
+            content = contents[path]
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        signatures[path] = minhash(shingles(code_blocks(content)))
+
+    parent = {path: path for path in paths}
+
+    def root(path):
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    # LSH: templates sharing any band of their signature become candidate pairs
+    rows = NUM_PERM // BANDS
+    for band in range(BANDS):
+        buckets = {}
+        for path in paths:
+            key = signatures[path][band * rows:(band + 1) * rows].tobytes()
+            buckets.setdefault(key, []).append(path)
+        for bucket in buckets.values():
+            for other in bucket[1:]:
+                if root(other) != root(bucket[0]) and similarity(signatures[bucket[0]], signatures[other]) >= threshold:
+                    parent[root(other)] = root(bucket[0])
+
+    groups = {}
+    for path in paths:
+        groups.setdefault(root(path), []).append(path)
+
+    families = []
+    for members in groups.values():
+        # The medoid is the member closest to all the others
+        representative = max(members, key=lambda m: sum(similarity(signatures[m], signatures[o]) for o in members))
+        sims = {m: similarity(signatures[representative], signatures[m]) for m in members}
+        families.append(TemplateFamily(representative, sorted(members), sims))
+
+    return sorted(families, key=lambda f: (-len(f), f.representative.name))
+
+
+def main():
+    template_dir = Path(__file__).parent
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_THRESHOLD
+
+    paths = find_templates(template_dir)
+    families = find_families(paths, threshold)
+
+    print("=" * 100)
+    print(f"TEMPLATE FAMILIES (similarity >= {threshold:.2f})")
+    print("=" * 100)
+    print()
+
+    for family in families:
+        print(f"{template_name(family.representative, template_dir)} ({len(family)} member(s))")
+        for member in family.members:
+            if member != family.representative:
+                print(f"    {template_name(member, template_dir):40} {family.similarities[member]:.2f}")
+
+    print()
+    print("=" * 100)
+    print(f"SUMMARY: {len(paths)} template(s) in {len(families)} family(ies)")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
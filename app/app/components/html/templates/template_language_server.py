@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Template language server
+Speaks the Language Server Protocol over stdin/stdout and publishes the DeepValidator and
+TemplateValidator findings for every open resume template as diagnostics, with quick fixes
+from their suggestion mappings. Both validators find each access from its line alone, so
+an open template keeps its lines and their findings in memory and an edit re-scans only
+the lines it replaced; findings on every other line are reused as they are.
+
+Editor setup: run `python template_language_server.py --stdio` for HTML files, e.g. as a
+generic LSP client entry in VS Code, Neovim (vim.lsp.start) or Helix.
+"""
+
+import argparse
+import json
+import re
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from deep_validator import DeepValidator, variable_category
+from schema_inference import RESUME_SCHEMA
+from template_discovery import RESUME, default_roots
+from validate_templates import TemplateValidator
+
+TEMPLATE_DIR = Path(__file__).parent
+RESUME_JSON = TEMPLATE_DIR / 'resume.json'
+
+SERVER_INFO = {'name': 'hirehub-templates', 'version': '1'}
+
+# LSP constants
+SEVERITY_ERROR = 1
+SYNC_INCREMENTAL = 2
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+# A suggestion that can replace the property as it is (not an "Available fields: ..." hint)
+FIELD_NAME = re.compile(r'^[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*$')
+
+
+def uri_to_path(uri: str) -> Path:
+    return Path(unquote(urlsplit(uri).path))
+
+
+def template_schema(path: Path) -> Optional[str]:
+    """The schema a template is rendered against, by the root that claims it"""
+    for root in default_roots(TEMPLATE_DIR):
+        try:
+            rel = path.relative_to(root.path).as_posix()
+        except ValueError:
+            continue
+        if not any(fnmatch(rel, pattern) for pattern in root.exclude):
+            return root.schema
+    # Outside the template roots (a copy, a scratch file): checked as a resume template
+    return RESUME
+
+
+def _index(line: str, character: int, utf16: bool) -> int:
+    """String index of an LSP character offset"""
+    if not utf16 or line.isascii():
+        return min(character, len(line))
+    units = 0
+    for i, ch in enumerate(line):
+        if units >= character:
+            return i
+        units += 2 if ord(ch) > 0xFFFF else 1
+    return len(line)
+
+
+def _character(line: str, index: int, utf16: bool) -> int:
+    """LSP character offset of a string index"""
+    if not utf16 or line.isascii():
+        return index
+    return index + sum(1 for ch in line[:index] if ord(ch) > 0xFFFF)
+
+
+class LineFinding:
+    """A diagnostic on one line, without its line number (which edits above it shift)"""
+
+    __slots__ = ('source', 'code', 'message', 'start', 'end', 'replacements')
+
+    def __init__(self, source: str, code: str, message: str, start: int, end: int, replacements: List[str]):
+        self.source = source
+        self.code = code
+        self.message = message
+        self.start = start
+        self.end = end
+        self.replacements = replacements
+
+
+class Validators:
+    """Both validators, rebuilt when resume.json or resume.schema.json changes"""
+
+    def __init__(self, json_path: Path = RESUME_JSON):
+        self.json_path = json_path
+        self.stamp = self._stamp()
+        self.deep = DeepValidator(json_path, use_function_cache=False)
+        self.fields = TemplateValidator(json_path)
+
+    def _stamp(self):
+        # resume.schema.json declares fields too
+        return tuple((stat.st_size, stat.st_mtime_ns) for stat in (self.json_path.stat(), RESUME_SCHEMA.stat()))
+
+    def is_stale(self) -> bool:
+        try:
+            return self._stamp() != self.stamp
+        except OSError:
+            return False
+
+    def scan_line(self, line: str) -> List[LineFinding]:
+        findings = []
+        seen = set()
+
+        for var_name, prop_chain, _, column in self.deep.line_accesses(line):
+            # ${job.title} is also matched as the direct access job.title: one diagnostic is enough
+            if (column, prop_chain) in seen:
+                continue
+            seen.add((column, prop_chain))
+            category = variable_category(var_name)
+            is_valid, suggestion = self.deep.validate_property(var_name, prop_chain, category)
+            if is_valid:
+                continue
+            first_prop = prop_chain.split('.')[0]
+            if FIELD_NAME.match(suggestion):
+                message = f"{var_name}.{prop_chain} is not in resume.json; did you mean {var_name}.{suggestion}?"
+                replacements = [suggestion]
+            else:
+                message = f"{var_name}.{prop_chain} is not in resume.json. {suggestion}"
+                replacements = []
+            findings.append(LineFinding('deep_validator', category, message,
+                                        column, column + len(first_prop), replacements))
+
+        for var_name, field, category, column in self.fields.line_references(line):
+            is_valid, suggestions = self.fields.validate_field(field, category)
+            if is_valid:
+                continue
+            suggestions = sorted(suggestions)
+            if suggestions:
+                message = f"{var_name}.{field} is not a field of {category}. Should be: {', '.join(suggestions)}"
+            else:
+                available = sorted(self.fields.field_mappings.get(category, set()))[:5]
+                message = f"{var_name}.{field} is not a field of {category}. Available: {', '.join(available)}..."
+            findings.append(LineFinding('validate_templates', category, message,
+                                        column, column + len(field), suggestions))
+
+        return findings
+
+
+class OpenTemplate:
+    """An open template's lines and the findings of each line"""
+
+    __slots__ = ('uri', 'version', 'lines', 'findings', 'checked')
+
+    def __init__(self, uri: str, text: str, version: int, validators: Validators):
+        self.uri = uri
+        self.version = version
+        self.checked = template_schema(uri_to_path(uri)) == RESUME
+        self.lines: List[str] = []
+        self.findings: List[List[LineFinding]] = []
+        self.rescan(text, validators)
+
+    def rescan(self, text: str, validators: Validators):
+        self.lines = text.split('\n')
+        self.findings = [self._scan(line, validators) for line in self.lines]
+
+    def _scan(self, line: str, validators: Validators) -> List[LineFinding]:
+        return validators.scan_line(line) if self.checked else []
+
+    def _position(self, position: Dict, utf16: bool) -> Tuple[int, int]:
+        line = position['line']
+        if line >= len(self.lines):
+            return len(self.lines) - 1, len(self.lines[-1])
+        return line, _index(self.lines[line], position['character'], utf16)
+
+    def apply_change(self, change: Dict, validators: Validators, utf16: bool) -> int:
+        """Apply one contentChanges entry; returns how many lines were re-scanned"""
+        if 'range' not in change:
+            self.rescan(change['text'], validators)
+            return len(self.lines)
+
+        start_line, start = self._position(change['range']['start'], utf16)
+        end_line, end = self._position(change['range']['end'], utf16)
+        replaced = (self.lines[start_line][:start] + change['text'] + self.lines[end_line][end:]).split('\n')
+
+        self.lines[start_line:end_line + 1] = replaced
+        self.findings[start_line:end_line + 1] = [self._scan(line, validators) for line in replaced]
+        return len(replaced)
+
+    def _range(self, line_num: int, finding: LineFinding, utf16: bool) -> Dict:
+        line = self.lines[line_num]
+        return {
+            'start': {'line': line_num, 'character': _character(line, finding.start, utf16)},
+            'end': {'line': line_num, 'character': _character(line, finding.end, utf16)},
+        }
+
+    def diagnostics(self, utf16: bool) -> List[Dict]:
+        diagnostics = []
+        for line_num, findings in enumerate(self.findings):
+            for finding in findings:
+                diagnostics.append({
+                    'range': self._range(line_num, finding, utf16),
+                    'severity': SEVERITY_ERROR,
+                    'source': finding.source,
+                    'code': finding.code,
+                    'message': finding.message,
+                    'data': {'replacements': finding.replacements},
+                })
+        return diagnostics
+
+    def code_actions(self, first_line: int, last_line: int, context: List[Dict], utf16: bool) -> List[Dict]:
+        """Quick fixes replacing the property with each suggestion, for findings in the range"""
+        actions = []
+        seen = set()
+        for line_num in range(max(0, first_line), min(last_line, len(self.lines) - 1) + 1):
+            for finding in self.findings[line_num]:
+                if not finding.replacements:
+                    continue
+                edit_range = self._range(line_num, finding, utf16)
+                matching = [d for d in context if d.get('range') == edit_range and d.get('message') == finding.message]
+                current = self.lines[line_num][finding.start:finding.end]
+                for replacement in finding.replacements:
+                    key = (line_num, finding.start, finding.end, replacement)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    actions.append({
+                        'title': f"Replace {current} with {replacement}",
+                        'kind': 'quickfix',
+                        'diagnostics': matching,
+                        'isPreferred': len(finding.replacements) == 1,
+                        'edit': {'changes': {self.uri: [{'range': edit_range, 'newText': replacement}]}},
+                    })
+        return actions
+
+
+class TemplateLanguageServer:
+    def __init__(self, reader, writer, json_path: Path = RESUME_JSON):
+        self.reader = reader
+        self.writer = writer
+        self.validators = Validators(json_path)
+        self.documents: Dict[str, OpenTemplate] = {}
+        self.utf16 = True
+        self.shutdown_requested = False
+        self.requests = {
+            'initialize': self.initialize,
+            'shutdown': self.shutdown,
+            'textDocument/codeAction': self.code_action,
+        }
+        self.notifications = {
+            'initialized': lambda params: None,
+            'textDocument/didOpen': self.did_open,
+            'textDocument/didChange': self.did_change,
+            'textDocument/didSave': self.did_save,
+            'textDocument/didClose': self.did_close,
+        }
+
+    # ------------------------------------------------------------------ transport
+
+    def read_message(self) -> Optional[Dict]:
+        """Next message, or None at end of input"""
+        length = None
+        while True:
+            header = self.reader.readline()
+            if not header:
+                return None
+            header = header.strip()
+            if not header:
+                break
+            name, _, value = header.decode('ascii').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        if length is None:
+            return {}
+        return json.loads(self.reader.read(length))
+
+    def send(self, message: Dict):
+        body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+        self.writer.write(f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+        self.writer.flush()
+
+    def notify(self, method: str, params: Dict):
+        self.send({'jsonrpc': '2.0', 'method': method, 'params': params})
+
+    def serve(self) -> int:
+        """Handle messages until exit; returns the process exit code"""
+        while True:
+            try:
+                message = self.read_message()
+            except ValueError as e:
+                print(f"❌ unreadable message: {e}", file=sys.stderr)
+                continue
+            if message is None:
+                return 0 if self.shutdown_requested else 1
+            if message.get('method') == 'exit':
+                return 0 if self.shutdown_requested else 1
+            self.dispatch(message)
+
+    def dispatch(self, message: Dict):
+        method = message.get('method')
+        params = message.get('params') or {}
+
+        if 'id' not in message:
+            handler = self.notifications.get(method)
+            if handler is not None:
+                try:
+                    handler(params)
+                except Exception as e:
+                    print(f"❌ {method}: {type(e).__name__}: {e}", file=sys.stderr)
+            return
+
+        if method is None:
+            return  # A response to something we never ask
+
+        response = {'jsonrpc': '2.0', 'id': message['id']}
+        handler = self.requests.get(method)
+        if handler is None:
+            response['error'] = {'code': METHOD_NOT_FOUND, 'message': f"method not found: {method}"}
+        elif self.shutdown_requested:
+            response['error'] = {'code': INVALID_REQUEST, 'message': 'server is shutting down'}
+        else:
+            try:
+                response['result'] = handler(params)
+            except Exception as e:
+                response['error'] = {'code': INTERNAL_ERROR, 'message': f"{type(e).__name__}: {e}"}
+        self.send(response)
+
+    # ------------------------------------------------------------------ state
+
+    def publish(self, document: OpenTemplate):
+        self.notify('textDocument/publishDiagnostics', {
+            'uri': document.uri,
+            'version': document.version,
+            'diagnostics': document.diagnostics(self.utf16),
+        })
+
+    def refresh(self):
+        """Rebuild the validators and re-check everything open once resume.json changed"""
+        if not self.validators.is_stale():
+            return
+        self.validators = Validators(self.validators.json_path)
+        for document in self.documents.values():
+            document.rescan('\n'.join(document.lines), self.validators)
+            self.publish(document)
+
+    # ------------------------------------------------------------------ methods
+
+    def initialize(self, params: Dict) -> Dict:
+        encodings = ((params.get('capabilities') or {}).get('general') or {}).get('positionEncodings') or []
+        self.utf16 = 'utf-32' not in encodings
+        return {
+            'capabilities': {
+                'positionEncoding': 'utf-16' if self.utf16 else 'utf-32',
+                'textDocumentSync': {'openClose': True, 'change': SYNC_INCREMENTAL, 'save': True},
+                'codeActionProvider': {'codeActionKinds': ['quickfix']},
+            },
+            'serverInfo': SERVER_INFO,
+        }
+
+    def shutdown(self, params: Dict):
+        self.shutdown_requested = True
+        return None
+
+    def did_open(self, params: Dict):
+        item = params['textDocument']
+        if not item['uri'].endswith('.html'):
+            return
+        self.refresh()
+        document = OpenTemplate(item['uri'], item['text'], item.get('version', 0), self.validators)
+        self.documents[item['uri']] = document
+        self.publish(document)
+
+    def did_change(self, params: Dict):
+        document = self.documents.get(params['textDocument']['uri'])
+        if document is None:
+            return
+        self.refresh()
+        for change in params['contentChanges']:
+            document.apply_change(change, self.validators, self.utf16)
+        document.version = params['textDocument'].get('version', document.version)
+        self.publish(document)
+
+    def did_save(self, params: Dict):
+        self.refresh()
+
+    def did_close(self, params: Dict):
+        uri = params['textDocument']['uri']
+        if self.documents.pop(uri, None) is not None:
+            self.notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})
+
+    def code_action(self, params: Dict) -> List[Dict]:
+        document = self.documents.get(params['textDocument']['uri'])
+        if document is None:
+            return []
+        selection = params['range']
+        context = (params.get('context') or {}).get('diagnostics') or []
+        return document.code_actions(selection['start']['line'], selection['end']['line'], context, self.utf16)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Language server publishing template validation diagnostics')
+    parser.add_argument('--stdio', action='store_true', help='communicate over stdin/stdout (the default)')
+    parser.parse_args()
+
+    # stdout carries the protocol; anything the validators print goes to stderr
+    reader, writer = sys.stdin.buffer, sys.stdout.buffer
+    sys.stdout = sys.stderr
+
+    server = TemplateLanguageServer(reader, writer)
+    sys.exit(server.serve())
+
+
+if __name__ == '__main__':
+    main()
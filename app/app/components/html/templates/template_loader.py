@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Asyncio template loading pipeline
+A bounded set of loaders prefetches template files (I/O threads) into a bounded
+queue, and consumers hand each file to a CPU worker pool, so reads and scanning overlap
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Reads in flight at once; sized for network storage rather than local disk
+DEFAULT_CONCURRENCY = 16
+
+_DONE = object()
+
+
+def _read(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@contextmanager
+def _cpu_pool(workers: int, initializer: Optional[Callable], initargs: tuple):
+    """Process pool for scanning; workers=0 scans inline on the event loop thread"""
+    if workers == 0:
+        if initializer is not None:
+            initializer(*initargs)
+        yield None
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        yield pool
+
+
+async def _pipeline(paths: List[Path], func: Callable, concurrency: int, queue_size: int, workers: int,
+                    initializer: Optional[Callable], initargs: tuple) -> Dict[Path, object]:
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    pending = iter(paths)
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as io_pool, _cpu_pool(workers, initializer, initargs) as cpu_pool:
+
+        async def loader():
+            for path in pending:
+                content = await loop.run_in_executor(io_pool, _read, path)
+                # Blocks when the CPU side falls behind: that is the backpressure
+                await queue.put((path, content))
+
+        async def consumer():
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return
+                path, content = item
+                if cpu_pool is None:
+                    results[path] = func(path, content)
+                else:
+                    results[path] = await loop.run_in_executor(cpu_pool, func, path, content)
+
+        async def producer():
+            await asyncio.gather(*(loader() for _ in range(concurrency)))
+            for _ in range(consumer_count):
+                await queue.put(_DONE)
+
+        consumer_count = max(1, workers)
+        await asyncio.gather(producer(), *(consumer() for _ in range(consumer_count)))
+
+    return results
+
+
+def process_templates(paths: List[Path], func: Callable, concurrency: int = DEFAULT_CONCURRENCY,
+                      queue_size: Optional[int] = None, workers: Optional[int] = None,
+                      initializer: Optional[Callable] = None, initargs: tuple = ()) -> Dict[Path, object]:
+    """
+    Load every path and call func(path, content) on it, returning {path: result}
+    func must be picklable (a module-level function or a method of a picklable object)
+    unless workers=0, which runs it in-process. It is pickled with every task, so state
+    it needs (a loaded validator) belongs in initializer(*initargs), run once per worker
+    """
+    paths = list(paths)
+    if not paths:
+        return {}
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(paths))
+    if queue_size is None:
+        queue_size = max(1, workers) * 2
+    concurrency = max(1, min(concurrency, len(paths)))
+
+    return asyncio.run(_pipeline(paths, func, concurrency, queue_size, workers, initializer, initargs))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Bytes-level template scanning over mmap
+Compiled bytes regexes run directly on the mapped file; only matched spans are decoded
+"""
+
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+# Case-insensitive presence check, replaces "'reference' in content.lower()"
+REFERENCE_WORD = re.compile(rb'reference', re.IGNORECASE)
+
+
+@contextmanager
+def mapped_template(filepath: Path):
+    """Map a template read-only; empty files yield an empty bytes object"""
+    with open(filepath, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses zero-length files
+            yield b''
+            return
+
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def decode(data: bytes) -> str:
+    """Decode a matched span"""
+    return data.decode('utf-8', errors='replace')
+
+
+class LineCounter:
+    """
+    Line numbers for byte offsets, counted incrementally
+    Cheap when offsets are queried in increasing order, as finditer produces them
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.pos = 0
+        self.line = 1
+
+    def line_at(self, offset: int) -> int:
+        if offset < self.pos:
+            self.pos = 0
+            self.line = 1
+        # Slicing copies only the gap since the previous query
+        self.line += self.buffer[self.pos:offset].count(b'\n')
+        self.pos = offset
+        return self.line
+
+
+def has_references(buffer) -> bool:
+    """True if the template mentions references at all"""
+    return REFERENCE_WORD.search(buffer) is not None
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Write-if-changed file layer for fixers
+A file whose content would not change is not touched at all, so dev servers watching the
+templates (Vite/Nuxt HMR) and mtime-keyed caches only see real edits. Changed files are
+written to a temp file in the same directory and renamed over the original, so readers
+never observe a half-written template. fsync is deferred and done once per run for every
+written file and its directory (sync_writes, also run at exit).
+"""
+
+import atexit
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Set, Union
+
+_CHUNK = 1 << 16
+
+# Files renamed into place since the last sync_writes()
+_pending: Set[Path] = set()
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_unchanged(path: Path, data: bytes) -> bool:
+    """True when path already holds exactly data"""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return _file_digest(path) == hashlib.sha1(data).hexdigest()
+    except FileNotFoundError:
+        return False
+
+
+def write_if_changed(path: Union[str, Path], content: str, encoding: str = 'utf-8') -> bool:
+    """Atomically replace path with content unless it already matches; True if written"""
+    path = Path(path)
+    data = content.encode(encoding)
+    if is_unchanged(path, data):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    _pending.add(path)
+    return True
+
+
+def sync_writes() -> int:
+    """fsync every file written since the last call, then each directory once; returns the file count"""
+    paths = list(_pending)
+    _pending.clear()
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            continue
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # The renames themselves are durable only once their directory entries are
+    for directory in {path.parent for path in paths}:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass  # Some filesystems do not support fsync on directories
+        finally:
+            os.close(fd)
+
+    return len(paths)
+
+
+atexit.register(sync_writes)
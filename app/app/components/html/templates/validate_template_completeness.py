@@ -6,94 +6,16 @@ Checks for:
 2. Undefined fields (in template but not in resume.json)
 """
 
-import json
-import re
 from pathlib import Path
-from collections import defaultdict
-
-def extract_all_json_paths(obj, prefix=''):
-    """Extract all possible field paths from JSON structure"""
-    paths = set()
-
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            current_path = f"{prefix}.{key}" if prefix else key
-            paths.add(current_path)
-
-            # Recursively extract nested paths
-            if isinstance(value, (dict, list)):
-                paths.update(extract_all_json_paths(value, current_path))
-
-    elif isinstance(obj, list) and obj:
-        # For arrays, analyze the first item to get structure
-        if isinstance(obj[0], dict):
-            for key in obj[0].keys():
-                current_path = f"{prefix}.{key}" if prefix else key
-                paths.add(current_path)
-
-                # Recursively extract nested paths
-                if isinstance(obj[0][key], (dict, list)):
-                    paths.update(extract_all_json_paths(obj[0][key], current_path))
-
-    return paths
-
-def get_resume_fields():
-    """Load resume.json and extract all field paths"""
-    resume_path = Path(__file__).parent / 'resume.json'
-
-    with open(resume_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Extract from content
-    if 'content' in data:
-        fields = extract_all_json_paths(data['content'])
-    else:
-        fields = extract_all_json_paths(data)
-
-    return fields
-
-def find_field_references(content):
-    """Find all resumeData field references in template"""
-    # JavaScript methods to exclude
-    js_methods = {'forEach', 'map', 'filter', 'reduce', 'length', 'push', 'pop', 'shift', 'unshift',
-                  'slice', 'splice', 'charAt', 'charCodeAt', 'indexOf', 'lastIndexOf', 'substring',
-                  'toUpperCase', 'toLowerCase', 'trim', 'split', 'join', 'replace', 'match',
-                  'toLocaleDateString', 'toLocaleString', 'getMonth', 'getFullYear', 'getDate'}
-
-    # Patterns to match
-    patterns = [
-        # resumeData.field or personal.field
-        r'(?:resumeData|personal|data\.content)\.(\w+(?:\.\w+)*)',
-    ]
-
-    found_fields = set()
-
-    for pattern in patterns:
-        matches = re.finditer(pattern, content)
-        for match in matches:
-            field_path = match.group(1)
-
-            # Skip if it's a JavaScript method
-            parts = field_path.split('.')
-            if any(part in js_methods for part in parts):
-                continue
-
-            # Handle nested paths
-            found_fields.add(field_path)
-
-            # Also add parent paths
-            for i in range(1, len(parts)):
-                parent_path = '.'.join(parts[:i])
-                if parent_path not in js_methods:
-                    found_fields.add(parent_path)
-
-    return found_fields
-
-def analyze_template(filepath, resume_fields):
-    """Analyze a single template for field coverage"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
 
+from field_coverage import CoverageMatrix, FieldIndex, template_references
+from field_references import find_field_references, get_resume_fields
+from git_changes import parse_changed_since
+from template_discovery import RESUME, find_templates
+from template_document import Finding
+
+def analyze_content(content, resume_fields):
+    """Field coverage of template content"""
     # Find fields referenced in template
     template_fields = find_field_references(content)
 
@@ -160,8 +82,27 @@ def analyze_template(filepath, resume_fields):
         'undefined_fields': undefined_fields
     }
 
+def checker(template_dir):
+    """Fields the template never displays or that resume.json lacks, as a hirehub_templates checker"""
+    resume_fields = get_resume_fields(template_dir)
+
+    def check(document):
+        results = analyze_content(document.content, resume_fields)
+        findings = [
+            Finding('completeness', None, f"{field} is not in resume.json")
+            for field in sorted(results['undefined_fields'])
+        ]
+        if results['missing_fields']:
+            missing = sorted(results['missing_fields'])
+            findings.append(Finding('completeness', None, f"{len(missing)} resume fields not handled",
+                                    ', '.join(missing[:5]) + ('...' if len(missing) > 5 else '')))
+        return findings
+
+    return check
+
 def main():
     template_dir = Path(__file__).parent
+    changed_since = parse_changed_since(__doc__)
 
     print("=" * 100)
     print("TEMPLATE COMPLETENESS VALIDATION")
@@ -174,37 +115,43 @@ def main():
     print(f"Found {len(resume_fields)} fields in resume.json")
     print()
 
-    # Get all HTML templates
-    templates = sorted(template_dir.glob('*.html'))
+    # Get all HTML templates and resolve their coverage in one matrix
+    templates = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
+    index = FieldIndex(resume_fields)
+    references = template_references(templates, template_dir)
+    coverage = CoverageMatrix.build(references, index)
 
     issues_found = 0
-    all_results = {}
+    templates_analyzed = 0
+    templates_with_undefined = 0
 
-    for template_path in templates:
+    for name, template_fields in references.items():
         print(f"\n{'=' * 100}")
-        print(f"ANALYZING: {template_path.name}")
+        print(f"ANALYZING: {name}")
         print('=' * 100)
 
-        results = analyze_template(template_path, resume_fields)
-        all_results[template_path.name] = results
+        missing_fields = coverage.missing_fields(name)
+        undefined_fields = index.undefined(template_fields)
+        templates_analyzed += 1
+        templates_with_undefined += bool(undefined_fields)
 
         has_issues = False
 
         # Report missing fields
-        if results['missing_fields']:
+        if missing_fields:
             has_issues = True
             issues_found += 1
-            print(f"\n❌ MISSING FIELDS ({len(results['missing_fields'])} fields not handled):")
+            print(f"\n❌ MISSING FIELDS ({len(missing_fields)} fields not handled):")
             print("-" * 100)
-            for field in sorted(results['missing_fields']):
+            for field in missing_fields:
                 print(f"  • {field}")
 
         # Report undefined fields
-        if results['undefined_fields']:
+        if undefined_fields:
             has_issues = True
-            print(f"\n⚠️  UNDEFINED FIELDS ({len(results['undefined_fields'])} fields referenced but not in resume.json):")
+            print(f"\n⚠️  UNDEFINED FIELDS ({len(undefined_fields)} fields referenced but not in resume.json):")
             print("-" * 100)
-            for field in sorted(results['undefined_fields']):
+            for field in sorted(undefined_fields):
                 print(f"  • {field}")
 
         if not has_issues:
@@ -215,23 +162,16 @@ def main():
     print("SUMMARY")
     print("=" * 100)
 
-    templates_with_missing = sum(1 for r in all_results.values() if r['missing_fields'])
-    templates_with_undefined = sum(1 for r in all_results.values() if r['undefined_fields'])
-
-    print(f"\nTotal templates analyzed: {len(all_results)}")
-    print(f"Templates with missing fields: {templates_with_missing}")
+    print(f"\nTotal templates analyzed: {templates_analyzed}")
+    print(f"Templates with missing fields: {issues_found}")
     print(f"Templates with undefined fields: {templates_with_undefined}")
 
     # Show most commonly missing fields
-    missing_count = defaultdict(int)
-    for results in all_results.values():
-        for field in results['missing_fields']:
-            missing_count[field] += 1
-
-    if missing_count:
+    top_missing = coverage.most_missing(20)
+    if top_missing:
         print(f"\n\nMOST COMMONLY MISSING FIELDS:")
         print("-" * 100)
-        for field, count in sorted(missing_count.items(), key=lambda x: -x[1])[:20]:
+        for field, count in top_missing:
             print(f"  {field:50} (missing in {count} templates)")
 
     print()
@@ -10,6 +10,53 @@ from pathlib import Path
 from typing import Dict, List, Set, Tuple
 from collections import defaultdict
 
+from deep_validator import CATEGORY_PATHS
+from git_changes import parse_changed_since
+from issue_counts import IssueCounter
+from schema_inference import Schema, resume_schema
+from template_discovery import RESUME, find_templates, template_name
+from template_document import Finding
+from template_loader import process_templates
+from template_writes import write_if_changed
+
+# Patterns for common template variable usage
+# Match: personal.fieldName, job.fieldName, edu.fieldName, etc.
+DATA_PATTERNS = {
+    category: [re.compile(pattern) for pattern in pattern_list]
+    for category, pattern_list in {
+        'personalInfo': [r'\bpersonal\.(\w+)', r'\bpersonalInfo\.(\w+)', r'\bdata\.personalInfo\.(\w+)'],
+        'employment': [r'\bjob\.(\w+)', r'\bexp\.(\w+)', r'\bemployment\.(\w+)'],
+        'education': [r'\bedu\.(\w+)', r'\beducation\.(\w+)'],
+        'skills': [r'\bskill\.(\w+)'],
+        'languages': [r'\blang\.(\w+)', r'\blanguage\.(\w+)'],
+        'projects': [r'\bproj\.(\w+)', r'\bproject\.(\w+)'],
+        'publications': [r'\bpub\.(\w+)', r'\bpublication\.(\w+)'],
+        'courses': [r'\bcourse\.(\w+)'],
+        'references': [r'\bref\.(\w+)', r'\breference\.(\w+)'],
+        'awards': [r'\baward\.(\w+)'],
+        'volunteering': [r'\bvol\.(\w+)', r'\bvolunteer\.(\w+)'],
+    }.items()
+}
+
+# The text each pattern above must find on a line before it can match (personal., data.personalInfo.)
+PATTERN_LITERALS = {
+    pattern: pattern.pattern[len(r'\b'):-len(r'(\w+)')].replace('\\.', '.')
+    for pattern_list in DATA_PATTERNS.values() for pattern in pattern_list
+}
+
+# Every pattern above starts with one of these variables followed by a dot
+DATA_VARIABLE = re.compile(
+    r'\b(?:personal|personalInfo|data|job|exp|employment|edu|education|skill|lang|language|proj|project'
+    r'|pub|publication|course|ref|reference|award|vol|volunteer)\.'
+)
+
+JS_ARRAY_METHODS = {
+    'forEach', 'map', 'filter', 'reduce', 'find', 'findIndex',
+    'some', 'every', 'includes', 'indexOf', 'length', 'push',
+    'pop', 'shift', 'unshift', 'slice', 'splice', 'join',
+    'concat', 'toString', 'valueOf', 'hasOwnProperty'
+}
+
 class TemplateValidator:
     def __init__(self, json_path: str):
         """Initialize with resume.json path"""
@@ -23,47 +70,24 @@ class TemplateValidator:
         with open(self.json_path, 'r', encoding='utf-8') as f:
             self.json_data = json.load(f)
 
-        # Map resume.json actual fields
-        content = self.json_data.get('content', {})
-
-        # Build mappings for common variable names used in templates
+        # Field names per category, from every array item and the saved corpus schema
+        schema = resume_schema(self.json_path)
         self.field_mappings = {
-            # personalInfo fields
-            'personalInfo': self._get_fields(content.get('personalInfo', {})),
-            # employmentHistory fields
-            'employment': self._get_fields(content.get('employmentHistory', [{}])[0]) if content.get('employmentHistory') else {},
-            # education fields
-            'education': self._get_fields(content.get('education', [{}])[0]) if content.get('education') else {},
-            # skills fields
-            'skills': self._get_fields(content.get('skills', [{}])[0]) if content.get('skills') else {},
-            # languages fields
-            'languages': self._get_fields(content.get('languages', [{}])[0]) if content.get('languages') else {},
-            # projects fields
-            'projects': self._get_fields(content.get('projects', [{}])[0]) if content.get('projects') else {},
-            # publications fields
-            'publications': self._get_fields(content.get('publications', [{}])[0]) if content.get('publications') else {},
-            # courses fields
-            'courses': self._get_fields(content.get('courses', [{}])[0]) if content.get('courses') else {},
-            # references fields
-            'references': self._get_fields(content.get('references', [{}])[0]) if content.get('references') else {},
-            # awards fields
-            'awards': self._get_fields(content.get('customSections', {}).get('awards', [{}])[0]) if content.get('customSections', {}).get('awards') else {},
-            # volunteering fields
-            'volunteering': self._get_fields(content.get('customSections', {}).get('volunteering', [{}])[0]) if content.get('customSections', {}).get('volunteering') else {},
+            category: self._get_fields(schema, CATEGORY_PATHS[category])
+            for category in ('personalInfo', 'employment', 'education', 'skills', 'languages', 'projects',
+                             'publications', 'courses', 'references', 'awards', 'volunteering')
         }
 
         print(f"✓ Loaded resume.json structure\n")
 
-    def _get_fields(self, obj: dict) -> Set[str]:
-        """Extract field names from object"""
-        if isinstance(obj, dict):
-            fields = set(obj.keys())
-            # Handle nested objects
-            for key, value in obj.items():
-                if isinstance(value, dict):
-                    fields.update(f"{key}.{k}" for k in value.keys())
-            return fields
-        return set()
+    def _get_fields(self, schema: Schema, path: str) -> Set[str]:
+        """Field names under a schema path"""
+        fields = schema.children(path)
+        # Handle nested objects
+        for key in list(fields):
+            if schema.is_object(f"{path}.{key}"):
+                fields.update(f"{key}.{k}" for k in schema.children(f"{path}.{key}"))
+        return fields
 
     def find_data_references(self, html_content: str) -> List[Tuple[str, str, int]]:
         """
@@ -71,48 +95,47 @@ class TemplateValidator:
         Returns list of (variable_name, field, line_number)
         """
         references = []
-
-        # Patterns for common template variable usage
-        # Match: personal.fieldName, job.fieldName, edu.fieldName, etc.
-        patterns = {
-            'personalInfo': [r'\bpersonal\.(\w+)', r'\bpersonalInfo\.(\w+)', r'\bdata\.personalInfo\.(\w+)'],
-            'employment': [r'\bjob\.(\w+)', r'\bexp\.(\w+)', r'\bemployment\.(\w+)'],
-            'education': [r'\bedu\.(\w+)', r'\beducation\.(\w+)'],
-            'skills': [r'\bskill\.(\w+)'],
-            'languages': [r'\blang\.(\w+)', r'\blanguage\.(\w+)'],
-            'projects': [r'\bproj\.(\w+)', r'\bproject\.(\w+)'],
-            'publications': [r'\bpub\.(\w+)', r'\bpublication\.(\w+)'],
-            'courses': [r'\bcourse\.(\w+)'],
-            'references': [r'\bref\.(\w+)', r'\breference\.(\w+)'],
-            'awards': [r'\baward\.(\w+)'],
-            'volunteering': [r'\bvol\.(\w+)', r'\bvolunteer\.(\w+)'],
-        }
-
         lines = html_content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            # Skip HTML comments
-            if '<!--' in line or '-->' in line:
+        # One scan finds the lines mentioning a resume variable; only those are read
+        line_index = scanned = 0
+        previous = -1
+        for match in DATA_VARIABLE.finditer(html_content):
+            line_index += html_content.count('\n', scanned, match.start())
+            scanned = match.start()
+            if line_index == previous:
                 continue
+            previous = line_index
+            for var_name, field, category, _ in self.line_references(lines[line_index]):
+                references.append((var_name, field, line_index + 1, category))
+        return references
 
-            for category, pattern_list in patterns.items():
-                for pattern in pattern_list:
-                    matches = re.finditer(pattern, line)
-                    for match in matches:
-                        field = match.group(1)
+    def line_references(self, line: str) -> List[Tuple[str, str, str, int]]:
+        """
+        Data field references on one line; every reference is found from its line alone
+        Returns list of (variable_name, field, category, column where the field starts)
+        """
+        # Skip HTML comments
+        if '<!--' in line or '-->' in line:
+            return []
+
+        # Most lines mention no resume variable at all
+        if not DATA_VARIABLE.search(line):
+            return []
 
-                        # Skip JavaScript built-in methods and properties
-                        js_builtins = {
-                            'forEach', 'map', 'filter', 'reduce', 'find', 'findIndex',
-                            'some', 'every', 'includes', 'indexOf', 'length', 'push',
-                            'pop', 'shift', 'unshift', 'slice', 'splice', 'join',
-                            'concat', 'toString', 'valueOf', 'hasOwnProperty'
-                        }
+        references = []
+        for category, pattern_list in DATA_PATTERNS.items():
+            for pattern in pattern_list:
+                if PATTERN_LITERALS[pattern] not in line:
+                    continue
+                for match in pattern.finditer(line):
+                    field = match.group(1)
 
-                        if field in js_builtins:
-                            continue
+                    # Skip JavaScript built-in methods and properties
+                    if field in JS_ARRAY_METHODS:
+                        continue
 
-                        var_name = match.group(0).split('.')[0]
-                        references.append((var_name, field, line_num, category))
+                    var_name = match.group(0).split('.')[0]
+                    references.append((var_name, field, category, match.start(1)))
 
         return references
 
@@ -157,15 +180,16 @@ class TemplateValidator:
 
         return False, list(set(suggestions))[:3]
 
-    def validate_template(self, template_path: str) -> Dict:
-        """Validate a single template file"""
+    def validate_template(self, template_path: str, content: str = None) -> Dict:
+        """Validate a single template file (content is read from disk unless given)"""
         path = Path(template_path)
 
-        if not path.exists():
-            return {'error': f'File not found: {template_path}'}
+        if content is None:
+            if not path.exists():
+                return {'error': f'File not found: {template_path}'}
 
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
 
         references = self.find_data_references(content)
 
@@ -194,17 +218,20 @@ class TemplateValidator:
             'issues': issues
         }
 
-    def validate_all_templates(self, template_dir: str = None) -> Dict[str, Dict]:
-        """Validate all HTML templates in directory"""
+    def validate_all_templates(self, template_dir: str = None, changed_since: str = None) -> Dict[str, Dict]:
+        """Validate all HTML templates in directory (or only those changed since a git ref)"""
         if template_dir is None:
             template_dir = self.json_path.parent
 
         template_dir = Path(template_dir)
-        html_files = sorted(template_dir.glob('*.html'))
+        html_files = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
+
+        # Files are prefetched asynchronously and validated on a worker pool
+        validated = process_templates(html_files, _validate_in_worker, initializer=_init_worker, initargs=(self,))
 
         results = {}
         for html_file in html_files:
-            results[html_file.name] = self.validate_template(html_file)
+            results[template_name(html_file, template_dir)] = validated[html_file]
 
         return results
 
@@ -217,7 +244,7 @@ class TemplateValidator:
 
         total_issues = 0
         files_with_issues = 0
-        all_issues_by_type = defaultdict(list)
+        issue_counts = IssueCounter()
 
         for filename, result in sorted(results.items()):
             if 'error' in result:
@@ -252,18 +279,21 @@ class TemplateValidator:
                     else:
                         print(f"      → Available fields in {issue['category']}: {', '.join(issue['valid_fields'][:5])}...")
 
-                    # Track for summary
-                    all_issues_by_type[field_ref].append(filename)
+                # Track for summary
+                issue_counts.add_template(filename, [f"{i['variable']}.{i['field']}" for i in result['issues']])
 
         print("\n" + "=" * 100)
         print(f"SUMMARY: {files_with_issues}/{len(results)} files with issues | Total issues: {total_issues}")
         print("=" * 100)
 
-        if all_issues_by_type:
+        top_issues = issue_counts.top(10)
+        if top_issues:
             print("\nMOST COMMON ISSUES:")
             print("-" * 100)
-            for field_ref, files in sorted(all_issues_by_type.items(), key=lambda x: len(x[1]), reverse=True)[:10]:
-                print(f"  {field_ref} - Found in {len(files)} file(s)")
+            for field_ref, files, _, _ in top_issues:
+                print(f"  {field_ref} - Found in {files} file(s)")
+            if issue_counts.note():
+                print(issue_counts.note())
 
     def generate_fix_script(self, results: Dict[str, Dict]) -> str:
         """Generate a Python script to auto-fix issues"""
@@ -290,6 +320,8 @@ class TemplateValidator:
 import re
 from pathlib import Path
 
+from template_writes import write_if_changed
+
 def fix_template(filepath, replacements):
     """Apply fixes to a template file"""
     path = Path(filepath)
@@ -302,10 +334,10 @@ def fix_template(filepath, replacements):
         pattern = r'\\b' + re.escape(old) + r'\\b'
         content = re.sub(pattern, new, content)
 
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    print(f"✓ Fixed {path.name}")
+    if write_if_changed(path, content):
+        print(f"✓ Fixed {path.name}")
+    else:
+        print(f"  {path.name} (no changes)")
 
 # Fixes to apply
 fixes = {
@@ -340,11 +372,44 @@ if __name__ == '__main__':
         return script
 
 
+# The validator each pool worker uses, set once by the pool initializer rather than
+# pickled with every task
+_worker_validator = None
+
+
+def _init_worker(validator: TemplateValidator):
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_in_worker(path: Path, content: str) -> Dict:
+    return _worker_validator.validate_template(path, content)
+
+
+def checker(template_dir: Path):
+    """Data field references missing from resume.json, as a hirehub_templates checker"""
+    validator = TemplateValidator(template_dir / 'resume.json')
+
+    def check(document) -> List[Finding]:
+        result = validator.validate_template(document.path, document.content)
+        findings = []
+        for issue in result['issues']:
+            if issue['suggestions']:
+                detail = f"Should be: {', '.join(issue['suggestions'])}"
+            else:
+                detail = f"Available fields in {issue['category']}: {', '.join(issue['valid_fields'][:5])}..."
+            findings.append(Finding('fields', issue['line'], f"{issue['variable']}.{issue['field']}", detail))
+        return findings
+
+    return check
+
+
 def main():
     """Main execution"""
     import sys
 
     json_path = Path(__file__).parent / 'resume.json'
+    changed_since = parse_changed_since(__doc__)
 
     if not json_path.exists():
         print(f"❌ Error: resume.json not found at {json_path}")
@@ -355,7 +420,7 @@ def main():
 
     # Validate all templates
     print("Analyzing templates for data field references...\n")
-    results = validator.validate_all_templates()
+    results = validator.validate_all_templates(changed_since=changed_since)
 
     # Print report
     validator.print_report(results)
@@ -365,8 +430,7 @@ def main():
 
     if "No fixes needed" not in fix_script:
         output_file = Path(__file__).parent / 'auto_fix_templates.py'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(fix_script)
+        write_if_changed(output_file, fix_script)
         print(f"\n✓ Auto-fix script generated: {output_file}")
         print(f"  Run it with: python3 {output_file.name}")
 
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Validation daemon
+Keeps the resume schema, validators, compiled patterns and function caches warm in one
+long-lived process and answers line-delimited JSON-RPC 2.0 requests on stdin/stdout, so an
+editor or a Vite/Nuxt plugin can validate a template on save without paying interpreter
+startup and schema loading each time. Requests run on a thread pool; responses are written
+as they complete and matched by id.
+
+Methods:
+    validate         {path, content?, validators?}         -> {file, results, elapsed_ms}
+    fix              {path, fixers, content?, write?,      -> {changed, applied, refused, conflicts,
+                      on_conflict?}                            written, content?}
+    validate_resume  {content}                             -> {valid, error, path}
+    reload           {}                                     -> {reloaded: true}
+    stats            {}                                     -> request counts and timings
+    ping / shutdown
+
+Usage:
+    python validation_daemon.py -j 4
+    echo '{"jsonrpc": "2.0", "id": 1, "method": "validate", "params": {"path": "Clarity.html"}}' | python validation_daemon.py
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import hirehub_templates
+import regex_guard
+from fix_executor import POLICIES, run_fixers
+from deep_validator import DeepValidator
+from resume_validator import ResumeValidationError, compile_validator, default_schema
+from schema_inference import RESUME_SCHEMA
+from template_writes import write_if_changed
+from validate_templates import TemplateValidator
+
+TEMPLATE_DIR = Path(__file__).parent
+RESUME_JSON = TEMPLATE_DIR / 'resume.json'
+
+# Validation results kept per (validator, content hash); saving an unchanged buffer is free
+RESULT_CACHE_SIZE = 512
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# Content fixers in registry order; the daemon keeps them all loaded
+FIXERS: Dict[str, Callable[[str], str]] = {
+    name: hirehub_templates.load(target) for name, (target, _) in hirehub_templates.FIXERS.items()
+}
+
+
+class RpcError(Exception):
+    """Raised by handlers to answer with a JSON-RPC error object"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class WarmState:
+    """Everything a request needs that is expensive to build: rebuilt only when the resume schema changes"""
+
+    def __init__(self, json_path: Path = RESUME_JSON):
+        self.json_path = json_path
+        self.stamp = self._stamp()
+        self.deep = DeepValidator(json_path)
+        self.fields = TemplateValidator(str(json_path))
+        self.validate_resume = compile_validator(default_schema())
+        regex_guard.warm_up()
+        self.validators: Dict[str, Callable[[Path, str], Dict]] = {
+            'deep': self._deep,
+            'fields': self.fields.validate_template,
+        }
+        self.results = OrderedDict()
+        self.results_lock = threading.Lock()
+
+    def _deep(self, path: Path, content: str) -> Dict:
+        # Responses are JSON, so the compact issue table goes out as plain records
+        result = self.deep.validate_template(path, content)
+        return {**result, 'issues': result['issues'].to_dicts()}
+
+    def _stamp(self):
+        # resume.schema.json declares fields too
+        return tuple((stat.st_size, stat.st_mtime_ns) for stat in (self.json_path.stat(), RESUME_SCHEMA.stat()))
+
+    def is_stale(self) -> bool:
+        try:
+            return self._stamp() != self.stamp
+        except OSError:
+            return False
+
+    def cached(self, validator: str, path: Path, content: str) -> Dict:
+        key = (validator, str(path), hashlib.sha1(content.encode('utf-8')).hexdigest())
+        with self.results_lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                return self.results[key]
+
+        result = self.validators[validator](path, content)
+
+        with self.results_lock:
+            self.results[key] = result
+            while len(self.results) > RESULT_CACHE_SIZE:
+                self.results.popitem(last=False)
+        return result
+
+
+class Daemon:
+    def __init__(self, workers: int = 4, output=None):
+        self.output = output or sys.stdout
+        self.output_lock = threading.Lock()
+        self.state = WarmState()
+        self.state_lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.workers = workers
+        # Writes to one template are serialised; different templates proceed in parallel
+        self.path_locks = defaultdict(threading.Lock)
+        self.counts = defaultdict(int)
+        self.timings = defaultdict(float)
+        self.stopping = threading.Event()
+        self.methods = {
+            'validate': self.validate,
+            'fix': self.fix,
+            'validate_resume': self.validate_resume,
+            'reload': self.reload,
+            'stats': self.stats,
+            'ping': lambda params: 'pong',
+            'shutdown': self.shutdown,
+        }
+
+    # ------------------------------------------------------------------ protocol
+
+    def send(self, message: Dict):
+        line = json.dumps(message, ensure_ascii=False)
+        with self.output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def respond(self, request_id, result=None, error: Optional[RpcError] = None):
+        if request_id is None:
+            return  # Notification
+        message = {'jsonrpc': '2.0', 'id': request_id}
+        if error is not None:
+            message['error'] = {'code': error.code, 'message': error.message}
+        else:
+            message['result'] = result
+        self.send(message)
+
+    def reject(self, request_id, error: RpcError):
+        """Error for a line that is not a usable request; its id is null when it cannot be read"""
+        self.send({'jsonrpc': '2.0', 'id': request_id, 'error': {'code': error.code, 'message': error.message}})
+
+    def handle_line(self, line: str):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self.reject(None, RpcError(PARSE_ERROR, f"parse error: {e}"))
+            return
+
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            self.reject(request.get('id') if isinstance(request, dict) else None,
+                        RpcError(INVALID_REQUEST, "invalid request"))
+            return
+
+        if request['method'] == 'shutdown':
+            # Answered before the next line is read, so nothing after it is served
+            self.dispatch(request)
+            return
+
+        self.pool.submit(self.dispatch, request)
+
+    def dispatch(self, request: Dict):
+        request_id = request.get('id')
+        method = request['method']
+        params = request.get('params') or {}
+        start = time.perf_counter()
+        try:
+            handler = self.methods.get(method)
+            if handler is None:
+                raise RpcError(METHOD_NOT_FOUND, f"method not found: {method}")
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            result = handler(params)
+        except RpcError as e:
+            self.respond(request_id, error=e)
+        except Exception as e:
+            self.respond(request_id, error=RpcError(INTERNAL_ERROR, f"{type(e).__name__}: {e}"))
+        else:
+            self.respond(request_id, result)
+        finally:
+            self.counts[method] += 1
+            self.timings[method] += time.perf_counter() - start
+
+    def serve(self, stream):
+        self.send({'jsonrpc': '2.0', 'method': 'ready', 'params': {
+            'validators': sorted(self.state.validators), 'fixers': list(FIXERS), 'workers': self.workers,
+        }})
+        for line in stream:
+            if line.strip():
+                self.handle_line(line)
+            if self.stopping.is_set():
+                break
+        # Requests read before shutdown still get their responses
+        self.pool.shutdown(wait=True)
+
+    # ------------------------------------------------------------------ helpers
+
+    def current_state(self) -> WarmState:
+        with self.state_lock:
+            if self.state.is_stale():
+                self.state = WarmState(self.state.json_path)
+            return self.state
+
+    def _template(self, params: Dict) -> Path:
+        if not isinstance(params.get('path'), str):
+            raise RpcError(INVALID_PARAMS, "path is required")
+        path = Path(params['path'])
+        if not path.is_absolute():
+            path = TEMPLATE_DIR / path
+        path = path.resolve()
+        if TEMPLATE_DIR.resolve() not in path.parents:
+            raise RpcError(INVALID_PARAMS, f"{params['path']} is outside the template directory")
+        return path
+
+    def _content(self, params: Dict, path: Path) -> str:
+        content = params.get('content')
+        if content is not None:
+            if not isinstance(content, str):
+                raise RpcError(INVALID_PARAMS, "content must be a string")
+            return content
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError as e:
+            raise RpcError(INVALID_PARAMS, f"cannot read {path.name}: {e.strerror}")
+
+    @staticmethod
+    def _names(params: Dict, key: str, available: List[str]) -> List[str]:
+        names = params.get(key)
+        if names is None:
+            return list(available)
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise RpcError(INVALID_PARAMS, f"unknown {key}: {', '.join(unknown)} (available: {', '.join(available)})")
+        return names
+
+    # ------------------------------------------------------------------ methods
+
+    def validate(self, params: Dict) -> Dict:
+        start = time.perf_counter()
+        state = self.current_state()
+        path = self._template(params)
+        content = self._content(params, path)
+        names = self._names(params, 'validators', list(state.validators))
+        results = {name: state.cached(name, path, content) for name in names}
+        return {
+            'file': path.relative_to(TEMPLATE_DIR.resolve()).as_posix(),
+            'results': results,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    def fix(self, params: Dict) -> Dict:
+        path = self._template(params)
+        # Fixers rewrite templates, so the caller names them rather than getting all of them
+        if params.get('fixers') is None:
+            raise RpcError(INVALID_PARAMS, f"fixers is required (available: {', '.join(FIXERS)})")
+        names = self._names(params, 'fixers', list(FIXERS))
+        write = bool(params.get('write'))
+        policy = params.get('on_conflict', 'ordered')
+        if policy not in POLICIES:
+            raise RpcError(INVALID_PARAMS, f"on_conflict must be one of: {', '.join(POLICIES)}")
+
+        with self.path_locks[path]:
+            original = self._content(params, path)
+            # Fixers run in their declared order, whatever order they were named in
+            fix = run_fixers(original, names, policy, template=path.relative_to(TEMPLATE_DIR.resolve()).as_posix())
+            written = write and write_if_changed(path, fix.content)
+
+        result = {
+            'changed': fix.content != original, 'applied': fix.applied, 'refused': fix.refused,
+            'conflicts': [{'earlier': c.earlier, 'later': c.later, 'line': c.line, 'expected': c.expected}
+                          for c in fix.conflicts],
+            'written': written,
+        }
+        if not write:
+            result['content'] = fix.content
+        return result
+
+    def validate_resume(self, params: Dict) -> Dict:
+        content = params.get('content')
+        if not isinstance(content, dict):
+            raise RpcError(INVALID_PARAMS, "content must be an object")
+        try:
+            self.current_state().validate_resume(content)
+        except ResumeValidationError as e:
+            return {'valid': False, 'error': str(e), 'path': e.path}
+        return {'valid': True, 'error': None, 'path': None}
+
+    def reload(self, params: Dict) -> Dict:
+        with self.state_lock:
+            self.state = WarmState(self.state.json_path)
+        return {'reloaded': True}
+
+    def stats(self, params: Dict) -> Dict:
+        return {
+            method: {'requests': count, 'mean_ms': round(self.timings[method] / count * 1000, 2)}
+            for method, count in sorted(self.counts.items())
+        }
+
+    def shutdown(self, params: Dict) -> Dict:
+        self.stopping.set()
+        return {'stopping': True}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve template validation over line-delimited JSON-RPC on stdin/stdout')
+    parser.add_argument('-j', '--workers', type=int, default=4, help='requests handled concurrently')
+    args = parser.parse_args()
+
+    # stdout carries the protocol; anything the validators print goes to stderr
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+
+    daemon = Daemon(args.workers, output=protocol)
+    daemon.serve(sys.stdin)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,9 @@ This version excludes JavaScript comments to avoid false positives
 import re
 from pathlib import Path
 
+from git_changes import parse_changed_since
+from template_discovery import RESUME, find_templates, template_name
+
 def remove_js_comments(content):
     """Remove JavaScript comments from content"""
     # Remove single-line comments
@@ -18,8 +21,10 @@ def remove_js_comments(content):
 def analyze_contact_fields(filepath):
     """Analyze how a template displays contact information (excluding comments)"""
     with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+        return contact_field_issues(f.read())
 
+def contact_field_issues(content):
+    """Old contact fields shown next to websitesAndSocialLinks in content, or None"""
     # Skip if no personal info
     if 'personalInfo' not in content and 'personal' not in content:
         return None
@@ -67,7 +72,8 @@ def analyze_contact_fields(filepath):
 def main():
     """Verify all templates have been fixed"""
     template_dir = Path(__file__).parent
-    html_files = sorted(template_dir.glob('*.html'))
+    changed_since = parse_changed_since(__doc__)
+    html_files = find_templates(template_dir, schema=RESUME, changed_since=changed_since)
 
     print("=" * 100)
     print("VERIFICATION: Duplicate Contact Information Fixes (Excluding Comments)")
@@ -79,7 +85,7 @@ def main():
     for html_file in html_files:
         issues = analyze_contact_fields(html_file)
         if issues:
-            templates_with_duplicates[html_file.name] = issues
+            templates_with_duplicates[template_name(html_file, template_dir)] = issues
 
     if not templates_with_duplicates:
         print("✅ SUCCESS! No templates found with duplicate contact information!")